@@ -1,14 +1,17 @@
+import heapq
 import logging
-import datetime
+from typing import Iterator, Optional
 from collections import defaultdict
 
 from ..baseflumine import BaseFlumine
 from ..events import events
-from .. import config, utils
+from .. import utils, config
+from ..clock import BacktestClock, set_clock, reset_clock
 from ..clients import ExchangeType
 from ..exceptions import RunError
 from ..order.trade import TradeStatus
 from ..order.order import OrderTypes
+from .utils import PendingPackages
 
 logger = logging.getLogger(__name__)
 
@@ -22,95 +25,113 @@ class FlumineBacktest(BaseFlumine):
 
     BACKTEST = True
 
-    def __init__(self, client):
+    def __init__(self, client, chronological: bool = False):
+        """
+        :param client: flumine client instance
+        :param chronological: process all streams chronologically
+        across events and markets (e.g. shared bankroll)
+        """
         super(FlumineBacktest, self).__init__(client)
-        self.handler_queue = []
+        self.chronological = chronological
+        self.handler_queue = PendingPackages()
+        self.clock = BacktestClock()  # set from marketBook publish time
 
     def run(self) -> None:
         if self.client.EXCHANGE != ExchangeType.SIMULATED:
             raise RunError(
                 "Incorrect client provided, only a Simulated client can be used when backtesting"
             )
-        with self:
-            self._monkey_patch_datetime()
-            """
-            list of either single stream or complete events depending 
-            on event_processing flag:
-               single: {None: [<Stream 1>], [<Stream 2>, ..]}
-               event: {123: [<Stream 1>, <Stream 2>, ..], 456: [..]}
-            Event data to be muxed/processed chronologically as per 
-            live rather than single which is per market in isolation.
-            """
-            event_streams = defaultdict(list)  # eventId: [<Stream>, ..]
-            for stream in self.streams:
-                event_id = stream.event_id if stream.event_processing else None
-                event_streams[event_id].append(stream)
-
-            for event_id, streams in event_streams.items():
-                if event_id and len(streams) > 1:
+        token = set_clock(self.clock)
+        try:
+            with self:
+                for event in self._stream_market_books():
+                    if event is None:
+                        self.handler_queue.clear()
+                    else:
+                        self._process_market_books(event)
+
+                self._process_end_flumine()
+
+                logger.info("Backtesting complete")
+        finally:
+            reset_clock(token)
+
+    def _stream_market_books(self) -> Iterator[Optional[events.MarketBookEvent]]:
+        """Yields MarketBookEvents from all streams, None
+        is yielded on completion of each market/event.
+        """
+        if self.chronological:
+            streams = list(self.streams)
+            logger.info(
+                "Starting historical streams chronologically",
+                extra={"markets": [s.market_filter for s in streams]},
+            )
+            yield from self._merge_streams(streams)
+            yield None
+            logger.info("Completed historical streams chronologically")
+            return
+        for event_id, streams in self.event_streams.items():
+            if event_id and len(streams) > 1:
+                logger.info(
+                    "Starting historical event '{0}'".format(event_id),
+                    extra={
+                        "event_id": event_id,
+                        "markets": [s.market_filter for s in streams],
+                    },
+                )
+                yield from self._merge_streams(streams)
+                yield None
+                logger.info("Completed historical event '{0}'".format(event_id))
+            else:
+                for stream in streams:
                     logger.info(
-                        "Starting historical event '{0}'".format(event_id),
+                        "Starting historical market '{0}'".format(stream.market_filter),
                         extra={
-                            "event_id": event_id,
-                            "markets": [s.market_filter for s in streams],
+                            "market": stream.market_filter,
                         },
                     )
-                    # create cycles
-                    cycles = []  # [[epoch, [MarketBook], gen], ..]
-                    for stream in streams:
-                        stream_gen = stream.create_generator()()
-                        market_book = next(stream_gen)
-                        publish_time_epoch = market_book[0].publish_time_epoch
-                        cycles.append([publish_time_epoch, market_book, stream_gen])
-                    # process cycles
-                    while cycles:
-                        # order by epoch
-                        cycles.sort(key=lambda x: x[0])
-                        # get current
-                        _, market_book, stream_gen = cycles.pop(0)
-                        # process current
-                        self._process_market_books(events.MarketBookEvent(market_book))
-                        # gen next
-                        try:
-                            market_book = next(stream_gen)
-                        except StopIteration:
-                            continue
-                        publish_time_epoch = market_book[0].publish_time_epoch
-                        # add back
-                        cycles.append([publish_time_epoch, market_book, stream_gen])
-                    self.handler_queue.clear()
-                    logger.info("Completed historical event '{0}'".format(event_id))
-                else:
-                    for stream in streams:
-                        logger.info(
-                            "Starting historical market '{0}'".format(
-                                stream.market_filter
-                            ),
-                            extra={
-                                "market": stream.market_filter,
-                            },
-                        )
-                        stream_gen = stream.create_generator()
-                        for event in stream_gen():
-                            self._process_market_books(events.MarketBookEvent(event))
-                        self.handler_queue.clear()
-                        logger.info(
-                            "Completed historical market '{0}'".format(
-                                stream.market_filter
-                            )
-                        )
-
-            self._process_end_flumine()
-
-            logger.info("Backtesting complete")
+                    stream_gen = stream.create_generator()
+                    for event in stream_gen():
+                        yield events.MarketBookEvent(event)
+                    yield None
+                    logger.info(
+                        "Completed historical market '{0}'".format(stream.market_filter)
+                    )
 
-            self._unpatch_datetime()
+    @property
+    def event_streams(self) -> dict:
+        """
+        dict of either single stream or complete events depending
+        on event_processing flag:
+           single: {None: [<Stream 1>, <Stream 2>, ..]}
+           event: {123: [<Stream 1>, <Stream 2>, ..], 456: [..]}
+        Event data to be muxed/processed chronologically as per
+        live rather than single which is per market in isolation.
+        """
+        event_streams = defaultdict(list)  # eventId: [<Stream>, ..]
+        for stream in self.streams:
+            event_id = stream.event_id if stream.event_processing else None
+            event_streams[event_id].append(stream)
+        return event_streams
+
+    @staticmethod
+    def _merge_streams(streams: list) -> Iterator[events.MarketBookEvent]:
+        """k-way merge of the stream generators using a
+        heap ordered by publish time, ties are broken by
+        stream order so processing is deterministic.
+        """
+        stream_gens = [stream.create_generator()() for stream in streams]
+        for market_book in heapq.merge(
+            *stream_gens, key=lambda x: x[0].publish_time_epoch
+        ):
+            yield events.MarketBookEvent(market_book)
 
     def _process_market_books(self, event: events.MarketBookEvent) -> None:
         # todo DRY!
         for market_book in event.event:
             market_id = market_book.market_id
-            config.current_time = market_book.publish_time
+            self.clock.update(market_book.publish_time_epoch, market_book.publish_time)
+            config.current_time = market_book.publish_time  # deprecated
 
             # check if there are orders to process (limited to current market only)
             if self.handler_queue:
@@ -130,21 +151,28 @@ class FlumineBacktest(BaseFlumine):
 
             # process market
             market(market_book)
+            self.markets.index_market(market)
 
             # process middleware
             for middleware in self._market_middleware:
-                utils.call_middleware_error_handling(middleware, market)
+                self.profiler.call(
+                    middleware.__class__.__name__,
+                    "__call__",
+                    utils.call_middleware_error_handling,
+                    middleware,
+                    market,
+                )
 
             # process current orders
             self._process_backtest_orders(market)
 
-            for strategy in self.strategies:
-                if utils.call_strategy_error_handling(
-                    strategy.check_market, market, market_book
-                ):
-                    utils.call_strategy_error_handling(
-                        strategy.process_market_book, market, market_book
-                    )
+            for strategy in self.strategies.stream_strategies(
+                market_book.streaming_unique_id
+            ):
+                self._process_strategy_market_book(strategy, market, market_book)
+
+            # execute orders merged across strategies
+            self.order_coalescer.flush(market_id)
 
     def process_order_package(self, order_package) -> None:
         # place in pending list (wait for latency+delay)
@@ -170,33 +198,18 @@ class FlumineBacktest(BaseFlumine):
                 blotter.complete_order(order)
         for strategy in self.strategies:
             strategy_orders = blotter.strategy_orders(strategy)
-            utils.call_process_orders_error_handling(strategy, market, strategy_orders)
+            self.profiler.call(
+                strategy.name,
+                "process_orders",
+                utils.call_process_orders_error_handling,
+                strategy,
+                market,
+                strategy_orders,
+            )
 
     def _check_pending_packages(self, market_id: str) -> None:
-        processed = []
-        for order_package in self.handler_queue:
-            if (
-                order_package.market_id == market_id
-                and order_package.elapsed_seconds > order_package.simulated_delay
-            ):
-                order_package.client.execution.handler(order_package)
-                processed.append(order_package)
-        for p in processed:
-            self.handler_queue.remove(p)
-
-    def _monkey_patch_datetime(self) -> None:
-        config.current_time = datetime.datetime.utcnow()
-
-        class NewDateTime(datetime.datetime):
-            @classmethod
-            def utcnow(cls):
-                return config.current_time
-
-        self._old_datetime = datetime.datetime
-        datetime.datetime = NewDateTime
-
-    def _unpatch_datetime(self) -> None:
-        datetime.datetime = self._old_datetime
+        for order_package in self.handler_queue.pop_due(market_id):
+            order_package.client.execution.handler(order_package)
 
     def __repr__(self) -> str:
         return "<FlumineBacktest>"
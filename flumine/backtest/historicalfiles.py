@@ -0,0 +1,228 @@
+import io
+import os
+import bz2
+import gzip
+import lzma
+import queue
+import tarfile
+import zipfile
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+"""
+Streaming reads of historical files without having
+to decompress to disk first, handles:
+
+    /data/1.23
+    /data/1.23.gz (or .bz2 / .xz)
+    /data/2021_06.tar/PRO/2021/Jun/1/1.23.bz2 (tar member)
+    /data/2021_06.zip/1.23 (zip member)
+
+Compressed/archived files are decompressed in a
+background thread into a bounded buffer so that the
+main thread only parses. Archive member indexes (and
+open zip files) are cached so that reading many
+members from the same archive does not rescan it.
+"""
+
+COMPRESSION = {
+    ".gz": lambda f: gzip.GzipFile(fileobj=f),
+    ".bz2": bz2.BZ2File,
+    ".xz": lzma.LZMAFile,
+}
+READ_BATCH_SIZE = 1000  # lines per buffer item
+READ_BUFFER_SIZE = 10  # max batches held in buffer
+ARCHIVE_CACHE_SIZE = 8  # archives held in cache
+
+_archive_lock = threading.Lock()
+_archive_paths = {}  # {path: bool} is tar/zip archive
+_archives = OrderedDict()  # {(path, size, mtime): {name: TarInfo} or ZipFile}
+
+
+def split_archive_path(file_path: str) -> Tuple[str, Optional[str]]:
+    """Returns (archive path, member name) if the
+    file path is within a tar/zip archive, otherwise
+    (file path, None).
+    """
+    if os.path.exists(file_path):
+        return file_path, None
+    parent = os.path.dirname(file_path)
+    while parent and parent != os.path.dirname(parent):
+        if os.path.isfile(parent):
+            if _is_archive(parent):
+                member = os.path.relpath(file_path, parent).replace(os.sep, "/")
+                return parent, member
+            break
+        parent = os.path.dirname(parent)
+    return file_path, None
+
+
+def _is_archive(path: str) -> bool:
+    is_archive = _archive_paths.get(path)
+    if is_archive is None:
+        is_archive = _archive_paths[path] = tarfile.is_tarfile(
+            path
+        ) or zipfile.is_zipfile(path)
+    return is_archive
+
+
+def get_archive(archive_path: str):
+    """Returns cached tar member index {name: TarInfo}
+    or open ZipFile, built once per archive (version).
+    """
+    stat = os.stat(archive_path)
+    key = (archive_path, stat.st_size, stat.st_mtime_ns)
+    with _archive_lock:
+        archive = _archives.get(key)
+        if archive is not None:
+            _archives.move_to_end(key)
+            return archive
+    if tarfile.is_tarfile(archive_path):
+        with tarfile.open(archive_path, "r:*") as t:
+            archive = {os.path.normpath(m.name): m for m in t.getmembers()}
+    else:
+        archive = zipfile.ZipFile(archive_path)
+    with _archive_lock:
+        if key in _archives:  # built by another thread
+            if isinstance(archive, zipfile.ZipFile):
+                archive.close()
+            return _archives[key]
+        _archives[key] = archive
+        while len(_archives) > ARCHIVE_CACHE_SIZE:
+            _close_archive(_archives.popitem(last=False)[1])
+    return archive
+
+
+def clear_archive_cache() -> None:
+    with _archive_lock:
+        while _archives:
+            _close_archive(_archives.popitem()[1])
+        _archive_paths.clear()
+
+
+def _close_archive(archive) -> None:
+    # open members keep the zip file open until closed
+    if isinstance(archive, zipfile.ZipFile):
+        archive.close()
+
+
+def is_compressed(file_path: str) -> bool:
+    archive_path, member = split_archive_path(file_path)
+    return member is not None or os.path.splitext(file_path)[1] in COMPRESSION
+
+
+@contextmanager
+def open_binary(file_path: str, decompress: bool = True) -> Iterator[io.BufferedIOBase]:
+    """Opens file (or archive member) in binary mode
+    decompressing based on file extension.
+    """
+    archive_path, member = split_archive_path(file_path)
+    if decompress:
+        compression = COMPRESSION.get(os.path.splitext(file_path)[1])
+    else:
+        compression = None
+    archive = None
+    if member is None:
+        f = open(archive_path, "rb")
+    else:
+        index = get_archive(archive_path)
+        if isinstance(index, dict):
+            tar_info = index.get(os.path.normpath(member))
+            if tar_info is None:
+                raise KeyError("%s not found in %s" % (member, archive_path))
+            # only reads the first header, member is read from its offset
+            archive = tarfile.open(archive_path, "r:*")
+            f = archive.extractfile(tar_info)
+            if f is None:
+                archive.close()
+                raise FileNotFoundError(
+                    "%s is not a file in %s" % (member, archive_path)
+                )
+        else:
+            f = index.open(member)
+    try:
+        if compression:
+            with compression(f) as d:
+                yield d
+        else:
+            yield f
+    finally:
+        f.close()
+        if archive:
+            archive.close()
+
+
+@contextmanager
+def open_file(file_path: str, offset: int = 0) -> Iterator[io.TextIOBase]:
+    with open_binary(file_path) as f:
+        if offset:
+            f.seek(offset)  # decompressed byte offset
+        yield io.TextIOWrapper(f, encoding="utf-8")
+
+
+def read_lines(file_path: str, offset: int = 0) -> Iterator[str]:
+    """Yields each line from file (starting at byte
+    offset), compressed/archived files are read in a
+    background thread.
+    """
+    if not is_compressed(file_path):
+        with open(file_path, "r") as f:
+            if offset:
+                f.seek(offset)
+            yield from f
+        return
+    buffer = queue.Queue(maxsize=READ_BUFFER_SIZE)
+    stop = threading.Event()
+    reader = threading.Thread(
+        name="HistoricalFileReader",
+        target=_reader,
+        args=(file_path, offset, buffer, stop),
+        daemon=True,
+    )
+    reader.start()
+    try:
+        while True:
+            batch = buffer.get()
+            if batch is None:
+                break
+            elif isinstance(batch, Exception):
+                raise batch
+            yield from batch
+    finally:
+        stop.set()  # handles generator being closed early
+        reader.join()
+
+
+def _reader(
+    file_path: str, offset: int, buffer: queue.Queue, stop: threading.Event
+) -> None:
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        with open_file(file_path, offset) as f:
+            batch = []
+            for line in f:
+                batch.append(line)
+                if len(batch) == READ_BATCH_SIZE:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+    except Exception as e:
+        logger.error("Error reading historical file %s" % file_path, exc_info=True)
+        put(e)
+        return
+    put(None)
@@ -0,0 +1,292 @@
+import os
+import array
+import datetime
+import pickle
+import logging
+from typing import Optional, Tuple
+import betfairlightweight
+from betfairlightweight.compat import json
+from betfairlightweight.streaming.cache import MarketBookCache
+from betfairlightweight.resources.baseresource import BaseResource
+
+from .historicalfiles import open_binary, split_archive_path
+
+logger = logging.getLogger(__name__)
+
+"""
+Sidecar index (`<file_path>.index`) for raw historical
+market files, built once per file in a single pass:
+
+    header: first marketDefinition (used by get_file_md)
+    publish time of each line
+    marketDefinition status/inPlay/marketTime changes by line
+    checkpoints: byte offset + pickled market cache state
+        at status/inPlay changes and at CHECKPOINT_SECONDS
+        before the market time
+
+Streaming data is delta based so lines cannot simply be
+skipped, instead processing restarts from the latest
+checkpoint before the first line that the listener
+(inplay/seconds_to_start) could output a MarketBook.
+"""
+
+INDEX_VERSION = 1
+INDEX_FILE_EXTENSION = ".index"
+CHECKPOINT_SECONDS = (7200, 3600, 1800, 900, 600, 300, 120, 60, 30)
+EPOCH = datetime.datetime.utcfromtimestamp(0)
+
+
+def get_index_path(file_path: str) -> Optional[str]:
+    archive_path, member = split_archive_path(file_path)
+    if member is not None:
+        return None  # unable to write sidecar into archive
+    return file_path + INDEX_FILE_EXTENSION
+
+
+def _file_stat(file_path: str) -> tuple:
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _market_time(market_definition: dict) -> Optional[float]:
+    market_time = market_definition.get("marketTime")
+    if market_time:
+        dt = BaseResource.strip_datetime(market_time)
+        return (dt - EPOCH).total_seconds() * 1e3
+
+
+class LineIndex:
+    """
+    Publish time / market state index for a single
+    raw historical market file.
+    """
+
+    def __init__(
+        self,
+        header: dict,
+        publish_times: array.array,
+        definitions: list,
+        checkpoints: list,
+    ):
+        self.header = header
+        self.publish_times = publish_times  # by line
+        self.definitions = definitions  # [(line, status, inPlay, marketTime), ..]
+        self.checkpoints = checkpoints  # [(line, offset, caches), ..]
+
+    @property
+    def market_definition(self) -> dict:
+        return self.header["market_definition"]
+
+    @property
+    def seekable(self) -> bool:
+        return self.header["seekable"]
+
+    def first_line(self, inplay: bool = None, seconds_to_start: float = None) -> int:
+        """Returns the first line that could create
+        a snap, mirrors FlumineMarketStream.snap.
+        """
+        if not self.seekable:
+            return 0
+        lines = len(self.publish_times)
+        for i, (line, status, in_play, market_time) in enumerate(self.definitions):
+            end = self.definitions[i + 1][0] if i + 1 < len(self.definitions) else lines
+            if status != "OPEN":
+                return line
+            elif inplay:
+                if in_play:
+                    return line
+            elif inplay is False and in_play:
+                continue
+            elif seconds_to_start and market_time:
+                for j in range(line, end):
+                    if (market_time - self.publish_times[j]) / 1e3 <= seconds_to_start:
+                        return j
+            else:
+                return line
+        return lines
+
+    def get_start(
+        self, inplay: bool = None, seconds_to_start: float = None, lightweight=False
+    ) -> Tuple[int, dict]:
+        """Returns (byte offset, market caches) of
+        the latest checkpoint before the first line
+        that could create a snap.
+        """
+        first_line = self.first_line(inplay, seconds_to_start)
+        start = None
+        for checkpoint in self.checkpoints:
+            if checkpoint[0] <= first_line:
+                start = checkpoint
+            else:
+                break
+        if start is None:
+            return 0, {}
+        line, offset, caches = start
+        caches = pickle.loads(caches)
+        if lightweight is False:  # checkpoints are built lightweight
+            for cache in caches.values():
+                cache.lightweight = False
+                if cache.market_definition:
+                    cache._process_market_definition(cache.market_definition)
+                for runner in cache.runners:
+                    runner.lightweight = False
+                    runner.serialise()
+        logger.debug(
+            "Seeking to line %s (offset %s) from index" % (line, offset),
+            extra={"first_line": first_line},
+        )
+        return offset, caches
+
+
+def build_line_index(file_path: str) -> LineIndex:
+    publish_times = array.array("q")
+    definitions = []
+    checkpoints = []
+    header = {
+        "version": INDEX_VERSION,
+        "bflw_version": betfairlightweight.__version__,
+        "stat": _file_stat(file_path),
+        "market_definition": {},
+        "market_ids": [],
+        "seekable": True,
+    }
+    caches = {}
+    state = None
+    thresholds = list(CHECKPOINT_SECONDS)
+    offset = 0
+    with open_binary(file_path) as f:
+        for line_number, line in enumerate(f):
+            try:
+                update = json.loads(line)
+            except ValueError:
+                update = {}
+            publish_time = update.get("pt", 0)
+            publish_times.append(publish_time)
+            market_changes = update.get("mc")
+            if market_changes is None:
+                if "rc" in update:
+                    header["seekable"] = False  # race stream
+                offset += len(line)
+                continue
+            if line_number == 0:
+                header["market_definition"] = market_changes[0].get(
+                    "marketDefinition", {}
+                )
+            # checkpoints hold the state before this line is processed
+            checkpoint = False
+            if state and state[2] and thresholds:
+                while thresholds and (state[2] - publish_time) / 1e3 <= thresholds[0]:
+                    thresholds.pop(0)
+                    checkpoint = True
+            for market_change in market_changes:
+                if "marketDefinition" in market_change:
+                    md = market_change["marketDefinition"]
+                    new_state = (md.get("status"), md.get("inPlay"), _market_time(md))
+                    if new_state != state:
+                        if state is None or new_state[:2] != state[:2]:
+                            checkpoint = True
+                        definitions.append((line_number,) + new_state)
+                        state = new_state
+            if checkpoint:
+                checkpoints.append((line_number, offset, pickle.dumps(caches)))
+            for market_change in market_changes:
+                market_id = market_change["id"]
+                cache = caches.get(market_id)
+                if market_change.get("img", False) or cache is None:
+                    cache = MarketBookCache(market_id, publish_time, True)
+                    caches[market_id] = cache
+                    if market_id not in header["market_ids"]:
+                        header["market_ids"].append(market_id)
+                cache.update_cache(market_change, publish_time)
+            offset += len(line)
+    if len(header["market_ids"]) != 1:
+        header["seekable"] = False  # snap based on per market publish time
+    if checkpoints and checkpoints[0][0] == 0:
+        checkpoints.pop(0)  # empty state
+    return LineIndex(header, publish_times, definitions, checkpoints)
+
+
+def write_line_index(line_index: LineIndex, index_path: str) -> None:
+    tmp_path = "{0}.{1}.tmp".format(index_path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            # header first so that it can be loaded on its own
+            pickle.dump(line_index.header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(
+                (
+                    line_index.publish_times.tobytes(),
+                    line_index.definitions,
+                    line_index.checkpoints,
+                ),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, index_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _valid_header(header: dict, file_path: str) -> bool:
+    return (
+        header.get("version") == INDEX_VERSION
+        and header.get("bflw_version") == betfairlightweight.__version__
+        and tuple(header.get("stat", ())) == _file_stat(file_path)
+    )
+
+
+def load_index_header(file_path: str) -> Optional[dict]:
+    """Returns index header if a valid index exists."""
+    index_path = get_index_path(file_path)
+    if index_path is None or not os.path.exists(index_path):
+        return
+    with open(index_path, "rb") as f:
+        header = pickle.load(f)
+    if _valid_header(header, file_path):
+        return header
+
+
+def load_line_index(file_path: str) -> Optional[LineIndex]:
+    index_path = get_index_path(file_path)
+    if index_path is None or not os.path.exists(index_path):
+        return
+    with open(index_path, "rb") as f:
+        header = pickle.load(f)
+        if not _valid_header(header, file_path):
+            return
+        publish_times, definitions, checkpoints = pickle.load(f)
+    return LineIndex(header, array.array("q", publish_times), definitions, checkpoints)
+
+
+def get_line_index(file_path: str) -> Optional[LineIndex]:
+    """Returns line index for file, building and
+    writing the sidecar if missing or stale.
+    """
+    index_path = get_index_path(file_path)
+    if index_path is None:
+        return
+    line_index = load_line_index(file_path)
+    if line_index is None:
+        line_index = build_line_index(file_path)
+        try:
+            write_line_index(line_index, index_path)
+        except OSError as e:
+            logger.warning("Unable to write line index %s: %s" % (index_path, e))
+        else:
+            logger.info(
+                "Line index created",
+                extra={"file_path": file_path, "index_path": index_path},
+            )
+    return line_index
+
+
+def get_index_header(file_path: str) -> Optional[dict]:
+    """Returns index header, building the index if
+    required (header only load on reuse).
+    """
+    header = load_index_header(file_path)
+    if header is None:
+        line_index = get_line_index(file_path)
+        if line_index:
+            header = line_index.header
+    return header
@@ -0,0 +1,151 @@
+import os
+import logging
+from typing import Callable, List
+from concurrent.futures import ProcessPoolExecutor
+
+from .backtest import FlumineBacktest
+from ..controls.loggingcontrols import LoggingControl
+
+logger = logging.getLogger(__name__)
+
+
+class ShardLoggingControl(LoggingControl):
+    """
+    Logging control added to each worker process
+    to capture cleared orders metadata in a form
+    that can be returned to the parent process.
+    """
+
+    NAME = "SHARD_LOGGING_CONTROL"
+
+    def _process_cleared_orders_meta(self, event):
+        self.cache.append([order.info for order in event.event])
+
+
+class BacktestResult:
+    """
+    Merged output of a parallel backtest, all values
+    are plain python objects (order.info dicts etc.)
+    ordered by shard then processing order, orders
+    from shards sharing a market are merged:
+
+        markets: {marketId: [order.info, ..]}
+        cleared_orders_meta: [[order.info, ..], ..]
+        logging_controls: {LoggingControl.NAME: [cache, ..]}
+    """
+
+    def __init__(self):
+        self.markets = {}
+        self.cleared_orders_meta = []
+        self.logging_controls = {}
+
+    def update(self, shard_result: dict) -> None:
+        for market_id, orders in shard_result["markets"].items():
+            self.markets.setdefault(market_id, []).extend(orders)
+        self.cleared_orders_meta.extend(shard_result["cleared_orders_meta"])
+        for name, cache in shard_result["logging_controls"].items():
+            self.logging_controls.setdefault(name, []).extend(cache)
+
+    @property
+    def orders(self) -> list:
+        return [order for orders in self.markets.values() for order in orders]
+
+
+def create_shards(event_streams: dict, processes: int) -> List[list]:
+    """Splits event_streams into `processes` shards of
+    stream ids, event processing groups are kept
+    together so that cross market muxing still works.
+    Deterministic, largest groups assigned first to the
+    least loaded shard.
+    """
+    groups = []
+    for event_id, streams in event_streams.items():
+        if event_id is None:
+            groups.extend([[stream.stream_id] for stream in streams])
+        else:
+            groups.append([stream.stream_id for stream in streams])
+    shards = [[] for _ in range(min(processes, len(groups)))]
+    for group in sorted(groups, key=len, reverse=True):
+        shard = min(shards, key=len)
+        shard.extend(group)
+    return [shard for shard in shards if shard]
+
+
+def run_shard(setup: Callable[[], FlumineBacktest], stream_ids: list) -> dict:
+    """Worker process, creates a new framework and
+    strategies using setup and restricts streams
+    to the provided stream ids (setup is deterministic
+    so ids match the parent, unlike market filters
+    which can be shared by multiple streams).
+    """
+    framework = setup()
+    stream_ids = set(stream_ids)
+    framework.streams._streams = [
+        stream for stream in framework.streams if stream.stream_id in stream_ids
+    ]
+    shard_logging_control = ShardLoggingControl()
+    framework.add_logging_control(shard_logging_control)
+    framework.run()
+    return get_shard_result(framework, shard_logging_control)
+
+
+def get_shard_result(
+    framework: FlumineBacktest, shard_logging_control: ShardLoggingControl
+) -> dict:
+    return {
+        "markets": {
+            market.market_id: [order.info for order in market.blotter]
+            for market in framework.markets
+        },
+        "cleared_orders_meta": shard_logging_control.cache,
+        "logging_controls": {
+            logging_control.NAME: logging_control.cache
+            for logging_control in framework._logging_controls
+            if logging_control is not shard_logging_control
+        },
+    }
+
+
+def run_parallel(
+    setup: Callable[[], FlumineBacktest], processes: int = None
+) -> BacktestResult:
+    """
+    Runs a backtest across multiple processes, setup
+    must be a picklable (module level) function that
+    returns a FlumineBacktest instance with strategies
+    (and any middleware/controls) added, this is called
+    once in the parent to create the shards and then
+    once per worker:
+
+        def setup():
+            framework = FlumineBacktest(client=clients.BacktestClient())
+            framework.add_strategy(strategy)
+            return framework
+
+        result = run_parallel(setup, processes=8)
+
+    Logging control `cache` values are returned so
+    must be picklable.
+    """
+    processes = processes or os.cpu_count()
+    framework = setup()
+    if framework.chronological:
+        # all streams muxed together so cannot be split
+        shards = [[stream.stream_id for stream in framework.streams]]
+    else:
+        shards = create_shards(framework.event_streams, processes)
+    logger.info(
+        "Starting parallel backtest",
+        extra={
+            "processes": processes,
+            "shards": len(shards),
+            "streams": sum(len(shard) for shard in shards),
+        },
+    )
+    result = BacktestResult()
+    with ProcessPoolExecutor(max_workers=len(shards) or 1) as executor:
+        # map preserves shard order regardless of completion order
+        for shard_result in executor.map(run_shard, [setup] * len(shards), shards):
+            result.update(shard_result)
+    logger.info("Parallel backtest complete", extra={"markets": len(result.markets)})
+    return result
@@ -0,0 +1,114 @@
+import os
+import pickle
+import hashlib
+import logging
+from typing import Iterator, Optional
+from betfairlightweight.compat import json
+
+from .historicalfiles import open_binary, read_lines
+
+logger = logging.getLogger(__name__)
+
+"""
+Pre-parsed binary replay cache for historical streaming
+files, the first run decodes the raw json and writes each
+update as a pickle frame to `<cache_dir>/<sha1>.replay`,
+later runs load the frames directly (no json decoding).
+
+Files are keyed by content hash so renamed/copied files
+share the same replay file and edited files are recompiled.
+"""
+
+REPLAY_FILE_EXTENSION = ".replay"
+HASH_CHUNK_SIZE = 1 << 20  # 1MB
+
+
+def file_hash(file_path: str) -> str:
+    # hash of stored (compressed) bytes
+    hash_ = hashlib.sha1()
+    with open_binary(file_path, decompress=False) as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hash_.update(chunk)
+    return hash_.hexdigest()
+
+
+def get_replay_path(file_path: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, file_hash(file_path) + REPLAY_FILE_EXTENSION)
+
+
+def read_raw_file(file_path: str, offset: int = 0) -> Iterator[dict]:
+    """Decodes each line of a raw streaming file,
+    malformed / non update lines are logged and skipped.
+    """
+    loads = json.loads
+    for line in read_lines(file_path, offset):
+        try:
+            update = loads(line)
+        except ValueError:
+            logger.error("value error: %s" % line)
+            continue
+        if isinstance(update, dict) and "pt" in update:
+            yield update
+        else:
+            logger.error("invalid update: %s" % line)
+
+
+def read_replay_file(replay_path: str) -> Iterator[dict]:
+    load = pickle.load
+    with open(replay_path, "rb") as f:
+        while True:
+            try:
+                yield load(f)
+            except EOFError:
+                break
+
+
+def create_replay_file(file_path: str, replay_path: str) -> Iterator[dict]:
+    """Decodes raw streaming file yielding each update
+    whilst writing to a temp file, only moved to the
+    replay path once complete so that an interrupted
+    run does not leave a partial replay file.
+    """
+    os.makedirs(os.path.dirname(replay_path) or ".", exist_ok=True)
+    tmp_path = "{0}.{1}.tmp".format(replay_path, os.getpid())
+    complete = False
+    try:
+        with open(tmp_path, "wb") as r:
+            pickler = pickle.Pickler(r, protocol=pickle.HIGHEST_PROTOCOL)
+            for update in read_raw_file(file_path):
+                pickler.dump(update)
+                pickler.clear_memo()  # frames loaded independently
+                yield update
+        os.replace(tmp_path, replay_path)
+        complete = True
+        logger.info(
+            "Replay file created",
+            extra={"file_path": file_path, "replay_path": replay_path},
+        )
+    finally:
+        if not complete and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def compile_replay_file(file_path: str, cache_dir: str) -> str:
+    """One-off conversion of a raw streaming file,
+    returns the replay file path.
+    """
+    replay_path = get_replay_path(file_path, cache_dir)
+    if not os.path.exists(replay_path):
+        for _ in create_replay_file(file_path, replay_path):
+            pass
+    return replay_path
+
+
+def read_updates(file_path: str, cache_dir: Optional[str] = None) -> Iterator[dict]:
+    """Returns decoded updates for a raw streaming file,
+    using/creating the replay cache if cache_dir provided.
+    """
+    if cache_dir is None:
+        return read_raw_file(file_path)
+    replay_path = get_replay_path(file_path, cache_dir)
+    if os.path.exists(replay_path):
+        return read_replay_file(replay_path)
+    else:
+        return create_replay_file(file_path, replay_path)
@@ -1,5 +1,4 @@
 import logging
-import datetime
 from typing import List, Optional
 from betfairlightweight.resources.bettingresources import MarketBook, RunnerBook
 
@@ -10,7 +9,7 @@ from .utils import (
 )
 from ..utils import get_price, wap
 from ..order.ordertype import OrderTypes
-from .. import config
+from .. import config, clock
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +50,7 @@ class Simulated:
                 if market_book.status == "SUSPENDED":  # Material change
                     if self.order.order_type.persistence_type == "LAPSE":
                         self.size_lapsed += self.size_remaining
+                        self.order.exposure_changed()
                         return
 
             # todo estimated piq cancellations
@@ -183,7 +183,7 @@ class Simulated:
             bet_id=str(bet_id),
             average_price_matched=self.average_price_matched,
             size_matched=self.size_matched,
-            placed_date=datetime.datetime.utcnow(),
+            placed_date=clock.utcnow(),
             error_code=error_code,
         )
 
@@ -205,7 +205,7 @@ class Simulated:
             return SimulatedCancelResponse(
                 status="SUCCESS",  # todo handle errors
                 size_cancelled=_size_cancelled,
-                cancelled_date=datetime.datetime.utcnow(),
+                cancelled_date=clock.utcnow(),
             )
         else:
             return SimulatedCancelResponse(
@@ -371,6 +371,7 @@ class Simulated:
         logger.debug("Simulated order {0} matched: {1}".format(self.order.id, data))
         self.matched.append(data)
         self.size_matched, self.average_price_matched = wap(self.matched)
+        self.order.exposure_changed()
 
     @property
     def size_remaining(self) -> float:
@@ -428,6 +429,17 @@ class Simulated:
             else:
                 return "EXECUTION_COMPLETE"
 
+    @property
+    def state(self) -> tuple:
+        # changes whenever matching / status changes
+        return (
+            self.status,
+            self.size_matched,
+            self.size_cancelled,
+            self.size_lapsed,
+            self.size_voided,
+        )
+
     @property
     def info(self) -> dict:
         return {
@@ -0,0 +1,130 @@
+import logging
+from contextlib import ExitStack
+from typing import Any, Callable, List
+
+from .backtest import FlumineBacktest
+from .parallel import BacktestResult, ShardLoggingControl, get_shard_result
+from ..clients import ExchangeType
+from ..clock import set_clock, reset_clock
+from ..exceptions import RunError
+
+logger = logging.getLogger(__name__)
+
+
+class FlumineSweep:
+    """
+    Runs multiple isolated backtest contexts from a
+    single parse of the historical data, each context
+    is a FlumineBacktest instance with its own client,
+    markets/blotter, simulated execution, middleware
+    and controls. Streams are parsed by the first
+    context and MarketBooks passed to every context
+    subscribed to that stream.
+    """
+
+    def __init__(self, frameworks: List[FlumineBacktest]):
+        if not frameworks:
+            raise RunError("At least one framework is required to run a sweep")
+        self.frameworks = frameworks
+        self.framework = frameworks[0]  # parses streams
+        self._stream_contexts = {}  # streamId: [<FlumineBacktest>, ..]
+
+    def run(self) -> None:
+        clients = set()
+        for framework in self.frameworks:
+            if framework.client.EXCHANGE != ExchangeType.SIMULATED:
+                raise RunError(
+                    "Incorrect client provided, only a Simulated client can be used when backtesting"
+                )
+            elif id(framework.client) in clients:
+                raise RunError("Each sweep context requires its own client")
+            clients.add(id(framework.client))
+        self._map_streams()
+        for framework in self.frameworks:
+            framework.clock = self.framework.clock  # shared publish time
+        token = set_clock(self.framework.clock)
+        with ExitStack() as stack:
+            stack.callback(reset_clock, token)
+            for framework in self.frameworks:
+                stack.enter_context(framework)
+            for event in self.framework._stream_market_books():
+                if event is None:
+                    for framework in self.frameworks:
+                        framework.handler_queue.clear()
+                else:
+                    stream_id = event.event[0].streaming_unique_id
+                    for framework in self._stream_contexts[stream_id]:
+                        framework._process_market_books(event)
+
+            for framework in self.frameworks:
+                framework._process_end_flumine()
+
+            logger.info("Sweep complete", extra={"contexts": len(self.frameworks)})
+
+    def _map_streams(self) -> None:
+        """Dedupes streams across contexts using the
+        first context's streams, stream ids are updated
+        on any additional streams (and the strategies
+        subscribed to them).
+        """
+        streams = {
+            (stream.market_filter, stream.event_processing): stream
+            for stream in self.framework.streams
+        }
+        for framework in self.frameworks:
+            stream_ids = {}
+            for stream in framework.streams:
+                key = (stream.market_filter, stream.event_processing)
+                old_stream_id = stream.stream_id
+                if key not in streams:  # stream only used by this context
+                    stream.stream_id = self.framework.streams._increment_stream_id()
+                    self.framework.streams._streams.append(stream)
+                    streams[key] = stream
+                stream_id = streams[key].stream_id
+                stream_ids[old_stream_id] = stream_id
+                self._stream_contexts.setdefault(stream_id, []).append(framework)
+            for strategy in framework.strategies:
+                strategy.historic_stream_ids = [
+                    stream_ids.get(stream_id, stream_id)
+                    for stream_id in strategy.historic_stream_ids
+                ]
+            framework.strategies.update_stream_index()
+
+
+def run_sweep(
+    setup: Callable[[Any], FlumineBacktest], variants: list
+) -> List[BacktestResult]:
+    """
+    Runs a parameter sweep, setup is called once per
+    variant and must return a new FlumineBacktest
+    instance (with its own client) with strategies
+    added:
+
+        def setup(context):
+            framework = FlumineBacktest(client=clients.BacktestClient())
+            framework.add_strategy(ExampleStrategy(market_filter=.., context=context))
+            return framework
+
+        results = run_sweep(setup, [{"stake": 2}, {"stake": 5}])
+
+    Returns a BacktestResult per variant (in order).
+    """
+    frameworks, shard_logging_controls = [], []
+    for variant in variants:
+        framework = setup(variant)
+        shard_logging_control = ShardLoggingControl()
+        framework.add_logging_control(shard_logging_control)
+        frameworks.append(framework)
+        shard_logging_controls.append(shard_logging_control)
+    sweep = FlumineSweep(frameworks)
+    logger.info(
+        "Starting sweep",
+        extra={"variants": len(variants), "streams": len(sweep.framework.streams)},
+    )
+    sweep.run()
+    results = []
+    for framework, shard_logging_control in zip(frameworks, shard_logging_controls):
+        result = BacktestResult()
+        result.update(get_shard_result(framework, shard_logging_control))
+        results.append(result)
+    return results
@@ -1,4 +1,8 @@
+import heapq
 import datetime
+import itertools
+from collections import defaultdict
+from typing import Iterator, Optional
 
 
 class SimulatedPlaceResponse:
@@ -43,3 +47,69 @@ class SimulatedUpdateResponse:
     ):
         self.status = status
         self.error_code = error_code
+
+
+class PendingPackages:
+    """
+    Per market priority queue of order packages
+    waiting on simulated latency/bet delay, keyed
+    by the time the package becomes due:
+
+        _time_created (epoch ms) + simulated_delay
+
+    Allows only due packages to be popped rather
+    than scanning every pending package.
+    """
+
+    def __init__(self):
+        self._markets = defaultdict(
+            list
+        )  # marketId: [(due, count, <OrderPackage>), ..]
+        self._count = itertools.count()  # FIFO on matching due times
+        self._len = 0
+
+    def append(self, order_package) -> None:
+        due = order_package._time_created + order_package.simulated_delay * 1e3
+        heapq.heappush(
+            self._markets[order_package.market_id],
+            (due, next(self._count), order_package),
+        )
+        self._len += 1
+
+    def pop_due(self, market_id: str) -> Iterator:
+        # yields packages where `elapsed_seconds > simulated_delay`
+        heap = self._markets.get(market_id)
+        while heap:
+            order_package = heap[0][2]
+            if order_package.elapsed_seconds > order_package.simulated_delay:
+                heapq.heappop(heap)
+                self._len -= 1
+                yield order_package
+            else:
+                break
+        if heap is not None and not heap:
+            del self._markets[market_id]
+
+    def pop_all_due(self) -> list:
+        order_packages = []
+        for market_id in list(self._markets):
+            order_packages.extend(self.pop_due(market_id))
+        return order_packages
+
+    @property
+    def next_due(self) -> Optional[float]:
+        # earliest due time (epoch ms) across all markets
+        if self._markets:
+            return min(heap[0][0] for heap in self._markets.values())
+
+    def clear(self) -> None:
+        self._markets.clear()
+        self._len = 0
+
+    def __iter__(self) -> Iterator:
+        for heap in self._markets.values():
+            for _, _, order_package in sorted(heap):
+                yield order_package
+
+    def __len__(self) -> int:
+        return self._len
@@ -1,5 +1,4 @@
 import time
-import queue
 import logging
 import threading
 from typing import Type
@@ -8,13 +7,16 @@ from betfairlightweight import resources
 from .strategy.strategy import Strategies, BaseStrategy
 from .streams.streams import Streams
 from .events import events
+from .events.handlerqueue import HandlerQueue
 from .worker import BackgroundWorker
 from .clients.baseclient import BaseClient
 from .markets.markets import Markets
 from .markets.market import Market
 from .markets.middleware import Middleware, SimulatedMiddleware
 from .execution.betfairexecution import BetfairExecution
+from .execution.asyncexecution import AsyncBetfairExecution
 from .execution.simulatedexecution import SimulatedExecution
+from .execution.coalescer import OrderCoalescer
 from .order.process import process_current_orders
 from .controls.clientcontrols import BaseControl, MaxTransactionCount
 from .controls.tradingcontrols import (
@@ -24,7 +26,9 @@ from .controls.tradingcontrols import (
 )
 from .controls.loggingcontrols import LoggingControl
 from .exceptions import FlumineException
-from . import config, utils
+from .latency import LatencyRecorder
+from .profiler import Profiler
+from . import config, utils, latency
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +47,19 @@ class BaseFlumine:
         self._running = False
 
         # queues
-        self.handler_queue = queue.Queue()
+        self.handler_queue = HandlerQueue()
+        self.events_processed = 0
+        self.market_books_conflated = 0
+
+        # latency histograms
+        self.latency = LatencyRecorder(
+            enabled=config.latency_histograms and not self.BACKTEST
+        )
+
+        # strategy/middleware/logging control profiling
+        self.profiler = Profiler(
+            enabled=config.profiling, sample_rate=config.profiling_sample_rate
+        )
 
         # all markets
         self.markets = Markets()
@@ -64,7 +80,17 @@ class BaseFlumine:
         self.simulated_execution = SimulatedExecution(
             self, config.max_execution_workers
         )
-        self.betfair_execution = BetfairExecution(self, config.max_execution_workers)
+        if config.execution_engine == "asyncio":
+            self.betfair_execution = AsyncBetfairExecution(
+                self, config.max_execution_workers
+            )
+        else:
+            self.betfair_execution = BetfairExecution(
+                self, config.max_execution_workers
+            )
+
+        # cross strategy transaction merging (config.coalesce_order_packages)
+        self.order_coalescer = OrderCoalescer(self)
 
         # logging controls (e.g. database logger)
         self._logging_controls = []
@@ -108,6 +134,7 @@ class BaseFlumine:
 
     def add_logging_control(self, logging_control: LoggingControl) -> None:
         logger.info("Adding logging control {0}".format(logging_control.NAME))
+        logging_control.profiler = self.profiler
         self._logging_controls.append(logging_control)
 
     def log_control(self, event: events.BaseEvent) -> None:
@@ -118,18 +145,19 @@ class BaseFlumine:
         return
 
     def _process_market_books(self, event: events.MarketBookEvent) -> None:
+        record_latency = self.latency.enabled
         for market_book in event.event:
             market_id = market_book.market_id
 
             # check latency (only if marketBook is from a stream update)
             if market_book.streaming_snap is False:
-                latency = time.time() - (market_book.publish_time_epoch / 1e3)
-                if latency > 2:
+                book_latency = time.time() - (market_book.publish_time_epoch / 1e3)
+                if book_latency > 2:
                     logger.warning(
                         "High latency between current time and MarketBook publish time",
                         extra={
                             "market_id": market_id,
-                            "latency": latency,
+                            "latency": book_latency,
                             "pt": market_book.publish_time,
                         },
                     )
@@ -146,19 +174,84 @@ class BaseFlumine:
 
             # process market
             market(market_book)
+            self.markets.index_market(market)
 
             # process middleware
             for middleware in self._market_middleware:
-                utils.call_middleware_error_handling(middleware, market)
+                self.profiler.call(
+                    middleware.__class__.__name__,
+                    "__call__",
+                    utils.call_middleware_error_handling,
+                    middleware,
+                    market,
+                )
 
-            for strategy in self.strategies:
-                if utils.call_strategy_error_handling(
-                    strategy.check_market, market, market_book
-                ):
-                    utils.call_strategy_error_handling(
-                        strategy.process_market_book, market, market_book
+            if record_latency:
+                market_type = market.market_type
+                if market_book.streaming_snap is False:
+                    self.latency.record(
+                        latency.PUBLISH_TO_EVENT,
+                        (event._time_created - market_book.publish_time_epoch) / 1e3,
+                        market_type=market_type,
                     )
 
+            for strategy in self.strategies.stream_strategies(
+                market_book.streaming_unique_id
+            ):
+                elapsed_us = self._process_strategy_market_book(
+                    strategy, market, market_book
+                )
+                if record_latency:
+                    self.latency.record(
+                        latency.STRATEGY_PROCESSING,
+                        elapsed_us / 1e6,
+                        strategy=strategy.name,
+                        market_type=market_type,
+                    )
+
+            # execute orders merged across strategies
+            self.order_coalescer.flush(market_id)
+
+    def _process_strategy_market_book(
+        self, strategy: BaseStrategy, market: Market, market_book
+    ) -> int:
+        """Calls strategy check_market/process_market_book,
+        returns elapsed us and warns if over budget (live only).
+        """
+        start = time.perf_counter()
+        if self.profiler.call(
+            strategy.name,
+            "check_market",
+            utils.call_strategy_error_handling,
+            strategy.check_market,
+            market,
+            market_book,
+        ):
+            self.profiler.call(
+                strategy.name,
+                "process_market_book",
+                utils.call_strategy_error_handling,
+                strategy.process_market_book,
+                market,
+                market_book,
+            )
+        elapsed_us = int((time.perf_counter() - start) * 1e6)
+        if (
+            self.BACKTEST is False
+            and config.strategy_time_budget is not None
+            and elapsed_us > config.strategy_time_budget * 1e6
+        ):
+            logger.warning(
+                "Strategy exceeded time budget processing MarketBook",
+                extra={
+                    "strategy_name": strategy.name,
+                    "market_id": market.market_id,
+                    "elapsed": elapsed_us / 1e6,
+                    "budget": config.strategy_time_budget,
+                },
+            )
+        return elapsed_us
+
     def process_order_package(self, order_package) -> None:
         """Execute through client."""
         order_package.client.execution.handler(order_package)
@@ -197,9 +290,14 @@ class BaseFlumine:
                     datum["_stream_id"] = stream_id
                     self.handler_queue.put(events.CloseMarketEvent(datum))
 
-            for strategy in self.strategies:
-                if stream_id in strategy.stream_ids:
-                    strategy.process_raw_data(publish_time, datum)
+            for strategy in self.strategies.stream_strategies(stream_id):
+                self.profiler.call(
+                    strategy.name,
+                    "process_raw_data",
+                    strategy.process_raw_data,
+                    publish_time,
+                    datum,
+                )
 
     def _process_market_catalogues(self, event: events.MarketCatalogueEvent) -> None:
         for market_catalogue in event.event:
@@ -215,18 +313,37 @@ class BaseFlumine:
                 else:
                     market.market_catalogue = market_catalogue
                 market.update_market_catalogue = False
+                self.markets.index_market(market)
 
     def _process_current_orders(self, event: events.CurrentOrdersEvent) -> None:
         # update state
         process_current_orders(
-            self.markets, self.strategies, event, self.log_control, self._add_market
+            self.markets,
+            self.strategies,
+            event,
+            self.log_control,
+            self._add_market,
+            self.latency,
         )
-        for market in self.markets:
+        if event.market_ids is None:
+            markets = self.markets
+        else:  # simulated, only markets with order changes
+            markets = [
+                self.markets.markets[market_id]
+                for market_id in event.market_ids
+                if market_id in self.markets.markets
+            ]
+        for market in markets:
             if market.closed is False:
                 for strategy in self.strategies:
                     strategy_orders = market.blotter.strategy_orders(strategy)
-                    utils.call_process_orders_error_handling(
-                        strategy, market, strategy_orders
+                    self.profiler.call(
+                        strategy.name,
+                        "process_orders",
+                        utils.call_process_orders_error_handling,
+                        strategy,
+                        market,
+                        strategy_orders,
                     )
 
     def _process_custom_event(self, event: events.CustomEvent) -> None:
@@ -267,13 +384,12 @@ class BaseFlumine:
             )
             return
         if market.closed is False:
-            market.close_market()
+            self.markets.close_market(market_id)
         if recorder is False:
             market.blotter.process_closed_market(event.event)
 
-        for strategy in self.strategies:
-            if stream_id in strategy.stream_ids:
-                strategy.process_closed_market(market, event.event)
+        for strategy in self.strategies.stream_strategies(stream_id):
+            strategy.process_closed_market(market, event.event)
 
         if recorder is False:
             if self.BACKTEST or self.client.paper_trade:
@@ -289,14 +405,7 @@ class BaseFlumine:
         if (
             self.BACKTEST is False and self.client.paper_trade is False
         ):  # due to monkey patching this will clear backtested markets
-            closed_markets = [
-                m
-                for m in self.markets
-                if m.closed
-                and m.elapsed_seconds_closed
-                and m.elapsed_seconds_closed > 3600
-            ]
-            for market in closed_markets:
+            for market in self.markets.expired_markets(3600):
                 self._remove_market(market)
 
     def _process_cleared_orders(self, event):
@@ -344,6 +453,12 @@ class BaseFlumine:
                 "market_count": len(self.markets),
                 "open_market_count": len(self.markets.open_market_ids),
             },
+            "handler_queue": {
+                "events_processed": self.events_processed,
+                "market_books_conflated": self.market_books_conflated,
+            },
+            "profiling": self.profiler.info,
+            "order_coalescer": self.order_coalescer.info,
             "streams": [s for s in self.streams],
             "logging_controls": self._logging_controls,
             "threads": threading.enumerate(),
@@ -380,6 +495,8 @@ class BaseFlumine:
     def __exit__(self, *args):
         # shutdown streams
         self.streams.stop()
+        # execute any coalesced orders
+        self.order_coalescer.flush()
         # shutdown thread pools
         self.simulated_execution.shutdown()
         self.betfair_execution.shutdown()
@@ -0,0 +1,90 @@
+import time
+import datetime
+import threading
+
+"""
+Clock used for framework timestamps, integer epoch
+milliseconds so that elapsed calculations are plain
+int arithmetic.
+
+Live uses the wall clock, FlumineBacktest sets a
+BacktestClock for the current thread which is updated
+with each MarketBook publish time, this keeps backtests
+isolated so that they can be run side by side (separate
+threads) in the same interpreter. Framework threads
+(workers / logging controls) use the clock of the
+thread that started them.
+"""
+
+EPOCH = datetime.datetime.utcfromtimestamp(0)
+
+
+class Clock:
+    """Wall clock"""
+
+    @staticmethod
+    def epoch_ms() -> int:
+        return int(time.time() * 1e3)
+
+    @staticmethod
+    def utcnow() -> datetime.datetime:
+        return datetime.datetime.utcnow()
+
+
+class BacktestClock(Clock):
+    """Clock set from MarketBook publish time."""
+
+    def __init__(self, epoch_ms: int = None):
+        self._epoch_ms = Clock.epoch_ms() if epoch_ms is None else epoch_ms
+        self._utcnow = None
+
+    def update(self, epoch_ms: int, utcnow: datetime.datetime = None) -> None:
+        # utcnow (marketBook.publish_time) prevents datetime creation
+        self._epoch_ms = epoch_ms
+        self._utcnow = utcnow
+
+    def epoch_ms(self) -> int:
+        return self._epoch_ms
+
+    def utcnow(self) -> datetime.datetime:
+        if self._utcnow is None:
+            self._utcnow = to_datetime(self._epoch_ms)
+        return self._utcnow
+
+
+WALL_CLOCK = Clock()
+
+_local = threading.local()
+
+
+def get_clock() -> Clock:
+    return getattr(_local, "clock", WALL_CLOCK)
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Sets the clock for the current thread,
+    returns the previous clock for `reset_clock`.
+    """
+    previous = get_clock()
+    _local.clock = clock
+    return previous
+
+
+def reset_clock(previous: Clock) -> None:
+    _local.clock = previous
+
+
+def epoch_ms() -> int:
+    return get_clock().epoch_ms()
+
+
+def utcnow() -> datetime.datetime:
+    return get_clock().utcnow()
+
+
+def elapsed_seconds(from_epoch_ms: int) -> float:
+    return (get_clock().epoch_ms() - from_epoch_ms) / 1e3
+
+
+def to_datetime(value_epoch_ms: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(milliseconds=value_epoch_ms)
@@ -3,6 +3,8 @@ import socket
 
 simulated = False
 
+current_time = None  # deprecated, backtest time (use flumine.clock.utcnow)
+
 instance_id = None  # instance id (e.g. AWS ec2 instanceId)
 
 hostname = socket.gethostname()[
@@ -11,14 +13,38 @@ hostname = socket.gethostname()[
 
 process_id = os.getpid()  # process id of app
 
-current_time = None  # used for backtesting
+replay_cache_dir = (
+    None  # directory for pre-parsed historical replay files (backtesting)
+)
+
+line_index = False  # build/use sidecar publish time index for historical files
+
+# events served per round from each handler queue lane (priority)
+handler_queue_weights = {"HIGH": 8, "NORMAL": 2, "LOW": 1}
+
+conflate_market_books = True  # drop superseded MarketBooks when handler queue backs up
+
+latency_histograms = True  # record lifecycle latency histograms (live only)
+latency_log_interval = 60  # seconds between LatencyEvent snapshots to logging controls
+
+profiling = False  # sampled timings of strategy hooks/middleware/logging controls
+profiling_sample_rate = 10  # time 1 in n calls
+strategy_time_budget = 0.1  # seconds per MarketBook before warning (None to disable)
 
 raise_errors = False  # used for call_check_market / call_process_market_book
 
-max_execution_workers = 32  # max number of workers in execution thread pool
+max_execution_workers = (
+    32  # max number of workers in execution thread pool (or in-flight requests)
+)
+
+execution_engine = "threads"  # betfair execution, "threads" or "asyncio"
+
+execution_warm_sessions = 4  # sessions/connections kept warm (pinged), 0 to disable
 
 async_place_orders = False  # async place orders
 
+coalesce_order_packages = False  # merge transactions per market across strategies
+
 # latencies used for backtesting
 place_latency = 0.120
 cancel_latency = 0.170
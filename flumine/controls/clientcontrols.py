@@ -1,11 +1,13 @@
 import datetime
 import logging
 import threading
+import multiprocessing
 from typing import Optional
 
 from ..order.orderpackage import BaseOrder, OrderPackageType
 from . import BaseControl
 from ..clients.baseclient import BaseClient
+from .. import clock
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +61,7 @@ class MaxTransactionCount(BaseControl):
     def _check_hour(self) -> None:
         if self._next_hour is None:
             self._set_next_hour()
-        elif datetime.datetime.utcnow() > self._next_hour:
+        elif clock.utcnow() > self._next_hour:
             logger.info(
                 "Execution new hour",
                 extra={
@@ -74,7 +76,7 @@ class MaxTransactionCount(BaseControl):
             self._set_next_hour()
 
     def _set_next_hour(self) -> None:
-        now = datetime.datetime.utcnow()
+        now = clock.utcnow()
         self._next_hour = (now + datetime.timedelta(hours=1)).replace(
             minute=0, second=0, microsecond=0
         )
@@ -111,3 +113,73 @@ class MaxTransactionCount(BaseControl):
     @property
     def transaction_limit(self) -> Optional[int]:
         return self.client.transaction_limit
+
+
+class SharedMaxTransactionCount(MaxTransactionCount):
+
+    """
+    MaxTransactionCount with counts held in shared
+    memory (multiprocessing.Array) so that the limit
+    is applied across worker processes, see
+    FlumineSupervisor.
+    """
+
+    # shared array index
+    HOUR, CURRENT, CURRENT_FAILED, TOTAL, TOTAL_FAILED = range(5)
+
+    def __init__(self, flumine, client: BaseClient, counts):
+        BaseControl.__init__(self, flumine)
+        self.client = client
+        self._counts = counts
+        self._lock = counts.get_lock()
+
+    @staticmethod
+    def create_counts():
+        return multiprocessing.Array("q", 5)
+
+    def add_transaction(self, count: int, failed: bool = False) -> None:
+        with self._lock:
+            if failed:
+                self._counts[self.TOTAL_FAILED] += count
+                self._counts[self.CURRENT_FAILED] += count
+            else:
+                self._counts[self.TOTAL] += count
+                self._counts[self.CURRENT] += count
+
+    def _check_hour(self) -> None:
+        hour = clock.epoch_ms() // 3600000
+        with self._lock:
+            if self._counts[self.HOUR] == hour:
+                return
+            elif self._counts[self.HOUR]:
+                logger.info(
+                    "Execution new hour",
+                    extra={
+                        "current_transaction_count_total": self.current_transaction_count_total,
+                        "current_transaction_count": self.current_transaction_count,
+                        "current_failed_transaction_count": self.current_failed_transaction_count,
+                        "total_transaction_count": self.transaction_count,
+                        "total_failed_transaction_count": self.failed_transaction_count,
+                        "client": self.client.info,
+                    },
+                )
+            # first worker to see the new hour resets
+            self._counts[self.HOUR] = hour
+            self._counts[self.CURRENT] = 0
+            self._counts[self.CURRENT_FAILED] = 0
+
+    @property
+    def current_transaction_count(self) -> int:
+        return self._counts[self.CURRENT]
+
+    @property
+    def current_failed_transaction_count(self) -> int:
+        return self._counts[self.CURRENT_FAILED]
+
+    @property
+    def transaction_count(self) -> int:
+        return self._counts[self.TOTAL]
+
+    @property
+    def failed_transaction_count(self) -> int:
+        return self._counts[self.TOTAL_FAILED]
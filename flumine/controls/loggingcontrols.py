@@ -2,6 +2,7 @@ import logging
 import queue
 from threading import Thread
 
+from .. import clock
 from ..events import events
 from ..events.events import EventType
 
@@ -21,8 +22,15 @@ class LoggingControl(Thread):
         Thread.__init__(self, daemon=daemon, name=self.NAME)
         self.logging_queue = queue.Queue()
         self.cache = []
+        self.profiler = None  # set by framework
+        self._clock = None  # clock of the starting thread (backtest)
+
+    def start(self) -> None:
+        self._clock = clock.get_clock()
+        super(LoggingControl, self).start()
 
     def run(self) -> None:
+        clock.set_clock(self._clock or clock.WALL_CLOCK)
         logger.info("Starting logging control %s" % self.NAME)
         while True:
             event = self.logging_queue.get()
@@ -31,7 +39,12 @@ class LoggingControl(Thread):
                 break
             else:
                 try:
-                    self.process_event(event)
+                    if self.profiler is None:
+                        self.process_event(event)
+                    else:
+                        self.profiler.call(
+                            self.NAME, "process_event", self.process_event, event
+                        )
                 except Exception as e:
                     logger.critical(
                         "{0} exception raised in {0}".format(e, self.NAME),
@@ -58,6 +71,9 @@ class LoggingControl(Thread):
         elif event.EVENT_TYPE == EventType.BALANCE:
             self._process_balance(event)
 
+        elif event.EVENT_TYPE == EventType.LATENCY:
+            self._process_latency(event)
+
         elif event.EVENT_TYPE == EventType.CLEARED_ORDERS:
             self._process_cleared_orders(event)
 
@@ -116,6 +132,12 @@ class LoggingControl(Thread):
         """
         logger.debug("process_balance: %s" % event)
 
+    def _process_latency(self, event):
+        """
+        :param event.event: list of latency histogram info (ms)
+        """
+        logger.debug("process_latency: %s" % event)
+
     def _process_cleared_orders(self, event):
         """
         :param event.event: betfairlightweight resources.ClearedOrders
@@ -4,7 +4,7 @@ from ..clients.clients import ExchangeType
 from ..order.ordertype import OrderTypes
 from ..order.orderpackage import OrderPackageType, BaseOrder
 from . import BaseControl
-from .. import utils
+from .. import ticks
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +48,7 @@ class OrderValidation(BaseControl):
     def _validate_betfair_price(self, order):
         if order.order_type.price is None:
             self._on_error(order, "Order price is None")
-        elif utils.as_dec(order.order_type.price) not in utils.PRICES:
+        elif not ticks.is_valid_price(order.order_type.price):
             self._on_error(order, "Order price is not valid")
 
     def _validate_betfair_liability(self, order):
@@ -146,9 +146,13 @@ class StrategyExposure(BaseControl):
                 if order.side == "BACK":
                     order_exposure = order.order_type.size
                 else:
-                    order_exposure = (
-                        order.order_type.price - 1
-                    ) * order.order_type.size
+                    if package_type == OrderPackageType.REPLACE:
+                        price = order.update_data.get(
+                            "new_price", order.order_type.price
+                        )
+                    else:
+                        price = order.order_type.price
+                    order_exposure = (price - 1) * order.order_type.size
             elif order.order_type.ORDER_TYPE == OrderTypes.LIMIT_ON_CLOSE:
                 order_exposure = order.order_type.liability  # todo correct?
             elif order.order_type.ORDER_TYPE == OrderTypes.MARKET_ON_CLOSE:
@@ -197,3 +201,106 @@ class StrategyExposure(BaseControl):
                         strategy.max_selection_exposure,
                     ),
                 )
+
+
+class MarketExposure(BaseControl):
+
+    """
+    Validates:
+        - `max_market_exposure` is not violated if order is executed
+
+    Exposure is the worst-case loss across all outcomes of
+    the market (all strategies), for example backing two
+    selections in a win market only loses if neither wins.
+    Not added by default:
+
+        framework.add_trading_control(MarketExposure, max_market_exposure=100)
+    """
+
+    NAME = "MARKET_EXPOSURE"
+
+    def __init__(self, flumine, max_market_exposure: float):
+        super(MarketExposure, self).__init__(flumine)
+        self.max_market_exposure = max_market_exposure
+
+    def _validate(self, order: BaseOrder, package_type: OrderPackageType) -> None:
+        if package_type in (
+            OrderPackageType.PLACE,
+            OrderPackageType.REPLACE,
+        ):
+            market = self.flumine.markets.markets[order.market_id]
+            potential_exposure = market_exposure(market, order, package_type)
+            if potential_exposure > self.max_market_exposure:
+                return self._on_error(
+                    order,
+                    "Potential market exposure ({0:.2f}) is greater than max_market_exposure ({1})".format(
+                        potential_exposure, self.max_market_exposure
+                    ),
+                )
+
+
+class EventExposure(BaseControl):
+
+    """
+    Validates:
+        - `max_event_exposure` is not violated if order is executed
+
+    Exposure is the sum of the worst-case loss of each
+    open market in the event (all strategies), this is a
+    conservative upper bound as outcomes are not matched
+    across markets (correlated markets such as match odds
+    and correct score can not all lose). Not added by
+    default:
+
+        framework.add_trading_control(EventExposure, max_event_exposure=200)
+    """
+
+    NAME = "EVENT_EXPOSURE"
+
+    def __init__(self, flumine, max_event_exposure: float):
+        super(EventExposure, self).__init__(flumine)
+        self.max_event_exposure = max_event_exposure
+
+    def _validate(self, order: BaseOrder, package_type: OrderPackageType) -> None:
+        if package_type in (
+            OrderPackageType.PLACE,
+            OrderPackageType.REPLACE,
+        ):
+            market = self.flumine.markets.markets[order.market_id]
+            potential_exposure = market_exposure(market, order, package_type)
+            for event_market in self.flumine.markets.event_markets(market.event_id):
+                if event_market is not market and event_market.closed is False:
+                    potential_exposure += market_exposure(event_market)
+            if potential_exposure > self.max_event_exposure:
+                return self._on_error(
+                    order,
+                    "Potential event exposure ({0:.2f}) is greater than max_event_exposure ({1})".format(
+                        potential_exposure, self.max_event_exposure
+                    ),
+                )
+
+
+def market_exposure(
+    market, order: BaseOrder = None, package_type: OrderPackageType = None
+) -> float:
+    """Returns market exposure, including order
+    if provided (excluding current state and at the
+    new price if replace).
+    """
+    market_book = market.market_book
+    if market_book:
+        number_of_winners = market_book.number_of_winners
+        runner_count = market_book.number_of_active_runners
+    else:
+        number_of_winners, runner_count = None, None
+    if package_type == OrderPackageType.REPLACE:
+        exclusion, price = order, order.update_data.get("new_price")
+    else:
+        exclusion, price = None, None
+    return market.blotter.market_exposure(
+        number_of_winners,
+        runner_count,
+        order=order,
+        exclusion=exclusion,
+        price=price,
+    )
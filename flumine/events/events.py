@@ -1,5 +1,6 @@
-import datetime
-from enum import Enum
+from enum import Enum, IntEnum
+
+from .. import clock
 
 
 class EventType(Enum):
@@ -14,6 +15,7 @@ class EventType(Enum):
     CLEARED_ORDERS = "ClearedOrders"
     CLEARED_ORDERS_META = "ClearedOrders metadata"
     BALANCE = "Balance"
+    LATENCY = "Latency"
     # flumine objects
     STRATEGY = "Strategy"
     MARKET = "Market"
@@ -29,19 +31,26 @@ class QueueType(Enum):
     LOGGING = "Logging queue"
 
 
+class EventPriority(IntEnum):
+    HIGH = 0  # order state / termination
+    NORMAL = 1  # market data
+    LOW = 2
+
+
 class BaseEvent:
     EVENT_TYPE = None
     QUEUE_TYPE = None
+    PRIORITY = EventPriority.NORMAL
 
     __slots__ = ["_time_created", "event", "callback"]
 
     def __init__(self, event):
-        self._time_created = datetime.datetime.utcnow()
+        self._time_created = clock.epoch_ms()
         self.event = event
 
     @property
     def elapsed_seconds(self):
-        return (datetime.datetime.utcnow() - self._time_created).total_seconds()
+        return clock.elapsed_seconds(self._time_created)
 
     def __str__(self):
         return "<{0} [{1}]>".format(self.EVENT_TYPE.name, self.QUEUE_TYPE.name)
@@ -68,16 +77,23 @@ class RawDataEvent(BaseEvent):
 class CurrentOrdersEvent(BaseEvent):
     EVENT_TYPE = EventType.CURRENT_ORDERS
     QUEUE_TYPE = QueueType.HANDLER
+    PRIORITY = EventPriority.HIGH
+
+    def __init__(self, event, market_ids: set = None):
+        super(CurrentOrdersEvent, self).__init__(event)
+        self.market_ids = market_ids  # markets with order changes (None: all)
 
 
 class ClearedMarketsEvent(BaseEvent):
     EVENT_TYPE = EventType.CLEARED_MARKETS
     QUEUE_TYPE = QueueType.HANDLER
+    PRIORITY = EventPriority.HIGH
 
 
 class ClearedOrdersEvent(BaseEvent):
     EVENT_TYPE = EventType.CLEARED_ORDERS
     QUEUE_TYPE = QueueType.HANDLER
+    PRIORITY = EventPriority.HIGH
 
 
 class CloseMarketEvent(BaseEvent):
@@ -89,9 +105,13 @@ class CustomEvent(BaseEvent):
     EVENT_TYPE = EventType.CUSTOM_EVENT
     QUEUE_TYPE = QueueType.HANDLER
 
-    def __init__(self, event, callback, *args, **kwargs):
+    def __init__(
+        self, event, callback, *args, priority: EventPriority = None, **kwargs
+    ):
         super(CustomEvent, self).__init__(event)
         self.callback = callback
+        if priority is not None:
+            self.PRIORITY = priority
 
 
 # LOGGING
@@ -112,6 +132,11 @@ class BalanceEvent(BaseEvent):
     QUEUE_TYPE = QueueType.LOGGING
 
 
+class LatencyEvent(BaseEvent):
+    EVENT_TYPE = EventType.LATENCY
+    QUEUE_TYPE = QueueType.LOGGING
+
+
 class StrategyEvent(BaseEvent):
     EVENT_TYPE = EventType.STRATEGY
     QUEUE_TYPE = QueueType.LOGGING
@@ -138,3 +163,4 @@ class OrderEvent(BaseEvent):
 class TerminationEvent(BaseEvent):
     EVENT_TYPE = EventType.TERMINATOR
     QUEUE_TYPE = QueueType.HANDLER
+    PRIORITY = EventPriority.HIGH
@@ -0,0 +1,79 @@
+import time
+import queue
+import threading
+from collections import deque
+
+from .events import BaseEvent, EventPriority
+from .. import config
+
+
+class HandlerQueue:
+    """
+    Handler queue with a FIFO lane per EventPriority,
+    drop in replacement for queue.Queue (put/get).
+
+    Lanes are served by weighted round robin, in each
+    round a lane can be served up to its weight before
+    lower priority lanes, so order events are handled
+    ahead of market data but lower lanes always get a
+    share (no starvation). Weights default to
+    config.handler_queue_weights.
+    """
+
+    def __init__(self, weights: dict = None):
+        weights = weights or config.handler_queue_weights
+        self.weights = {
+            priority: max(int(weights[priority.name]), 1) for priority in EventPriority
+        }
+        self._lanes = {priority: deque() for priority in EventPriority}
+        self._credits = dict(self.weights)
+        self._size = 0
+        self._not_empty = threading.Condition(threading.Lock())
+
+    def put(self, event: BaseEvent, block: bool = True, timeout: float = None) -> None:
+        with self._not_empty:
+            self._lanes[event.PRIORITY].append(event)
+            self._size += 1
+            self._not_empty.notify()
+
+    def put_nowait(self, event: BaseEvent) -> None:
+        self.put(event, block=False)
+
+    def get(self, block: bool = True, timeout: float = None) -> BaseEvent:
+        with self._not_empty:
+            if not block:
+                if not self._size:
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._size:
+                    self._not_empty.wait()
+            else:
+                end_time = time.monotonic() + timeout
+                while not self._size:
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    self._not_empty.wait(remaining)
+            return self._pop()
+
+    def get_nowait(self) -> BaseEvent:
+        return self.get(block=False)
+
+    def _pop(self) -> BaseEvent:
+        for _ in range(2):
+            for priority, lane in self._lanes.items():
+                if lane and self._credits[priority]:
+                    self._credits[priority] -= 1
+                    self._size -= 1
+                    return lane.popleft()
+            # all non empty lanes have used their credits, new round
+            self._credits = dict(self.weights)
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return not self._size
+
+    def lane_size(self, priority: EventPriority) -> int:
+        return len(self._lanes[priority])
@@ -0,0 +1,551 @@
+import ssl
+import gzip
+import zlib
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from urllib.parse import urlsplit
+from betfairlightweight import BetfairError, resources
+from betfairlightweight.compat import json
+from betfairlightweight.exceptions import APIError, InvalidResponse
+from betfairlightweight.utils import check_status_code, clean_locals
+
+from .baseexecution import SESSION_KEEP_ALIVE_AGE
+from .betfairexecution import BetfairExecution
+from ..order.orderpackage import BaseOrderPackage, OrderPackageType
+from ..exceptions import OrderExecutionError
+from .. import latency, config
+
+logger = logging.getLogger(__name__)
+
+"""
+asyncio execution engine, order packages are executed
+as coroutines on a dedicated event loop (thread) with
+concurrency bounded by a semaphore and requests sent
+over persistent HTTP/1.1 keep-alive connections rather
+than requests.Session objects, avoiding new TLS
+handshakes when sessions are recycled.
+"""
+
+
+class StaleConnectionError(ConnectionError):
+    """Reused keep-alive connection closed by the
+    server before a response was received.
+    """
+
+
+class HTTPResponse:
+    """Minimal response, compatible with the
+    betfairlightweight status/response handling.
+    """
+
+    __slots__ = ["status_code", "headers", "content"]
+
+    def __init__(self, status_code: int, headers: dict, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class HTTPConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.time_created = time.time()
+        self.time_returned = self.time_created
+        self.requests = 0
+
+    @property
+    def closed(self) -> bool:
+        return self.reader.at_eof() or self.writer.transport.is_closing()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class HTTPConnectionPool:
+    """
+    asyncio HTTP/1.1 connection pool, connections are
+    kept alive and reused per (scheme, host, port), up
+    to `max_idle` idle connections are held. Only used
+    from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_idle: int = 32,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 16,
+        ssl_context: ssl.SSLContext = None,
+    ):
+        self.max_idle = max_idle
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle = {}  # {(scheme, host, port): deque[HTTPConnection]}
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.requests = 0
+
+    async def post(self, url: str, data: bytes, headers: dict) -> HTTPResponse:
+        key, request = self._prepare("POST", url, data, headers)
+        connection = self._get_idle_connection(key)
+        if connection:
+            try:
+                return await self._request(key, connection, request)
+            except StaleConnectionError:
+                # The request may have been sent before the server closed the
+                # connection, resending is safe as every betting request carries
+                # the package customerRef (placeOrders is de-duplicated by the
+                # exchange) and cancel/update/replace of an already processed
+                # instruction fails rather than being repeated.
+                logger.info("Stale keep-alive connection, retrying", extra={"url": url})
+        connection = await self._create_connection(key)
+        return await self._request(key, connection, request)
+
+    async def warm_up(self, url: str, count: int) -> None:
+        """Opens connections until `count` are idle"""
+        key = self._prepare("HEAD", url, b"", {})[0]
+        count = min(count, self.max_idle) - len(self._idle.get(key, ()))
+        if count > 0:
+            results = await asyncio.gather(
+                *(self._create_connection(key) for _ in range(count)),
+                return_exceptions=True,
+            )
+            for connection in results:
+                if isinstance(connection, HTTPConnection):
+                    self._return_connection(key, connection)
+                else:
+                    logger.warning(
+                        "Connection warm up failed",
+                        extra={"url": url, "exception": connection},
+                    )
+
+    async def ping(self, url: str, max_idle_time: float) -> None:
+        """HEAD request on connections idle for more than
+        `max_idle_time`, closed/failed connections are dropped.
+        """
+        key, request = self._prepare("HEAD", url, b"", {})
+        connections = self._idle.get(key, ())
+        now = time.time()
+        stale = [c for c in connections if now - c.time_returned > max_idle_time]
+        for connection in stale:
+            if connection not in connections:
+                continue  # taken by a request whilst pinging
+            connections.remove(connection)
+            try:
+                await self._request(key, connection, request, head=True)
+            except Exception as e:
+                logger.info(
+                    "Connection ping failed", extra={"url": url, "exception": e}
+                )
+
+    def _prepare(self, method: str, url: str, data: bytes, headers: dict) -> tuple:
+        split = urlsplit(url)
+        key = (split.scheme, split.hostname, split.port)
+        path = split.path or "/"
+        if split.query:
+            path += "?" + split.query
+        return key, self._create_request(method, split.netloc, path, data, headers)
+
+    @property
+    def idle_count(self) -> int:
+        return sum(len(connections) for connections in self._idle.values())
+
+    def close(self) -> None:
+        for connections in self._idle.values():
+            while connections:
+                connections.pop().close()
+
+    def _get_idle_connection(self, key: tuple):
+        connections = self._idle.get(key)
+        while connections:
+            connection = connections.pop()
+            if connection.closed:
+                connection.close()
+            else:
+                self.connections_reused += 1
+                return connection
+
+    async def _create_connection(self, key: tuple) -> HTTPConnection:
+        scheme, host, port = key
+        secure = scheme == "https"
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                host,
+                port or (443 if secure else 80),
+                ssl=self.ssl_context if secure else None,
+            ),
+            self.connect_timeout,
+        )
+        self.connections_created += 1
+        logger.info(
+            "New HTTP connection created",
+            extra={
+                "host": host,
+                "connections_created": self.connections_created,
+                "idle_count": self.idle_count,
+            },
+        )
+        return HTTPConnection(reader, writer)
+
+    def _return_connection(self, key: tuple, connection: HTTPConnection) -> None:
+        connections = self._idle.setdefault(key, deque())
+        if len(connections) >= self.max_idle:
+            connection.close()
+        else:
+            connection.time_returned = time.time()
+            connections.append(connection)
+
+    async def _request(
+        self, key: tuple, connection: HTTPConnection, request: bytes, head: bool = False
+    ) -> HTTPResponse:
+        self.requests += 1
+        reused = connection.requests > 0
+        connection.requests += 1
+        try:
+            response, keep_alive = await asyncio.wait_for(
+                self._send(connection, request, reused, head), self.read_timeout
+            )
+        except BaseException:
+            connection.close()
+            raise
+        if keep_alive:
+            self._return_connection(key, connection)
+        else:
+            connection.close()
+        return response
+
+    async def _send(
+        self, connection: HTTPConnection, request: bytes, reused: bool, head: bool
+    ) -> tuple:
+        reader, writer = connection.reader, connection.writer
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+        except ConnectionError as e:
+            if reused:
+                raise StaleConnectionError(e)
+            raise
+        if not status_line:
+            if reused:
+                raise StaleConnectionError("Connection closed by server")
+            raise ConnectionResetError("Connection closed by server")
+        version, status_code = status_line.decode("latin-1").split(" ", 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = (
+            version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        )
+        if head:
+            content = b""  # no body, regardless of headers
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            content = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            content = gzip.decompress(content)
+        elif encoding == "deflate":
+            content = zlib.decompress(content)
+        return HTTPResponse(int(status_code), headers, content), keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # trailers
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)  # \r\n
+
+    @staticmethod
+    def _create_request(
+        method: str, host: str, path: str, data: bytes, headers: dict
+    ) -> bytes:
+        lines = ["{0} {1} HTTP/1.1".format(method, path), "Host: {0}".format(host)]
+        lines.extend("{0}: {1}".format(k, v) for k, v in headers.items())
+        lines.append("Content-Length: {0}".format(len(data)))
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data
+
+
+class AsyncBetfairExecution(BetfairExecution):
+    """
+    BetfairExecution using asyncio rather than the thread
+    pool, `max_workers` limits in-flight requests. Response
+    processing is shared with BetfairExecution.
+    """
+
+    def __init__(self, flumine, max_workers: int = None):
+        super(AsyncBetfairExecution, self).__init__(flumine, max_workers)
+        self._max_concurrency = max_workers or 32
+        self._semaphore = None  # created on loop
+        self._futures = set()
+        self._pool = HTTPConnectionPool(max_idle=self._max_concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._run_loop, name="AsyncExecution", daemon=True
+        )
+        self._loop_thread.start()
+
+    def handler(self, order_package: BaseOrderPackage) -> None:
+        request = self._create_request(order_package)
+        future = asyncio.run_coroutine_threadsafe(
+            self._execute(order_package, *request), self._loop
+        )
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        self._record_latency(
+            latency.EXECUTE_TO_SUBMIT, order_package.elapsed_seconds, order_package
+        )
+        logger.info(
+            "Async execution submit",
+            extra={
+                "trading_function": request[0],
+                "latency": round(order_package.elapsed_seconds, 4),
+                "order_package": order_package.info,
+                "in_flight": len(self._futures),
+            },
+        )
+
+    def _create_request(self, order_package: BaseOrderPackage) -> tuple:
+        """Returns (method, params function, resource, response
+        processing function), params are created when executed
+        (cancel instructions can change whilst waiting).
+        """
+        if order_package.package_type == OrderPackageType.PLACE:
+            return (
+                "placeOrders",
+                self.place_params,
+                resources.PlaceOrders,
+                self.process_place_response,
+            )
+        elif order_package.package_type == OrderPackageType.CANCEL:
+            return (
+                "cancelOrders",
+                self.cancel_params,
+                resources.CancelOrders,
+                self.process_cancel_response,
+            )
+        elif order_package.package_type == OrderPackageType.UPDATE:
+            return (
+                "updateOrders",
+                self.update_params,
+                resources.UpdateOrders,
+                self.process_update_response,
+            )
+        elif order_package.package_type == OrderPackageType.REPLACE:
+            return (
+                "replaceOrders",
+                self.replace_params,
+                resources.ReplaceOrders,
+                self.process_replace_response,
+            )
+        else:
+            raise NotImplementedError()
+
+    @staticmethod
+    def place_params(order_package: BaseOrderPackage) -> dict:
+        return clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=order_package.place_instructions,
+                customer_ref=order_package.id.hex,
+                market_version=order_package.market_version,
+                customer_strategy_ref=order_package.customer_strategy_ref,
+                async_=order_package.async_,
+            )
+        )
+
+    @staticmethod
+    def cancel_params(order_package: BaseOrderPackage) -> dict:
+        cancel_instructions = list(order_package.cancel_instructions)
+        if not cancel_instructions:
+            logger.warning("Empty cancel_instructions", extra=order_package.info)
+            raise OrderExecutionError()
+        return clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=cancel_instructions,
+                customer_ref=order_package.id.hex,
+            )
+        )
+
+    @staticmethod
+    def update_params(order_package: BaseOrderPackage) -> dict:
+        return clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=order_package.update_instructions,
+                customer_ref=order_package.id.hex,
+            )
+        )
+
+    @staticmethod
+    def replace_params(order_package: BaseOrderPackage) -> dict:
+        return clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=order_package.replace_instructions,
+                customer_ref=order_package.id.hex,
+                market_version=order_package.market_version,
+                async_=order_package.async_,
+            )
+        )
+
+    async def _execute(
+        self,
+        order_package: BaseOrderPackage,
+        method: str,
+        params_function,
+        resource,
+        process_response,
+    ) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        if not order_package.orders:
+            logger.warning("Empty package, not executing", extra=order_package.info)
+            return
+        async with self._semaphore:
+            if order_package.elapsed_seconds > 0.1 and order_package.retry_count == 0:
+                logger.warning(
+                    "High latency between current time and OrderPackage creation time, it is likely that max_execution_workers requests are in flight",
+                    extra={
+                        "trading_function": method,
+                        "latency": round(order_package.elapsed_seconds, 3),
+                        "order_package": order_package.info,
+                    },
+                )
+            try:
+                response = await self._request(
+                    order_package, method, params_function(order_package), resource
+                )
+            except BetfairError as e:
+                logger.error(
+                    "Execution error",
+                    extra={
+                        "trading_function": method,
+                        "response": e,
+                        "order_package": order_package.info,
+                    },
+                    exc_info=True,
+                )
+                response = None
+            except Exception as e:
+                logger.critical(
+                    "Execution unknown error",
+                    extra={
+                        "trading_function": method,
+                        "exception": e,
+                        "order_package": order_package.info,
+                    },
+                    exc_info=True,
+                )
+                return
+        if response is None:
+            backoff = order_package.retry_count
+            if order_package.retry(backoff=False):
+                await asyncio.sleep(backoff)
+                await self._execute(
+                    order_package, method, params_function, resource, process_response
+                )
+            return
+        self._record_latency(
+            latency.HTTP_ROUND_TRIP, response.elapsed_time, order_package
+        )
+        logger.info(
+            "execute_%s" % method,
+            extra={
+                "trading_function": method,
+                "elapsed_time": response.elapsed_time,
+                "response": response._data,
+                "order_package": order_package.info,
+            },
+        )
+        process_response(order_package, response)
+
+    async def _request(
+        self, order_package: BaseOrderPackage, method: str, params: dict, resource
+    ):
+        # as per betfairlightweight BaseEndpoint.request
+        betting = order_package.client.betting_client.betting
+        method = "%s%s" % (betting.URI, method)
+        data = betting.create_req(method, params)
+        if isinstance(data, str):  # bytes if orjson
+            data = data.encode("utf-8")
+        time_sent = time.time()
+        try:
+            response = await self._pool.post(
+                betting.url, data, betting.client.request_headers
+            )
+        except Exception as e:
+            raise APIError(None, method, params, e)
+        elapsed_time = time.time() - time_sent
+        check_status_code(response)
+        try:
+            response_json = json.loads(response.content.decode("utf-8"))
+        except ValueError:
+            raise InvalidResponse(response.text)
+        betting._error_handler(response_json, method, params)
+        return betting.process_response(response_json, resource, elapsed_time, None)
+
+    def warm_up(self, client) -> None:
+        count = min(config.execution_warm_sessions, self._max_concurrency)
+        if count > 0 and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(
+                self._pool.warm_up(client.betting_client.betting.url, count),
+                self._loop,
+            ).result()
+
+    def ping_sessions(self, client) -> None:
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(
+            self._pool.ping(client.betting_client.betting.url, SESSION_KEEP_ALIVE_AGE),
+            self._loop,
+        ).result()
+        self.warm_up(client)
+
+    def _create_thread_pool(self) -> None:
+        return None  # requests are executed on the event loop
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def info(self) -> dict:
+        return {
+            "in_flight": len(self._futures),
+            "requests": self._pool.requests,
+            "connections_created": self._pool.connections_created,
+            "connections_reused": self._pool.connections_reused,
+            "idle_connections": self._pool.idle_count,
+        }
+
+    def shutdown(self):
+        logger.info("Shutting down Execution (%s)" % self.__class__.__name__)
+        concurrent.futures.wait(list(self._futures))
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._pool.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
@@ -1,14 +1,18 @@
 import time
 import logging
+import threading
 import requests
 from concurrent.futures import ThreadPoolExecutor
 
 from ..order.orderpackage import BaseOrderPackage, OrderPackageType, BaseOrder
 from ..events.events import OrderEvent
+from ..latency import LatencyHistogram
+from .. import latency, config
 
 logger = logging.getLogger(__name__)
 
 MAX_SESSION_AGE = 200  # seconds since last request
+SESSION_KEEP_ALIVE_AGE = 100  # seconds idle before keep alive ping
 BET_ID_START = 100000000000  # simulated start betId->
 
 
@@ -19,10 +23,20 @@ class BaseExecution:
     def __init__(self, flumine, max_workers: int = None):
         self.flumine = flumine
         self._max_workers = max_workers
-        self._thread_pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._thread_pool = self._create_thread_pool()
         self._bet_id = BET_ID_START
         self._sessions = []
         self._sessions_created = 0
+        self._sessions_deleted = 0
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._requests = 0
+        self._errors = 0
+        self._request_latency = LatencyHistogram()
+
+    def _create_thread_pool(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self._max_workers)
 
     def handler(self, order_package: BaseOrderPackage):
         """Handles order_package, capable of place, cancel,
@@ -39,7 +53,13 @@ class BaseExecution:
             func = self.execute_replace
         else:
             raise NotImplementedError()
-        self._thread_pool.submit(func, order_package, http_session)
+        with self._lock:
+            self._submitted += 1
+        future = self._thread_pool.submit(func, order_package, http_session)
+        future.add_done_callback(self._task_done)
+        self._record_latency(
+            latency.EXECUTE_TO_SUBMIT, order_package.elapsed_seconds, order_package
+        )
         logger.info(
             "Thread pool submit",
             extra={
@@ -47,13 +67,24 @@ class BaseExecution:
                 "session": http_session,
                 "latency": round(order_package.elapsed_seconds, 4),
                 "order_package": order_package.info,
-                "thread_pool": {
-                    "num_threads": len(self._thread_pool._threads),
-                    "work_queue_size": self._thread_pool._work_queue.qsize(),
-                },
+                "in_flight": self.in_flight,
             },
         )
 
+    def _task_done(self, future) -> None:
+        with self._lock:
+            self._completed += 1
+
+    def _record_latency(
+        self, stage: str, seconds: float, order_package: BaseOrderPackage
+    ) -> None:
+        latency_recorder = self.flumine.latency
+        if latency_recorder.enabled:
+            market = self.flumine.markets.markets.get(order_package.market_id)
+            latency_recorder.record(
+                stage, seconds, market_type=market.market_type if market else None
+            )
+
     def execute_place(
         self, order_package: BaseOrderPackage, http_session: requests.Session
     ) -> None:
@@ -74,6 +105,59 @@ class BaseExecution:
     ) -> None:
         raise NotImplementedError
 
+    def warm_up(self, client) -> None:
+        """Creates and pings sessions so that the idle pool holds
+        config.execution_warm_sessions, avoiding TCP/TLS setup
+        on the first requests.
+        """
+        count = min(config.execution_warm_sessions, self._max_workers or 0)
+        for _ in range(count - len(self._sessions)):
+            http_session = self._create_new_session()
+            success = self._ping_session(client, http_session)
+            self._return_http_session(http_session, err=not success)
+
+    def ping_sessions(self, client) -> None:
+        """Pings sessions idle for more than SESSION_KEEP_ALIVE_AGE
+        before they reach MAX_SESSION_AGE, deleting those that fail
+        and topping the pool back up.
+        """
+        now = time.time()
+        idle_sessions = []
+        for http_session in list(self._sessions):
+            if now - http_session.time_returned > SESSION_KEEP_ALIVE_AGE:
+                try:
+                    self._sessions.remove(http_session)
+                except ValueError:
+                    continue  # in use
+                idle_sessions.append(http_session)
+        for http_session in idle_sessions:
+            if now - http_session.time_returned > MAX_SESSION_AGE:
+                self._return_http_session(http_session, err=True)
+            else:
+                success = self._ping_session(client, http_session)
+                self._return_http_session(http_session, err=not success)
+        self.warm_up(client)
+
+    def _ping_session(self, client, http_session: requests.Session) -> bool:
+        raise NotImplementedError
+
+    def _record_session_request(
+        self,
+        http_session: requests.Session,
+        elapsed_time: float = None,
+        err: bool = False,
+    ) -> None:
+        http_session.requests += 1
+        with self._lock:
+            self._requests += 1
+            if err:
+                self._errors += 1
+        if err:
+            http_session.errors += 1
+        else:
+            http_session.elapsed_time += elapsed_time
+            self._request_latency.record(elapsed_time)
+
     def _get_http_session(self) -> requests.Session:
         while self._sessions:
             try:
@@ -91,6 +175,9 @@ class BaseExecution:
         session = requests.Session()
         session.time_created = time.time()
         session.time_returned = time.time()
+        session.requests = 0
+        session.errors = 0
+        session.elapsed_time = 0.0
         self._sessions_created += 1
         logger.info(
             "New requests.Session created",
@@ -108,6 +195,7 @@ class BaseExecution:
         self, http_session: requests.Session, err: bool = False
     ) -> None:
         if err or len(self._sessions) >= self._max_workers:
+            self._sessions_deleted += 1
             logger.info(
                 "Deleting requests.Session",
                 extra={
@@ -115,11 +203,13 @@ class BaseExecution:
                     "session": http_session,
                     "session_time_created": http_session.time_created,
                     "session_time_returned": http_session.time_returned,
+                    "session_requests": http_session.requests,
+                    "session_errors": http_session.errors,
                     "live_sessions_count": len(self._sessions),
                     "err": err,
                 },
             )
-            del http_session
+            http_session.close()
         else:
             http_session.time_returned = time.time()
             self._sessions.append(http_session)
@@ -150,6 +240,37 @@ class BaseExecution:
             order.bet_id = instruction_report.bet_id
             self.flumine.log_control(OrderEvent(order))
 
+    @property
+    def in_flight(self) -> int:
+        return self._submitted - self._completed
+
+    @property
+    def info(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "submitted": self._submitted,
+            "requests": self._requests,
+            "errors": self._errors,
+            "error_rate": round(self._errors / self._requests, 4)
+            if self._requests
+            else 0,
+            "latency": self._request_latency.info,
+            "sessions_created": self._sessions_created,
+            "sessions_deleted": self._sessions_deleted,
+            "idle_sessions": [
+                {
+                    "age": round(time.time() - s.time_created, 1),
+                    "idle": round(time.time() - s.time_returned, 1),
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "mean_latency": round(s.elapsed_time / (s.requests - s.errors), 4)
+                    if s.requests > s.errors
+                    else None,
+                }
+                for s in list(self._sessions)
+            ],
+        }
+
     def shutdown(self):
         logger.info("Shutting down Execution (%s)" % self.__class__.__name__)
         self._thread_pool.shutdown(wait=True)
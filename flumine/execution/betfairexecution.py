@@ -7,6 +7,7 @@ from .baseexecution import BaseExecution
 from ..clients.clients import ExchangeType
 from ..order.orderpackage import BaseOrderPackage, OrderPackageType
 from ..exceptions import OrderExecutionError
+from .. import latency
 
 logger = logging.getLogger(__name__)
 
@@ -20,26 +21,27 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.place, order_package, http_session)
         if response:
-            for (order, instruction_report) in zip(
-                order_package, response.place_instruction_reports
-            ):
-                with order.trade:
-                    self._order_logger(
-                        order, instruction_report, OrderPackageType.PLACE
-                    )
-                    if instruction_report.status == "SUCCESS":
-                        if instruction_report.order_status == "PENDING":
-                            pass  # async request pending processing
-                        else:
-                            order.executable()  # let process.py pick it up
-                    elif instruction_report.status == "FAILURE":
-                        order.execution_complete()
-                    elif instruction_report.status == "TIMEOUT":
-                        # https://docs.developer.betfair.com/display/1smk3cen4v3lu3yomq5qye0ni/Betting+Enums#BettingEnums-ExecutionReportStatus
-                        pass
+            self.process_place_response(order_package, response)
+
+    def process_place_response(self, order_package: BaseOrderPackage, response) -> None:
+        for (order, instruction_report) in zip(
+            order_package, response.place_instruction_reports
+        ):
+            with order.trade:
+                self._order_logger(order, instruction_report, OrderPackageType.PLACE)
+                if instruction_report.status == "SUCCESS":
+                    if instruction_report.order_status == "PENDING":
+                        pass  # async request pending processing
+                    else:
+                        order.executable()  # let process.py pick it up
+                elif instruction_report.status == "FAILURE":
+                    order.execution_complete()
+                elif instruction_report.status == "TIMEOUT":
+                    # https://docs.developer.betfair.com/display/1smk3cen4v3lu3yomq5qye0ni/Betting+Enums#BettingEnums-ExecutionReportStatus
+                    pass
 
-            # update transaction counts
-            order_package.client.add_transaction(len(order_package))
+        # update transaction counts
+        order_package.client.add_transaction(len(order_package))
 
     def place(self, order_package: OrderPackageType, session: requests.Session):
         return order_package.client.betting_client.betting.place_orders(
@@ -57,40 +59,41 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.cancel, order_package, http_session)
         if response:
-            failed_transaction_count = 0
-            order_lookup = {o.bet_id: o for o in order_package}
-            for instruction_report in response.cancel_instruction_reports:
-                # get order (can't rely on the order they are returned)
-                order = order_lookup.pop(instruction_report.instruction.bet_id)
-                with order.trade:
-                    self._order_logger(
-                        order, instruction_report, OrderPackageType.CANCEL
-                    )
-                    if instruction_report.status == "SUCCESS":
-                        if (
-                            instruction_report.size_cancelled == order.size_remaining
-                            or order.size_remaining
-                            == 0  # handle orders stream update / race condition
-                        ):
-                            order.execution_complete()
-                        else:
-                            order.executable()
-                    elif instruction_report.status == "FAILURE":
-                        order.executable()
-                        failed_transaction_count += 1
-                    elif instruction_report.status == "TIMEOUT":
-                        order.executable()
+            self.process_cancel_response(order_package, response)
 
-            # reset any not returned so that they can be picked back up
-            for order in order_lookup.values():
-                with order.trade:
+    def process_cancel_response(
+        self, order_package: BaseOrderPackage, response
+    ) -> None:
+        failed_transaction_count = 0
+        order_lookup = {o.bet_id: o for o in order_package}
+        for instruction_report in response.cancel_instruction_reports:
+            # get order (can't rely on the order they are returned)
+            order = order_lookup.pop(instruction_report.instruction.bet_id)
+            with order.trade:
+                self._order_logger(order, instruction_report, OrderPackageType.CANCEL)
+                if instruction_report.status == "SUCCESS":
+                    if (
+                        instruction_report.size_cancelled == order.size_remaining
+                        or order.size_remaining
+                        == 0  # handle orders stream update / race condition
+                    ):
+                        order.execution_complete()
+                    else:
+                        order.executable()
+                elif instruction_report.status == "FAILURE":
+                    order.executable()
+                    failed_transaction_count += 1
+                elif instruction_report.status == "TIMEOUT":
                     order.executable()
 
-            # update transaction counts
-            if failed_transaction_count:
-                order_package.client.add_transaction(
-                    failed_transaction_count, failed=True
-                )
+        # reset any not returned so that they can be picked back up
+        for order in order_lookup.values():
+            with order.trade:
+                order.executable()
+
+        # update transaction counts
+        if failed_transaction_count:
+            order_package.client.add_transaction(failed_transaction_count, failed=True)
 
     def cancel(self, order_package: OrderPackageType, session: requests.Session):
         # temp copy to prevent an empty list of instructions sent
@@ -112,27 +115,28 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.update, order_package, http_session)
         if response:
-            failed_transaction_count = 0
-            for (order, instruction_report) in zip(
-                order_package, response.update_instruction_reports
-            ):
-                with order.trade:
-                    self._order_logger(
-                        order, instruction_report, OrderPackageType.UPDATE
-                    )
-                    if instruction_report.status == "SUCCESS":
-                        order.executable()
-                    elif instruction_report.status == "FAILURE":
-                        order.executable()
-                        failed_transaction_count += 1
-                    elif instruction_report.status == "TIMEOUT":
-                        order.executable()
+            self.process_update_response(order_package, response)
 
-            # update transaction counts
-            if failed_transaction_count:
-                order_package.client.add_transaction(
-                    failed_transaction_count, failed=True
-                )
+    def process_update_response(
+        self, order_package: BaseOrderPackage, response
+    ) -> None:
+        failed_transaction_count = 0
+        for (order, instruction_report) in zip(
+            order_package, response.update_instruction_reports
+        ):
+            with order.trade:
+                self._order_logger(order, instruction_report, OrderPackageType.UPDATE)
+                if instruction_report.status == "SUCCESS":
+                    order.executable()
+                elif instruction_report.status == "FAILURE":
+                    order.executable()
+                    failed_transaction_count += 1
+                elif instruction_report.status == "TIMEOUT":
+                    order.executable()
+
+        # update transaction counts
+        if failed_transaction_count:
+            order_package.client.add_transaction(failed_transaction_count, failed=True)
 
     def update(self, order_package: OrderPackageType, session: requests.Session):
         return order_package.client.betting_client.betting.update_orders(
@@ -147,66 +151,56 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.replace, order_package, http_session)
         if response:
-            failed_transaction_count = 0
-            market = self.flumine.markets.markets[order_package.market_id]
-            for (order, instruction_report) in zip(
-                order_package, response.replace_instruction_reports
-            ):
-                with order.trade:
-                    # process cancel response
-                    if (
-                        instruction_report.cancel_instruction_reports.status
-                        == "SUCCESS"
-                    ):
-                        self._order_logger(
-                            order,
-                            instruction_report.cancel_instruction_reports,
-                            OrderPackageType.CANCEL,
-                        )
-                        order.execution_complete()
-                    elif (
-                        instruction_report.cancel_instruction_reports.status
-                        == "FAILURE"
-                    ):
-                        order.executable()
-                        failed_transaction_count += 1
-                    elif (
-                        instruction_report.cancel_instruction_reports.status
-                        == "TIMEOUT"
-                    ):
-                        order.executable()
+            self.process_replace_response(order_package, response)
 
-                    # process place response
-                    if instruction_report.place_instruction_reports.status == "SUCCESS":
-                        # create new order
-                        replacement_order = order.trade.create_order_replacement(
-                            order,
-                            instruction_report.place_instruction_reports.instruction.limit_order.price,
-                            instruction_report.place_instruction_reports.instruction.limit_order.size,
-                        )
-                        self._order_logger(
-                            replacement_order,
-                            instruction_report.place_instruction_reports,
-                            OrderPackageType.REPLACE,
-                        )
-                        # add to blotter
-                        market.place_order(replacement_order, execute=False)
-                        replacement_order.executable()
-                    elif (
-                        instruction_report.place_instruction_reports.status == "FAILURE"
-                    ):
-                        pass  # todo
-                    elif (
-                        instruction_report.place_instruction_reports.status == "TIMEOUT"
-                    ):
-                        pass  # todo
+    def process_replace_response(
+        self, order_package: BaseOrderPackage, response
+    ) -> None:
+        failed_transaction_count = 0
+        market = self.flumine.markets.markets[order_package.market_id]
+        for (order, instruction_report) in zip(
+            order_package, response.replace_instruction_reports
+        ):
+            with order.trade:
+                # process cancel response
+                if instruction_report.cancel_instruction_reports.status == "SUCCESS":
+                    self._order_logger(
+                        order,
+                        instruction_report.cancel_instruction_reports,
+                        OrderPackageType.CANCEL,
+                    )
+                    order.execution_complete()
+                elif instruction_report.cancel_instruction_reports.status == "FAILURE":
+                    order.executable()
+                    failed_transaction_count += 1
+                elif instruction_report.cancel_instruction_reports.status == "TIMEOUT":
+                    order.executable()
 
-            # update transaction counts
-            order_package.client.add_transaction(len(order_package))
-            if failed_transaction_count:
-                order_package.client.add_transaction(
-                    failed_transaction_count, failed=True
-                )
+                # process place response
+                if instruction_report.place_instruction_reports.status == "SUCCESS":
+                    # create new order
+                    replacement_order = order.trade.create_order_replacement(
+                        order,
+                        instruction_report.place_instruction_reports.instruction.limit_order.price,
+                        instruction_report.place_instruction_reports.instruction.limit_order.size,
+                    )
+                    self._order_logger(
+                        replacement_order,
+                        instruction_report.place_instruction_reports,
+                        OrderPackageType.REPLACE,
+                    )
+                    # add to blotter
+                    market.place_order(replacement_order, execute=False)
+                    replacement_order.executable()
+                elif instruction_report.place_instruction_reports.status == "FAILURE":
+                    pass  # todo
+                elif instruction_report.place_instruction_reports.status == "TIMEOUT":
+                    pass  # todo
+
+        # update transaction counts
+        order_package.client.add_transaction(len(order_package))
+        if failed_transaction_count:
+            order_package.client.add_transaction(failed_transaction_count, failed=True)
 
     def replace(self, order_package: OrderPackageType, session: requests.Session):
         return order_package.client.betting_client.betting.replace_orders(
@@ -218,6 +212,21 @@ class BetfairExecution(BaseExecution):
             session=session,
         )
 
+    def _ping_session(self, client, http_session: requests.Session) -> bool:
+        # any response keeps the connection alive
+        betting = client.betting_client.betting
+        try:
+            http_session.head(
+                betting.url, timeout=(betting.connect_timeout, betting.read_timeout)
+            )
+        except requests.RequestException as e:
+            logger.warning(
+                "Execution session ping failed",
+                extra={"session": http_session, "exception": e},
+            )
+            return False
+        return True
+
     def _execution_helper(
         self,
         trading_function: Callable,
@@ -232,10 +241,7 @@ class BetfairExecution(BaseExecution):
                     "session": http_session,
                     "latency": round(order_package.elapsed_seconds, 3),
                     "order_package": order_package.info,
-                    "thread_pool": {
-                        "num_threads": len(self._thread_pool._threads),
-                        "work_queue_size": self._thread_pool._work_queue.qsize(),
-                    },
+                    "in_flight": self.in_flight,
                 },
             )
         if order_package.orders:
@@ -254,6 +260,7 @@ class BetfairExecution(BaseExecution):
                 if order_package.retry():
                     self.handler(order_package)
 
+                self._record_session_request(http_session, err=True)
                 self._return_http_session(http_session, err=True)
                 return
             except Exception as e:
@@ -266,8 +273,13 @@ class BetfairExecution(BaseExecution):
                     },
                     exc_info=True,
                 )
+                self._record_session_request(http_session, err=True)
                 self._return_http_session(http_session, err=True)
                 return
+            self._record_session_request(http_session, response.elapsed_time)
+            self._record_latency(
+                latency.HTTP_ROUND_TRIP, response.elapsed_time, order_package
+            )
             logger.info(
                 "execute_%s" % trading_function.__name__,
                 extra={
@@ -0,0 +1,102 @@
+import logging
+import threading
+
+from ..order.orderpackage import OrderPackageType
+from .transaction import create_order_packages
+
+logger = logging.getLogger(__name__)
+
+"""
+Optional (config.coalesce_order_packages) merging of
+transactions across strategies, pending orders are held
+per market and (package type, async) and flushed into
+shared packages at the end of the market book / event
+processing, one placeOrders request per market rather
+than one per strategy. Instruction reports are matched
+back to each order by the execution response processing.
+"""
+
+PACKAGE_TYPES = (
+    OrderPackageType.PLACE,
+    OrderPackageType.CANCEL,
+    OrderPackageType.UPDATE,
+    OrderPackageType.REPLACE,
+)
+
+
+class OrderCoalescer:
+    def __init__(self, flumine):
+        self.flumine = flumine
+        self._pending = {}  # {market_id: (<Market>, {(package_type, async_): [..]})}
+        self._lock = threading.Lock()
+        self.transactions = 0  # packages requested by transactions
+        self.packages = 0  # packages executed
+        self.orders = 0
+
+    def add(
+        self, market, orders: list, package_type: OrderPackageType, async_: bool
+    ) -> None:
+        """Adds a list of (<Order>, market_version) to
+        be executed on the next flush.
+        """
+        with self._lock:
+            pending = self._pending.get(market.market_id)
+            if pending is None:
+                pending = self._pending[market.market_id] = (market, {})
+            pending[1].setdefault((package_type, async_), []).extend(orders)
+            self.transactions += 1
+            self.orders += len(orders)
+
+    def flush(self, market_id: str = None) -> int:
+        """Executes pending orders for market_id (or all
+        markets), returns number of packages executed.
+        """
+        if not self._pending:
+            return 0
+        with self._lock:
+            if market_id is None:
+                pending = list(self._pending.values())
+                self._pending.clear()
+            elif market_id in self._pending:
+                pending = [self._pending.pop(market_id)]
+            else:
+                return 0
+        count = 0
+        for market, orders in pending:
+            packages = []
+            for package_type in PACKAGE_TYPES:
+                for async_ in (False, True):
+                    package_orders = orders.get((package_type, async_))
+                    if package_orders:
+                        packages += create_order_packages(
+                            market, package_orders, package_type, async_
+                        )
+            for package in packages:
+                self.flumine.process_order_package(package)
+            logger.info(
+                "%s order packages executed from coalescer" % len(packages),
+                extra={
+                    "market_id": market.market_id,
+                    "order_packages": [o.info for o in packages],
+                },
+            )
+            count += len(packages)
+        self.packages += count
+        return count
+
+    @property
+    def pending_count(self) -> int:
+        return sum(
+            len(o)
+            for _, orders in list(self._pending.values())
+            for o in orders.values()
+        )
+
+    @property
+    def info(self) -> dict:
+        return {
+            "pending": self.pending_count,
+            "orders": self.orders,
+            "transactions": self.transactions,
+            "packages": self.packages,
+        }
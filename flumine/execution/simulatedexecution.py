@@ -1,40 +1,95 @@
-import time
+import logging
+import threading
 import requests
 from typing import Optional
 
 from .baseexecution import BaseExecution
-from .. import config
 from ..clients.clients import ExchangeType
 from ..order.orderpackage import BaseOrderPackage, OrderPackageType
+from ..backtest.utils import PendingPackages
+from .. import clock
+
+logger = logging.getLogger(__name__)
 
 
 class SimulatedExecution(BaseExecution):
 
     EXCHANGE = ExchangeType.SIMULATED
 
+    def __init__(self, flumine, max_workers: int = None):
+        super(SimulatedExecution, self).__init__(flumine, max_workers)
+        # paper trading packages waiting on latency/bet delay
+        self._pending_packages = PendingPackages()
+        self._pending_condition = threading.Condition()
+        self._scheduler = None  # started on first paper trade package
+        self._running = True
+
     def handler(self, order_package: BaseOrderPackage) -> None:
-        """Only uses _thread_pool if paper_trade"""
+        """Only uses _thread_pool if paper_trade, packages
+        are held by the scheduler until due (latency + delay)
+        """
+        func = self._get_execution_function(order_package)
+        if order_package.client.paper_trade:
+            with self._pending_condition:
+                self._pending_packages.append(order_package)
+                if self._scheduler is None:
+                    self._scheduler = threading.Thread(
+                        name="SimulatedExecutionScheduler",
+                        target=self._run_scheduler,
+                        daemon=True,
+                    )
+                    self._scheduler.start()
+                self._pending_condition.notify()
+        else:
+            func(order_package, http_session=None)
+
+    def _get_execution_function(self, order_package: BaseOrderPackage):
         if order_package.package_type == OrderPackageType.PLACE:
-            func = self.execute_place
+            return self.execute_place
         elif order_package.package_type == OrderPackageType.CANCEL:
-            func = self.execute_cancel
+            return self.execute_cancel
         elif order_package.package_type == OrderPackageType.UPDATE:
-            func = self.execute_update
+            return self.execute_update
         elif order_package.package_type == OrderPackageType.REPLACE:
-            func = self.execute_replace
+            return self.execute_replace
         else:
             raise NotImplementedError()
 
-        if order_package.client.paper_trade:
-            self._thread_pool.submit(func, order_package, None)
-        else:
-            func(order_package, http_session=None)
+    def _run_scheduler(self) -> None:
+        """Submits paper trade packages to the
+        thread pool once due, waits until the
+        next package is due or a new package
+        is received.
+        """
+        logger.info("Starting SimulatedExecution scheduler")
+        while True:
+            with self._pending_condition:
+                if not self._running:
+                    break
+                order_packages = self._pending_packages.pop_all_due()
+                if not order_packages:
+                    next_due = self._pending_packages.next_due
+                    if next_due:
+                        timeout = (next_due - clock.epoch_ms()) / 1e3
+                        self._pending_condition.wait(max(timeout, 0.001))
+                    else:
+                        self._pending_condition.wait()
+                    continue
+            for order_package in order_packages:
+                self._thread_pool.submit(
+                    self._get_execution_function(order_package), order_package, None
+                )
+        logger.info("Stopped SimulatedExecution scheduler")
+
+    def shutdown(self):
+        with self._pending_condition:
+            self._running = False
+            self._pending_condition.notify()
+        super(SimulatedExecution, self).shutdown()
 
     def execute_place(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(order_package.bet_delay + config.place_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         for order, instruction in zip(order_package, order_package.place_instructions):
             with order.trade:
@@ -56,8 +111,6 @@ class SimulatedExecution(BaseExecution):
     def execute_cancel(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(config.cancel_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order in order_package:
@@ -82,8 +135,6 @@ class SimulatedExecution(BaseExecution):
     def execute_update(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(config.update_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order, instruction in zip(order_package, order_package.update_instructions):
@@ -107,10 +158,6 @@ class SimulatedExecution(BaseExecution):
     def execute_replace(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if (
-            order_package.client.paper_trade
-        ):  # todo should the cancel happen without a delay?
-            time.sleep(order_package.bet_delay + config.replace_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order, instruction in zip(
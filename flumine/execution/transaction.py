@@ -3,8 +3,9 @@ from collections import defaultdict
 
 from ..order.orderpackage import OrderPackageType, BetfairOrderPackage
 from ..events import events
-from ..exceptions import ControlError, OrderError
+from ..exceptions import ControlError, OrderError, OrderUpdateError
 from ..utils import chunks, get_market_notes
+from .. import config
 
 logger = logging.getLogger(__name__)
 
@@ -90,15 +91,23 @@ class Transaction:
     def replace_order(
         self, order, new_price: float, market_version: int = None
     ) -> bool:
+        order.update_data["new_price"] = new_price  # validate at new price
         if self._validate_controls(order, OrderPackageType.REPLACE) is False:
+            order.update_data.pop("new_price", None)
             return False
         # replace
-        order.replace(new_price)
+        try:
+            order.replace(new_price)
+        except OrderUpdateError:
+            order.update_data.pop("new_price", None)
+            raise
         self._pending_replace.append((order, market_version))
         self._pending_orders = True
         return True
 
     def execute(self) -> int:
+        if config.coalesce_order_packages:
+            return self._coalesce()
         packages = []
         if self._pending_place:
             packages += self._create_order_package(
@@ -135,6 +144,22 @@ class Transaction:
             self._pending_orders = False
         return len(packages)
 
+    def _coalesce(self) -> int:
+        # pending orders merged with other transactions (all
+        # strategies) and executed when the coalescer is flushed
+        coalescer = self.market.flumine.order_coalescer
+        for orders, package_type, async_ in (
+            (self._pending_place, OrderPackageType.PLACE, self._async_place_orders),
+            (self._pending_cancel, OrderPackageType.CANCEL, False),
+            (self._pending_update, OrderPackageType.UPDATE, False),
+            (self._pending_replace, OrderPackageType.REPLACE, False),
+        ):
+            if orders:
+                coalescer.add(self.market, orders, package_type, async_)
+                orders.clear()
+        self._pending_orders = False
+        return 0
+
     def _validate_controls(self, order, package_type: OrderPackageType) -> bool:
         # return False on violation
         try:
@@ -150,26 +175,7 @@ class Transaction:
     def _create_order_package(
         self, orders: list, package_type: OrderPackageType, async_: bool = False
     ) -> list:
-        # group orders by marketVersion
-        orders_grouped = defaultdict(list)
-        for o in orders:
-            orders_grouped[o[1]].append(o[0])
-        # create packages (chunked by limit)
-        limit = BetfairOrderPackage.order_limit(package_type)
-        packages = []
-        for market_version, package_orders in orders_grouped.items():
-            for chunked_orders in chunks(package_orders, limit):
-                packages.append(
-                    BetfairOrderPackage(
-                        client=self.market.flumine.client,
-                        market_id=self.market.market_id,
-                        orders=chunked_orders,
-                        package_type=package_type,
-                        bet_delay=self.market.market_book.bet_delay,
-                        market_version=market_version,
-                        async_=async_,
-                    )
-                )
+        packages = create_order_packages(self.market, orders, package_type, async_)
         orders.clear()
         return packages
 
@@ -179,3 +185,32 @@ class Transaction:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._pending_orders:
             self.execute()
+
+
+def create_order_packages(
+    market, orders: list, package_type: OrderPackageType, async_: bool = False
+) -> list:
+    """Creates packages from a list of (<Order>, market_version),
+    grouped by market_version and chunked by the order limit.
+    """
+    # group orders by marketVersion
+    orders_grouped = defaultdict(list)
+    for o in orders:
+        orders_grouped[o[1]].append(o[0])
+    # create packages (chunked by limit)
+    limit = BetfairOrderPackage.order_limit(package_type)
+    packages = []
+    for market_version, package_orders in orders_grouped.items():
+        for chunked_orders in chunks(package_orders, limit):
+            packages.append(
+                BetfairOrderPackage(
+                    client=market.flumine.client,
+                    market_id=market.market_id,
+                    orders=chunked_orders,
+                    package_type=package_type,
+                    bet_delay=market.market_book.bet_delay,
+                    market_version=market_version,
+                    async_=async_,
+                )
+            )
+    return packages
@@ -1,8 +1,10 @@
+import queue
 import logging
 
 from .baseflumine import BaseFlumine
 from .events.events import EventType
-from . import worker
+from .execution.baseexecution import SESSION_KEEP_ALIVE_AGE
+from . import worker, config, clock, latency
 
 logger = logging.getLogger(__name__)
 
@@ -14,39 +16,88 @@ class Flumine(BaseFlumine):
         """
         with self:
             while True:
-                event = self.handler_queue.get()
-                if event.EVENT_TYPE == EventType.TERMINATOR:
-                    self._process_end_flumine()
-                    break
+                for event in self._get_events():
+                    if event.EVENT_TYPE == EventType.TERMINATOR:
+                        self._process_end_flumine()
+                        return
 
-                elif event.EVENT_TYPE == EventType.MARKET_CATALOGUE:
-                    self._process_market_catalogues(event)
+                    elif event.EVENT_TYPE == EventType.MARKET_CATALOGUE:
+                        self._process_market_catalogues(event)
 
-                elif event.EVENT_TYPE == EventType.MARKET_BOOK:
-                    self._process_market_books(event)
+                    elif event.EVENT_TYPE == EventType.MARKET_BOOK:
+                        self._process_market_books(event)
 
-                elif event.EVENT_TYPE == EventType.RAW_DATA:
-                    self._process_raw_data(event)
+                    elif event.EVENT_TYPE == EventType.RAW_DATA:
+                        self._process_raw_data(event)
 
-                elif event.EVENT_TYPE == EventType.CURRENT_ORDERS:
-                    self._process_current_orders(event)
+                    elif event.EVENT_TYPE == EventType.CURRENT_ORDERS:
+                        self._process_current_orders(event)
 
-                elif event.EVENT_TYPE == EventType.CLEARED_MARKETS:
-                    self._process_cleared_markets(event)
+                    elif event.EVENT_TYPE == EventType.CLEARED_MARKETS:
+                        self._process_cleared_markets(event)
 
-                elif event.EVENT_TYPE == EventType.CLEARED_ORDERS:
-                    self._process_cleared_orders(event)
+                    elif event.EVENT_TYPE == EventType.CLEARED_ORDERS:
+                        self._process_cleared_orders(event)
 
-                elif event.EVENT_TYPE == EventType.CLOSE_MARKET:
-                    self._process_close_market(event)
+                    elif event.EVENT_TYPE == EventType.CLOSE_MARKET:
+                        self._process_close_market(event)
 
-                elif event.EVENT_TYPE == EventType.CUSTOM_EVENT:
-                    self._process_custom_event(event)
+                    elif event.EVENT_TYPE == EventType.CUSTOM_EVENT:
+                        self._process_custom_event(event)
 
-                else:
-                    logger.error("Unknown item in handler_queue: %s" % str(event))
+                    else:
+                        logger.error("Unknown item in handler_queue: %s" % str(event))
 
-                del event
+                # execute orders merged across strategies/events
+                self.order_coalescer.flush()
+
+    def _get_events(self) -> list:
+        """Blocks until an event is available and then
+        drains any pending events, superseded MarketBooks
+        are conflated if enabled.
+        """
+        events = [self.handler_queue.get()]
+        for _ in range(self.handler_queue.qsize()):
+            try:
+                events.append(self.handler_queue.get_nowait())
+            except queue.Empty:
+                break
+        self.events_processed += len(events)
+        if self.latency.enabled:
+            for event in events:
+                self.latency.record(
+                    latency.QUEUE_WAIT, clock.elapsed_seconds(event._time_created)
+                )
+        if config.conflate_market_books and len(events) > 1:
+            events = self._conflate_market_books(events)
+        return events
+
+    def _conflate_market_books(self, events: list) -> list:
+        """Only the latest MarketBook per stream/market
+        survives, all other events (and the position of the
+        latest MarketBook) keep their order.
+        """
+        keys, conflated = set(), []
+        for event in reversed(events):
+            if event.EVENT_TYPE == EventType.MARKET_BOOK and event.event:
+                market_books = [
+                    market_book
+                    for market_book in event.event
+                    if (market_book.streaming_unique_id, market_book.market_id)
+                    not in keys
+                ]
+                keys.update(
+                    (market_book.streaming_unique_id, market_book.market_id)
+                    for market_book in event.event
+                )
+                if len(market_books) < len(event.event):
+                    self.market_books_conflated += len(event.event) - len(market_books)
+                    if not market_books:
+                        continue
+                    event.event = market_books
+            conflated.append(event)
+        conflated.reverse()
+        return conflated
 
     def _add_default_workers(self):
         ka_interval = min((self.client.betting_client.session_timeout / 2), 1200)
@@ -81,6 +132,29 @@ class Flumine(BaseFlumine):
                 )
             )
 
+        if (
+            self.client.execution is self.betfair_execution
+            and config.execution_warm_sessions
+        ):
+            self.add_worker(
+                worker.BackgroundWorker(
+                    self,
+                    function=worker.keep_alive_execution,
+                    interval=SESSION_KEEP_ALIVE_AGE / 2,
+                    start_delay=0,  # warm up sessions on start
+                )
+            )
+
+        if self.latency.enabled:
+            self.add_worker(
+                worker.BackgroundWorker(
+                    self,
+                    function=worker.poll_latency,
+                    interval=config.latency_log_interval,
+                    start_delay=config.latency_log_interval,
+                )
+            )
+
     def __repr__(self) -> str:
         return "<Flumine>"
 
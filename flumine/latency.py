@@ -0,0 +1,151 @@
+import threading
+from typing import Optional
+
+"""
+Low overhead latency histograms (HDR style log linear
+buckets, ~6% precision) recorded at various stages of
+the MarketBook/order lifecycle and split by strategy
+and market type.
+"""
+
+# stages
+PUBLISH_TO_EVENT = "publish_to_event"  # exchange publish time to event creation
+QUEUE_WAIT = "queue_wait"  # event creation to handler processing
+STRATEGY_PROCESSING = "strategy_processing"  # check/process_market_book
+EXECUTE_TO_SUBMIT = "execute_to_submit"  # order package creation to thread pool
+HTTP_ROUND_TRIP = "http_round_trip"  # betfair request
+ORDER_STREAM_CONFIRMATION = "order_stream_confirmation"  # placed to order stream
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+BUCKETS = 512  # max ~ 2 ** 31 us (35 minutes)
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def _bucket(value_us: int) -> int:
+    if value_us < 2 * SUB_BUCKETS:
+        return value_us
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return min((shift * SUB_BUCKETS) + (value_us >> shift), BUCKETS - 1)
+
+
+def _bucket_value(bucket: int) -> int:
+    # highest value (us) in bucket
+    if bucket < 2 * SUB_BUCKETS:
+        return bucket
+    shift = bucket // SUB_BUCKETS - 1
+    return ((bucket - shift * SUB_BUCKETS + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Histogram of latencies, recorded in seconds and
+    reported in milliseconds.
+    """
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0  # us
+        self.min = None  # us
+        self.max = None  # us
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        value_us = int(seconds * 1e6) if seconds > 0 else 0
+        with self._lock:
+            self.counts[_bucket(value_us)] += 1
+            self.count += 1
+            self.total += value_us
+            if self.min is None or value_us < self.min:
+                self.min = value_us
+            if self.max is None or value_us > self.max:
+                self.max = value_us
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Returns value (ms) at percentile (0-100)"""
+        if not self.count:
+            return
+        target = max(self.count * percentile / 100, 1)
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(_bucket_value(bucket), self.max) / 1e3
+
+    @property
+    def mean(self) -> Optional[float]:
+        if self.count:
+            return self.total / self.count / 1e3
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * BUCKETS
+            self.count = 0
+            self.total = 0
+            self.min = None
+            self.max = None
+
+    @property
+    def info(self) -> dict:
+        info = {
+            "count": self.count,
+            "min": self.min / 1e3 if self.count else None,
+            "mean": self.mean,
+            "max": self.max / 1e3 if self.count else None,
+        }
+        for percentile in PERCENTILES:
+            info["p%s" % percentile] = self.percentile(percentile)
+        return info
+
+
+class LatencyRecorder:
+    """
+    Holds a LatencyHistogram per (stage, strategy name,
+    market type), strategy/market type are None where
+    not applicable.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        stage: str,
+        seconds: float,
+        strategy: str = None,
+        market_type: str = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (stage, strategy, market_type)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        histogram.record(seconds)
+
+    def get(
+        self, stage: str, strategy: str = None, market_type: str = None
+    ) -> Optional[LatencyHistogram]:
+        return self.histograms.get((stage, strategy, market_type))
+
+    def snapshot(self, reset: bool = False) -> list:
+        """Returns histogram info (ms) per key, optionally
+        resetting the histograms (interval reporting).
+        """
+        snapshot = []
+        for (stage, strategy, market_type), histogram in list(self.histograms.items()):
+            if histogram.count:
+                snapshot.append(
+                    {
+                        "stage": stage,
+                        "strategy": strategy,
+                        "market_type": market_type,
+                        **histogram.info,
+                    }
+                )
+                if reset:
+                    histogram.reset()
+        return snapshot
@@ -1,11 +1,12 @@
 import logging
-from typing import Iterable
+import threading
+from typing import Iterable, Optional
 from collections import defaultdict
 
 from ..order.ordertype import OrderTypes
 from ..utils import (
-    calculate_unmatched_exposure,
-    calculate_matched_exposure,
+    calculate_market_exposure,
+    calculate_hedge,
     STRATEGY_NAME_HASH_LENGTH,
 )
 from ..order.order import BaseOrder, OrderStatus
@@ -36,9 +37,21 @@ class Blotter:
         self._orders = {}  # {Order.id: Order}
         # cached lists/dicts for faster lookup
         self._trades = defaultdict(list)  # {Trade.id: [Order,]}
-        self._live_orders = []
+        self._live_orders = {}  # {Order.id: Order} (insertion ordered)
+        self._live_orders_snapshot = None  # tuple, rebuilt on change
         self._strategy_orders = defaultdict(list)
         self._strategy_selection_orders = defaultdict(list)
+        self._strategy_live_orders = defaultdict(dict)
+        self._strategy_selection_live_orders = defaultdict(dict)
+        self._bet_id_orders = {}  # {Order.bet_id: Order}
+        self._unindexed_orders = {}  # {Order.id: Order} awaiting bet_id
+        # running exposure totals, updated by orders on change
+        self._exposures = {}  # {(strategy, selection_id, handicap): list}
+        self._order_exposures = {}  # {Order.id: (key, tuple)}
+        self._selection_profits = {}  # {(selection_id, handicap): [win, lose]}
+        self._exposure_lock = threading.Lock()  # execution threads update orders
+        # called with (market_id, bool) when live orders become (non) empty
+        self.on_live_orders = None
 
     def strategy_orders(self, strategy) -> list:
         """Returns all orders related to a strategy."""
@@ -50,9 +63,45 @@ class Blotter:
         """Returns all orders related to a strategy selection."""
         return self._strategy_selection_orders[(strategy, selection_id, handicap)]
 
+    def strategy_live_orders(self, strategy) -> list:
+        """Returns live orders related to a strategy."""
+        return list(self._strategy_live_orders[strategy].values())
+
+    def strategy_selection_live_orders(
+        self, strategy, selection_id: int, handicap: float = 0
+    ) -> list:
+        """Returns live orders related to a strategy selection."""
+        return list(
+            self._strategy_selection_live_orders[
+                (strategy, selection_id, handicap)
+            ].values()
+        )
+
+    def get_order_from_bet_id(self, bet_id: str) -> Optional[BaseOrder]:
+        """Returns order from bet_id, bet_ids are set after
+        placement so orders are indexed on lookup miss.
+        """
+        order = self._bet_id_orders.get(bet_id)
+        if order is None and self._unindexed_orders:
+            for order_id, _order in list(self._unindexed_orders.items()):
+                if _order.bet_id:
+                    self._bet_id_orders[_order.bet_id] = _order
+                    del self._unindexed_orders[order_id]
+            order = self._bet_id_orders.get(bet_id)
+        return order
+
     @property
     def live_orders(self) -> Iterable:
-        return iter(list(self._live_orders))
+        # snapshot allows orders to be completed whilst iterating
+        if self._live_orders_snapshot is None:
+            self._live_orders_snapshot = tuple(self._live_orders.values())
+        return iter(self._live_orders_snapshot)
+
+    def live_orders_list(self) -> list:
+        """Returns a copy of live orders, unlike
+        `live_orders` safe to call from other threads.
+        """
+        return list(self._live_orders.values())
 
     @property
     def has_live_orders(self) -> bool:
@@ -96,43 +145,27 @@ class Blotter:
         return max(exposure, 0.0)
 
     def get_exposures(self, strategy, lookup: tuple, exclusion=None) -> dict:
-        """Returns strategy/selection exposures as a dict."""
-        mb, ml = [], []  # matched bets, (price, size)
-        ub, ul = [], []  # unmatched bets, (price, size)
-        moc_win_liability = 0.0
-        moc_lose_liability = 0.0
-        for order in self.strategy_selection_orders(strategy, *lookup[1:]):
-            if order == exclusion:
-                continue
-            if order.status == OrderStatus.VIOLATION:
-                continue
-            if order.order_type.ORDER_TYPE == OrderTypes.LIMIT:
-                _size_matched = order.size_matched  # cache
-                if _size_matched:
-                    if order.side == "BACK":
-                        mb.append((order.average_price_matched, _size_matched))
-                    else:
-                        ml.append((order.average_price_matched, _size_matched))
-                _size_remaining = order.size_remaining  # cache
-                if order.order_type.price and _size_remaining:
-                    if order.side == "BACK":
-                        ub.append((order.order_type.price, _size_remaining))
-                    else:
-                        ul.append((order.order_type.price, _size_remaining))
-            elif order.order_type.ORDER_TYPE in (
-                OrderTypes.LIMIT_ON_CLOSE,
-                OrderTypes.MARKET_ON_CLOSE,
-            ):
-                if order.side == "BACK":
-                    moc_lose_liability -= order.order_type.liability
-                else:
-                    moc_win_liability -= order.order_type.liability
-            else:
-                raise ValueError(
-                    "Unexpected order type: %s" % order.order_type.ORDER_TYPE
-                )
-        matched_exposure = calculate_matched_exposure(mb, ml)
-        unmatched_exposure = calculate_unmatched_exposure(ub, ul)
+        """Returns strategy/selection exposures as a dict, read
+        from the running totals so no orders are processed.
+        """
+        key = (strategy, *lookup[1:])
+        exposure = list(self._exposures.get(key, EMPTY_EXPOSURE))
+        if exclusion is not None:
+            excluded_key, excluded = self._order_exposures.get(
+                exclusion.id, (None, None)
+            )
+            if excluded_key == key:
+                exposure = [a - b for a, b in zip(exposure, excluded)]
+        (
+            matched_win,
+            matched_lose,
+            unmatched_win,
+            unmatched_lose,
+            moc_win_liability,
+            moc_lose_liability,
+        ) = exposure
+        matched_exposure = round(matched_win, 2), round(matched_lose, 2)
+        unmatched_exposure = round(unmatched_win, 2), round(unmatched_lose, 2)
 
         worst_possible_profit_on_win = (
             matched_exposure[0] + unmatched_exposure[0] + moc_win_liability
@@ -150,10 +183,97 @@ class Blotter:
             "worst_possible_profit_on_lose": worst_possible_profit_on_lose,
         }
 
+    def selection_profits(self, exclusion=None) -> dict:
+        """Returns worst possible profit on win/lose per
+        selection across all strategies as a dict of
+        {(selection_id, handicap): (profit_if_win, profit_if_lose)}
+        """
+        profits = {
+            selection: (round(win, 2), round(lose, 2))
+            for selection, (win, lose) in list(self._selection_profits.items())
+        }
+        if exclusion is not None:
+            key, excluded = self._order_exposures.get(exclusion.id, (None, None))
+            if key is not None:
+                win, lose = profits[key[1:]]
+                profits[key[1:]] = (
+                    round(win - excluded[0] - excluded[2] - excluded[4], 2),
+                    round(lose - excluded[1] - excluded[3] - excluded[5], 2),
+                )
+        return profits
+
+    def market_exposure(
+        self,
+        number_of_winners: int = 1,
+        runner_count: int = None,
+        order=None,
+        exclusion=None,
+        price: float = None,
+    ) -> float:
+        """Returns worst-case loss across all outcomes of the
+        market (all strategies), if provided the potential
+        exposure of order is included (unmatched at price
+        if provided, e.g. the new price of a replace).
+        """
+        profits = self.selection_profits(exclusion=exclusion)
+        if order is not None:
+            exposure = order_exposure(order, price)
+            win, lose = profits.get(order.lookup[1:], (0.0, 0.0))
+            profits[order.lookup[1:]] = (
+                win + exposure[0] + exposure[2] + exposure[4],
+                lose + exposure[1] + exposure[3] + exposure[5],
+            )
+        return calculate_market_exposure(profits, number_of_winners, runner_count)
+
+    def hedge(self, strategy, lookup: tuple, price: float) -> tuple:
+        """Returns (side, size) at price to equalise the
+        matched strategy/selection profit on win/lose.
+        """
+        exposures = self.get_exposures(strategy, lookup)
+        return calculate_hedge(
+            exposures["matched_profit_if_win"],
+            exposures["matched_profit_if_lose"],
+            price,
+        )
+
     """ getters / setters """
 
     def complete_order(self, order) -> None:
-        self._live_orders.remove(order)
+        if self._live_orders.pop(order.id, None) is None:
+            return  # already complete
+        self._live_orders_snapshot = None
+        if not self._live_orders and self.on_live_orders:
+            self.on_live_orders(self.market_id, False)
+        key = (order.trade.strategy, *order.lookup[1:])
+        self._strategy_live_orders[order.trade.strategy].pop(order.id, None)
+        self._strategy_selection_live_orders[key].pop(order.id, None)
+        if self._unindexed_orders.pop(order.id, None) and order.bet_id:
+            self._bet_id_orders[order.bet_id] = order
+        self.update_order_exposure(order)
+
+    def update_order_exposure(self, order) -> None:
+        """Applies the change in an orders exposure to the
+        running totals, called by the order on status/size
+        updates (`order.on_exposure_change`).
+        """
+        exposure = order_exposure(order)
+        with self._exposure_lock:
+            key, previous = self._order_exposures.get(order.id, (None, EMPTY_EXPOSURE))
+            if exposure == previous:
+                return
+            if key is None:
+                key = (order.trade.strategy, *order.lookup[1:])
+            self._order_exposures[order.id] = key, exposure
+            totals = self._exposures.get(key)
+            if totals is None:
+                totals = self._exposures[key] = [0.0] * len(EMPTY_EXPOSURE)
+            for i, (value, previous_value) in enumerate(zip(exposure, previous)):
+                totals[i] += value - previous_value
+            profits = self._selection_profits.get(key[1:])
+            if profits is None:
+                profits = self._selection_profits[key[1:]] = [0.0, 0.0]
+            profits[0] += sum(exposure[0::2]) - sum(previous[0::2])
+            profits[1] += sum(exposure[1::2]) - sum(previous[1::2])
 
     def has_order(self, customer_order_ref: str) -> bool:
         return customer_order_ref in self._orders
@@ -165,12 +285,25 @@ class Blotter:
 
     def __setitem__(self, customer_order_ref: str, order) -> None:
         self._orders[customer_order_ref] = order
-        self._live_orders.append(order)
+        if not self._live_orders and self.on_live_orders:
+            self.on_live_orders(self.market_id, True)
+        self._live_orders[order.id] = order
+        self._live_orders_snapshot = None
         self._trades[order.trade.id].append(order)
         self._strategy_orders[order.trade.strategy].append(order)
         self._strategy_selection_orders[
             (order.trade.strategy, *order.lookup[1:])
         ].append(order)
+        self._strategy_live_orders[order.trade.strategy][order.id] = order
+        self._strategy_selection_live_orders[(order.trade.strategy, *order.lookup[1:])][
+            order.id
+        ] = order
+        if order.bet_id:
+            self._bet_id_orders[order.bet_id] = order
+        else:
+            self._unindexed_orders[order.id] = order
+        order.on_exposure_change = self.update_order_exposure
+        self.update_order_exposure(order)
 
     def __getitem__(self, customer_order_ref: str):
         return self._orders[customer_order_ref]
@@ -180,3 +313,47 @@ class Blotter:
 
     def __len__(self) -> int:
         return len(self._orders)
+
+
+# (matched_win, matched_lose, unmatched_win, unmatched_lose, moc_win, moc_lose)
+EMPTY_EXPOSURE = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def order_exposure(order, price: float = None) -> tuple:
+    """Returns an orders contribution to the strategy/selection
+    exposures, see calculate_matched_exposure and
+    calculate_unmatched_exposure. Unmatched exposure is
+    calculated at price if provided (default order price).
+    """
+    if order.status == OrderStatus.VIOLATION:
+        return EMPTY_EXPOSURE
+    order_type = order.order_type
+    if order_type.ORDER_TYPE == OrderTypes.LIMIT:
+        matched_win = matched_lose = unmatched_win = unmatched_lose = 0.0
+        _size_matched = order.size_matched  # cache
+        if _size_matched:
+            if order.side == "BACK":
+                matched_win = (order.average_price_matched - 1) * _size_matched
+                matched_lose = -_size_matched
+            else:
+                matched_win = (order.average_price_matched - 1) * -_size_matched
+                matched_lose = _size_matched
+        _size_remaining = order.size_remaining  # cache
+        if price is None:
+            price = order_type.price
+        if price and _size_remaining:
+            if order.side == "BACK":
+                unmatched_lose = -_size_remaining
+            else:
+                unmatched_win = (price - 1) * -_size_remaining
+        return matched_win, matched_lose, unmatched_win, unmatched_lose, 0.0, 0.0
+    elif order_type.ORDER_TYPE in (
+        OrderTypes.LIMIT_ON_CLOSE,
+        OrderTypes.MARKET_ON_CLOSE,
+    ):
+        if order.side == "BACK":
+            return 0.0, 0.0, 0.0, 0.0, 0.0, -order_type.liability
+        else:
+            return 0.0, 0.0, 0.0, 0.0, -order_type.liability, 0.0
+    else:
+        raise ValueError("Unexpected order type: %s" % order_type.ORDER_TYPE)
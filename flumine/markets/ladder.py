@@ -0,0 +1,123 @@
+from typing import Optional
+from betfairlightweight.resources.bettingresources import MarketBook
+
+from .. import ticks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NAN = float("nan")
+
+
+class LadderView:
+    """
+    Vectorised view of a MarketBook, (runners x levels)
+    arrays of back/lay prices and sizes plus per runner
+    LTP, total matched and SP projections. Missing
+    values (empty levels, no LTP etc.) are NaN.
+
+    Rows are in MarketBook runner order, use index()
+    to get the row for a selection.
+    """
+
+    def __init__(self, market_book: MarketBook):
+        if np is None:
+            raise ImportError("numpy is required for LadderView")
+        self.market_book = market_book
+        runners = market_book.runners
+        self.selection_ids = np.array([r.selection_id for r in runners], dtype=np.int64)
+        self.handicaps = np.array([r.handicap or 0 for r in runners], dtype=np.float64)
+        self.active = np.array([r.status == "ACTIVE" for r in runners], dtype=bool)
+        self.last_price_traded = _array([r.last_price_traded for r in runners])
+        self.total_matched = _array([r.total_matched for r in runners])
+        sps = [r.sp for r in runners]
+        self.sp_near = _array([sp.near_price if sp else None for sp in sps])
+        self.sp_far = _array([sp.far_price if sp else None for sp in sps])
+        self.sp_actual = _array([sp.actual_sp if sp else None for sp in sps])
+        backs = [r.ex.available_to_back if r.ex else [] for r in runners]
+        lays = [r.ex.available_to_lay if r.ex else [] for r in runners]
+        self.depth = max([len(ladder) for ladder in backs + lays] + [1])
+        self.back_prices, self.back_sizes = _ladder(backs, self.depth)
+        self.lay_prices, self.lay_sizes = _ladder(lays, self.depth)
+        self._index = None
+
+    def index(self, selection_id: int, handicap: float = 0) -> Optional[int]:
+        """Returns row for selection or None"""
+        if self._index is None:
+            self._index = {
+                key: i
+                for i, key in enumerate(
+                    zip(self.selection_ids.tolist(), self.handicaps.tolist())
+                )
+            }
+        return self._index.get((selection_id, handicap or 0))
+
+    @property
+    def best_back(self) -> "np.ndarray":
+        return self.back_prices[:, 0]
+
+    @property
+    def best_lay(self) -> "np.ndarray":
+        return self.lay_prices[:, 0]
+
+    @property
+    def best_back_size(self) -> "np.ndarray":
+        return self.back_sizes[:, 0]
+
+    @property
+    def best_lay_size(self) -> "np.ndarray":
+        return self.lay_sizes[:, 0]
+
+    @property
+    def spread(self) -> "np.ndarray":
+        return self.best_lay - self.best_back
+
+    @property
+    def spread_ticks(self) -> "np.ndarray":
+        back = ticks.prices_to_ticks(self.best_back)
+        lay = ticks.prices_to_ticks(self.best_lay)
+        return np.where((back >= 0) & (lay >= 0), lay - back, NAN)
+
+    @property
+    def back_overround(self) -> float:
+        """Sum of implied probabilities of active runners best back"""
+        return float(np.nansum(1 / self.best_back[self.active]))
+
+    @property
+    def lay_overround(self) -> float:
+        """Sum of implied probabilities of active runners best lay"""
+        return float(np.nansum(1 / self.best_lay[self.active]))
+
+    def weight_of_money(self, levels: int = None) -> "np.ndarray":
+        """Back size / (back + lay size) per runner over
+        the first n levels (default all).
+        """
+        back = np.nansum(self.back_sizes[:, :levels], axis=1)
+        lay = np.nansum(self.lay_sizes[:, :levels], axis=1)
+        total = back + lay
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, back / total, NAN)
+
+
+def _array(values: list) -> "np.ndarray":
+    return np.array(
+        [NAN if v is None else v for v in values], dtype=np.float64
+    )  # actual_sp may be 'NaN'/'Infinity'
+
+
+def _ladder(ladders: list, depth: int) -> tuple:
+    prices, sizes = [], []
+    for ladder in ladders:
+        for price_size in ladder:
+            prices.append(price_size["price"])
+            sizes.append(price_size["size"])
+        padding = [NAN] * (depth - len(ladder))
+        prices.extend(padding)
+        sizes.extend(padding)
+    shape = (len(ladders), depth)
+    return (
+        np.array(prices, dtype=np.float64).reshape(shape),
+        np.array(sizes, dtype=np.float64).reshape(shape),
+    )
@@ -4,8 +4,9 @@ from typing import Optional
 from collections import defaultdict
 from betfairlightweight.resources.bettingresources import MarketBook, MarketCatalogue
 
-from .. import config
+from .. import config, clock
 from .blotter import Blotter
+from .ladder import LadderView
 from ..execution.transaction import Transaction
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,7 @@ class Market:
         self.market_id = market_id
         self.closed = False
         self.date_time_closed = None
+        self._time_closed = None  # epoch ms
         self.market_book = market_book
         self.market_catalogue = market_catalogue
         self.update_market_catalogue = True
@@ -38,6 +40,7 @@ class Market:
         self.context = {"simulated": {}}  # data store (raceCard / scores etc)
         self.blotter = Blotter(market_id)
         self._transaction_id = 0
+        self._ladder = None
 
     def __call__(self, market_book: MarketBook):
         if self.market_book and market_book.version != self.market_book.version:
@@ -55,7 +58,8 @@ class Market:
 
     def close_market(self) -> None:
         self.closed = True
-        self.date_time_closed = datetime.datetime.utcnow()
+        self.date_time_closed = clock.utcnow()
+        self._time_closed = clock.epoch_ms()
         logger.info(
             "Market {0} closed".format(self.market_id),
             extra=self.info,
@@ -93,12 +97,21 @@ class Market:
         with self.transaction() as t:
             return t.replace_order(order, new_price, market_version)
 
+    @property
+    def ladder(self) -> LadderView:
+        """Vectorised view of the latest MarketBook,
+        built on first access and shared until the
+        next update (requires numpy).
+        """
+        if self._ladder is None or self._ladder.market_book is not self.market_book:
+            self._ladder = LadderView(self.market_book)
+        return self._ladder
+
     @property
     def event(self) -> dict:
         event = defaultdict(list)
-        for market in self.flumine.markets:
-            if market.event_id == self.event_id:
-                event[market.market_type].append(market)
+        for market in self.flumine.markets.event_markets(self.event_id):
+            event[market.market_type].append(market)
         return event
 
     @property
@@ -124,12 +137,12 @@ class Market:
 
     @property
     def seconds_to_start(self) -> float:
-        return (self.market_start_datetime - datetime.datetime.utcnow()).total_seconds()
+        return (self.market_start_datetime - clock.utcnow()).total_seconds()
 
     @property
     def elapsed_seconds_closed(self) -> Optional[float]:
-        if self.closed and self.date_time_closed:
-            return (datetime.datetime.utcnow() - self.date_time_closed).total_seconds()
+        if self.closed and self._time_closed:
+            return clock.elapsed_seconds(self._time_closed)
 
     @property
     def market_start_datetime(self):
@@ -1,32 +1,129 @@
 import logging
+from collections import deque
 from typing import Iterator, Optional
 
 from .market import Market
+from .. import clock
 from ..order.order import BetfairOrder
 
 logger = logging.getLogger(__name__)
 
 
 class Markets:
+    """
+    Holds all markets seen, open/live order state
+    is kept incrementally so that lookups do not
+    grow with the number of markets in a long
+    running process.
+    """
+
     def __init__(self):
         self._markets = {}  # marketId: <Market>
+        self._open_market_ids = {}  # marketId: None (insertion ordered set)
+        self._open_market_ids_list = None  # list, rebuilt on change
+        self._live_order_market_ids = set()  # marketIds with live orders
+        self._open_live_order_count = 0  # open markets with live orders
+        self._closed_markets = deque()  # (epoch ms, marketId) in time closed order
+        # secondary indexes {key: {marketId: <Market>}}
+        self._events = {}
+        self._event_types = {}
+        self._market_types = {}
+        self._market_index_keys = {}  # marketId: (eventTypeId, eventId, marketType)
+        self._unindexed_market_ids = set()  # awaiting catalogue/definition
 
     def add_market(self, market_id: str, market: Market) -> None:
         if market_id in self._markets:
             self._markets[market_id].open_market()
         else:
             self._markets[market_id] = market
+            market.blotter.on_live_orders = self._update_live_orders
+            if market.blotter.has_live_orders:
+                self._update_live_orders(market_id, True)
+            self._unindexed_market_ids.add(market_id)
+            self.index_market(market)
+        self._set_open(market_id)
 
     def close_market(self, market_id: str) -> Market:
         market = self._markets[market_id]
         market.close_market()
+        self._set_closed(market_id)
+        self._closed_markets.append((clock.epoch_ms(), market_id))
         return market
 
     def remove_market(self, market_id: str) -> None:
+        self._set_closed(market_id)
+        self._update_live_orders(market_id, False)
+        self._remove_from_indexes(market_id)
+        self._unindexed_market_ids.discard(market_id)
         del self._markets[market_id].blotter
         del self._markets[market_id]
         logger.info("Market removed", extra={"market_id": market_id})
 
+    def index_market(self, market: Market) -> None:
+        """Adds market to the event, event type and
+        market type indexes, called when a market gains
+        its catalogue or definition (no-op once indexed).
+        """
+        if market.market_id not in self._unindexed_market_ids:
+            return
+        keys = (market.event_type_id, market.event_id, market.market_type)
+        if keys == self._market_index_keys.get(market.market_id):
+            return
+        self._remove_from_indexes(market.market_id)
+        for index, key in zip(
+            (self._event_types, self._events, self._market_types), keys
+        ):
+            if key is not None:
+                index.setdefault(key, {})[market.market_id] = market
+        self._market_index_keys[market.market_id] = keys
+        if None not in keys:
+            self._unindexed_market_ids.discard(market.market_id)
+
+    def _remove_from_indexes(self, market_id: str) -> None:
+        keys = self._market_index_keys.pop(market_id, None)
+        if keys:
+            for index, key in zip(
+                (self._event_types, self._events, self._market_types), keys
+            ):
+                markets = index.get(key)
+                if markets and markets.pop(market_id, None) and not markets:
+                    del index[key]  # prevent growth in long running processes
+
+    def event_markets(self, event_id: str) -> list:
+        """Returns all markets related to an event."""
+        return list(self._events.get(event_id, {}).values())
+
+    def event_type_markets(self, event_type_id: str) -> list:
+        """Returns all markets related to an event type."""
+        return list(self._event_types.get(event_type_id, {}).values())
+
+    def market_type_markets(self, market_type: str) -> list:
+        """Returns all markets of a market type."""
+        return list(self._market_types.get(market_type, {}).values())
+
+    def expired_markets(self, seconds: float) -> list:
+        """Returns markets that have been closed for
+        more than x seconds, expired entries are
+        removed from the closed queue.
+        """
+        markets = []
+        while (
+            self._closed_markets
+            and clock.elapsed_seconds(self._closed_markets[0][0]) > seconds
+        ):
+            _, market_id = self._closed_markets.popleft()
+            market = self._markets.get(market_id)
+            # ignore removed or reopened (and closed again) markets
+            if (
+                market
+                and market.closed
+                and market.elapsed_seconds_closed
+                and market.elapsed_seconds_closed > seconds
+                and market not in markets
+            ):
+                markets.append(market)
+        return markets
+
     def get_order(self, market_id: str, order_id: str) -> Optional[BetfairOrder]:
         try:
             return self.markets[market_id].blotter[order_id]
@@ -36,12 +133,33 @@ class Markets:
     def get_order_from_bet_id(
         self, market_id: str, bet_id: str
     ) -> Optional[BetfairOrder]:
-        blotter = self.markets[market_id].blotter
-        lookup = {order.bet_id: order for order in blotter}
-        try:
-            return lookup[bet_id]
-        except KeyError:
-            return
+        return self.markets[market_id].blotter.get_order_from_bet_id(bet_id)
+
+    def _set_open(self, market_id: str) -> None:
+        if market_id not in self._open_market_ids:
+            self._open_market_ids[market_id] = None
+            self._open_market_ids_list = None
+            if market_id in self._live_order_market_ids:
+                self._open_live_order_count += 1
+
+    def _set_closed(self, market_id: str) -> None:
+        if market_id in self._open_market_ids:
+            del self._open_market_ids[market_id]
+            self._open_market_ids_list = None
+            if market_id in self._live_order_market_ids:
+                self._open_live_order_count -= 1
+
+    def _update_live_orders(self, market_id: str, live_orders: bool) -> None:
+        # called by the blotter when it gains its first / loses its last live order
+        if live_orders:
+            if market_id not in self._live_order_market_ids:
+                self._live_order_market_ids.add(market_id)
+                if market_id in self._open_market_ids:
+                    self._open_live_order_count += 1
+        elif market_id in self._live_order_market_ids:
+            self._live_order_market_ids.remove(market_id)
+            if market_id in self._open_market_ids:
+                self._open_live_order_count -= 1
 
     @property
     def markets(self) -> dict:
@@ -49,14 +167,23 @@ class Markets:
 
     @property
     def open_market_ids(self) -> list:
-        return [m.market_id for m in self if not m.closed]
+        # shared list, do not modify
+        if self._open_market_ids_list is None:
+            self._open_market_ids_list = list(self._open_market_ids)
+        return self._open_market_ids_list
+
+    @property
+    def live_order_markets(self) -> list:
+        """Returns open markets with live orders."""
+        return [
+            self._markets[market_id]
+            for market_id in list(self._live_order_market_ids)
+            if market_id in self._open_market_ids
+        ]
 
     @property
     def live_orders(self) -> bool:
-        for market in self:
-            if market.closed is False and market.blotter.has_live_orders:
-                return True
-        return False
+        return self._open_live_order_count > 0
 
     def __iter__(self) -> Iterator[Market]:
         return iter(list(self.markets.values()))
@@ -94,6 +94,7 @@ class SimulatedMiddleware(Middleware):
                         order.simulated.size_voided = order.order_type.size
                     else:
                         order.simulated.size_voided = order.order_type.liability
+                    order.exposure_changed()
                     logger.warning(
                         "Order voided on non runner {0}".format(order.selection_id),
                         extra=order.info,
@@ -111,6 +112,7 @@ class SimulatedMiddleware(Middleware):
                         _, order.simulated.average_price_matched = wap(
                             order.simulated.matched
                         )
+                        order.exposure_changed()
                         logger.warning(
                             "Order adjusted due to non runner {0}".format(
                                 order.selection_id
@@ -134,7 +136,7 @@ class SimulatedMiddleware(Middleware):
 
     @staticmethod
     def _process_simulated_orders(market, market_analytics: dict) -> None:
-        for order in market.blotter._live_orders:
+        for order in market.blotter.live_orders:
             if order.simulated and order.status == OrderStatus.EXECUTABLE:
                 runner_analytics = market_analytics[
                     (order.selection_id, order.handicap)
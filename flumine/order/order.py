@@ -1,7 +1,6 @@
 import json
 import uuid
 import logging
-import datetime
 import string
 import collections
 from enum import Enum
@@ -14,6 +13,7 @@ from .ordertype import LimitOrder, LimitOnCloseOrder, MarketOnCloseOrder, OrderT
 from .responses import Responses
 from ..exceptions import OrderUpdateError
 from ..backtest.simulated import Simulated
+from .. import clock
 
 logger = logging.getLogger(__name__)
 
@@ -75,10 +75,12 @@ class BaseOrder:
         self._simulated = bool(self.simulated)  # cache in current class (2x quicker)
         self.publish_time = None  # marketBook.publish_time
 
-        self.date_time_created = datetime.datetime.utcnow()
+        self.date_time_created = clock.utcnow()
         self.date_time_execution_complete = None
+        self._time_execution_complete = None  # epoch ms
 
         self.cleared_order = None
+        self.on_exposure_change = None  # set by Blotter, called on status/size update
 
         self._sep = "-"  # DEFAULT VALUE
         self.sep = sep
@@ -87,6 +89,7 @@ class BaseOrder:
     def _update_status(self, status: OrderStatus) -> None:
         self.status_log.append(status)
         self.status = status
+        self.exposure_changed()
         logger.info("Order status update: %s" % self.status.value, extra=self.info)
         if self.trade.complete and status != OrderStatus.VIOLATION:
             self.trade.complete_trade()
@@ -100,7 +103,8 @@ class BaseOrder:
 
     def execution_complete(self) -> None:
         self._update_status(OrderStatus.EXECUTION_COMPLETE)
-        self.date_time_execution_complete = datetime.datetime.utcnow()
+        self.date_time_execution_complete = clock.utcnow()
+        self._time_execution_complete = clock.epoch_ms()
         self.update_data.clear()
 
     def cancelling(self) -> None:
@@ -146,6 +150,11 @@ class BaseOrder:
     # currentOrder
     def update_current_order(self, current_order: CurrentOrder) -> None:
         self.responses.current_order = current_order
+        self.exposure_changed()
+
+    def exposure_changed(self) -> None:
+        if self.on_exposure_change:
+            self.on_exposure_change(self)
 
     @property
     def current_order(self) -> Union[CurrentOrder, Simulated]:
@@ -218,19 +227,15 @@ class BaseOrder:
 
     @property
     def elapsed_seconds(self) -> Optional[float]:
-        if self.responses.date_time_placed:
-            return (
-                datetime.datetime.utcnow() - self.responses.date_time_placed
-            ).total_seconds()
+        if self.responses.time_placed:
+            return clock.elapsed_seconds(self.responses.time_placed)
         else:
             return
 
     @property
     def elapsed_seconds_executable(self) -> Optional[float]:
-        if self.date_time_execution_complete and self.responses.date_time_placed:
-            return (
-                self.date_time_execution_complete - self.responses.date_time_placed
-            ).total_seconds()
+        if self._time_execution_complete and self.responses.time_placed:
+            return (self._time_execution_complete - self.responses.time_placed) / 1e3
 
     @property
     def market_id(self) -> str:
@@ -54,9 +54,11 @@ class BaseOrderPackage(BaseEvent):
         self.bet_delay = bet_delay
         self.simulated_delay = self.calc_simulated_delay()
 
-    def retry(self):
+    def retry(self, backoff: bool = True):
+        # backoff False if the caller handles the wait (asyncio)
         if self._retry and self._retry_count < self._max_retries:
-            time.sleep(self._retry_count)  # back-off
+            if backoff:
+                time.sleep(self._retry_count)  # back-off
             self._retry_count += 1
             return True
         return False
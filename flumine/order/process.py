@@ -1,7 +1,7 @@
 import logging
 from typing import Optional
 
-from .. import config
+from .. import config, clock, latency
 from ..markets.markets import Markets
 from ..order.order import BaseOrder, OrderStatus
 from ..order.trade import Trade
@@ -32,7 +32,12 @@ orderStatus: PENDING, EXECUTION_COMPLETE, EXECUTABLE, EXPIRED
 
 
 def process_current_orders(
-    markets: Markets, strategies: Strategies, event, log_control, add_market
+    markets: Markets,
+    strategies: Strategies,
+    event,
+    log_control,
+    add_market,
+    latency_recorder=None,
 ) -> None:
     for current_orders in event.event:
         for current_order in current_orders.orders:
@@ -67,7 +72,32 @@ def process_current_orders(
                 if order is None:
                     continue
 
+            if (
+                latency_recorder is not None
+                and latency_recorder.enabled
+                and order.responses.current_order is None
+            ):
+                record_order_confirmation(markets, order, latency_recorder)
+
             process_current_order(order, current_order, log_control)
+            if order.complete:
+                # remove from live orders/lookups and apply final exposure
+                market = markets.markets.get(current_order.market_id)
+                if market:
+                    market.blotter.complete_order(order)
+
+
+def record_order_confirmation(markets: Markets, order: BaseOrder, latency_recorder):
+    # placement response to first order stream update
+    if order.responses.time_placed is None:
+        return
+    market = markets.markets.get(order.market_id)
+    latency_recorder.record(
+        latency.ORDER_STREAM_CONFIRMATION,
+        clock.elapsed_seconds(order.responses.time_placed),
+        strategy=order.trade.strategy.name,
+        market_type=market.market_type if market else None,
+    )
 
 
 def process_current_order(order: BaseOrder, current_order, log_control) -> None:
@@ -1,21 +1,23 @@
-import datetime
+from .. import clock
 
 
 class Responses:
     """Order responses"""
 
     def __init__(self):
-        self.date_time_created = datetime.datetime.utcnow()
+        self.date_time_created = clock.utcnow()
         self.current_order = None  # resources.CurrentOrder
         self.place_response = None  # resources.PlaceOrderInstructionReports
         self.cancel_responses = []
         self.replace_responses = []
         self.update_responses = []
         self.date_time_placed = None
+        self.time_placed = None  # epoch ms
 
     def placed(self, response):
         self.place_response = response
-        self.date_time_placed = datetime.datetime.utcnow()
+        self.date_time_placed = clock.utcnow()
+        self.time_placed = clock.epoch_ms()
 
     def cancelled(self, response):
         self.cancel_responses.append(response)
@@ -1,6 +1,5 @@
 import uuid
 import logging
-import datetime
 import collections
 from enum import Enum
 from typing import Union, Type
@@ -10,6 +9,7 @@ from ..strategy.strategy import BaseStrategy
 from .order import BetfairOrder
 from .ordertype import LimitOrder, LimitOnCloseOrder, MarketOnCloseOrder
 from ..exceptions import OrderError
+from .. import clock
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +44,7 @@ class Trade:
         self.offset_orders = []  # pending offset orders once initial order has matched
         self.status_log = []
         self.status = TradeStatus.LIVE
-        self.date_time_created = datetime.datetime.utcnow()
+        self.date_time_created = clock.utcnow()
         self.date_time_complete = None
 
     # status
@@ -57,7 +57,7 @@ class Trade:
 
     def complete_trade(self) -> None:
         self._update_status(TradeStatus.COMPLETE)
-        self.date_time_complete = datetime.datetime.utcnow()
+        self.date_time_complete = clock.utcnow()
         # reset strategy context
         runner_context = self.strategy.get_runner_context(
             self.market_id, self.selection_id, self.handicap
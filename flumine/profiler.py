@@ -0,0 +1,53 @@
+import time
+import itertools
+import threading
+from typing import Callable
+
+from .latency import LatencyHistogram
+
+"""
+Optional (config.profiling) sampled CPU profiling of
+strategy hooks, middleware and logging controls, one
+in `sample_rate` calls is timed with perf_counter (us)
+and recorded in a histogram per (name, hook).
+"""
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False, sample_rate: int = 1):
+        self.enabled = enabled
+        self.sample_rate = max(int(sample_rate), 1)
+        self.histograms = {}
+        self._calls = itertools.count()
+        self._lock = threading.Lock()
+
+    def call(self, name: str, hook: str, function: Callable, *args):
+        """Calls function(*args) timing sampled calls"""
+        if not self.enabled or next(self._calls) % self.sample_rate:
+            return function(*args)
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.record(name, hook, int((time.perf_counter() - start) * 1e6))
+
+    def record(self, name: str, hook: str, elapsed_us: int) -> None:
+        key = (name, hook)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        histogram.record(elapsed_us / 1e6)
+
+    @property
+    def info(self) -> dict:
+        # ms
+        return {
+            "{0}.{1}".format(name, hook): {
+                "count": histogram.count,
+                "p50": histogram.percentile(50),
+                "p99": histogram.percentile(99),
+                "max": histogram.max / 1e3 if histogram.count else None,
+            }
+            for (name, hook), histogram in list(self.histograms.items())
+        }
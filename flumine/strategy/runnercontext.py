@@ -1,7 +1,8 @@
 import logging
-import datetime
 from typing import Optional
 
+from .. import clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,19 +14,23 @@ class RunnerContext:
         self.invested = False
         self.datetime_last_placed = None
         self.datetime_last_reset = None
+        self._time_last_placed = None  # epoch ms
+        self._time_last_reset = None
         self.trades = []
         self.live_trades = []
 
     def place(self, trade_id) -> None:
         self.invested = True
-        self.datetime_last_placed = datetime.datetime.utcnow()
+        self.datetime_last_placed = clock.utcnow()
+        self._time_last_placed = clock.epoch_ms()
         if trade_id not in self.trades:
             self.trades.append(trade_id)
         if trade_id not in self.live_trades:
             self.live_trades.append(trade_id)
 
     def reset(self, trade_id) -> None:
-        self.datetime_last_reset = datetime.datetime.utcnow()
+        self.datetime_last_reset = clock.utcnow()
+        self._time_last_reset = clock.epoch_ms()
         try:
             self.live_trades.remove(trade_id)
         except ValueError:
@@ -51,14 +56,10 @@ class RunnerContext:
 
     @property
     def placed_elapsed_seconds(self) -> Optional[float]:
-        if self.datetime_last_placed:
-            return (
-                datetime.datetime.utcnow() - self.datetime_last_placed
-            ).total_seconds()
+        if self._time_last_placed:
+            return clock.elapsed_seconds(self._time_last_placed)
 
     @property
     def reset_elapsed_seconds(self) -> Optional[float]:
-        if self.datetime_last_reset:
-            return (
-                datetime.datetime.utcnow() - self.datetime_last_reset
-            ).total_seconds()
+        if self._time_last_reset:
+            return clock.elapsed_seconds(self._time_last_reset)
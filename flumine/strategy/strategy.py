@@ -225,15 +225,34 @@ class BaseStrategy:
 class Strategies:
     def __init__(self):
         self._strategies = []
+        self._stream_strategies = {}  # {streamId: [strategies]}
 
     def __call__(self, strategy: BaseStrategy, client: BaseClient) -> None:
         strategy.client = client
         self._strategies.append(strategy)
         strategy.add()
+        self.update_stream_index()
 
     def start(self) -> None:
         for s in self:
             s.start()
+        self.update_stream_index()  # strategies may subscribe on start
+
+    def update_stream_index(self) -> None:
+        """Rebuilds the streamId to subscribed strategies
+        dispatch index, call if strategy streams change.
+        """
+        stream_strategies = {}
+        for strategy in self:
+            for stream_id in strategy.stream_ids:
+                strategies = stream_strategies.setdefault(stream_id, [])
+                if strategy not in strategies:
+                    strategies.append(strategy)
+        self._stream_strategies = stream_strategies
+
+    def stream_strategies(self, stream_id: int) -> list:
+        """Strategies subscribed to stream (in order added)"""
+        return self._stream_strategies.get(stream_id, [])
 
     @property
     def hashes(self) -> dict:
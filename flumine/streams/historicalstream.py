@@ -8,7 +8,10 @@ from betfairlightweight.resources.baseresource import BaseResource
 from betfairlightweight.compat import json
 
 from .basestream import BaseStream
+from ..backtest.replay import read_updates, read_raw_file
+from ..backtest.lineindex import get_line_index
 from ..exceptions import ListenerError
+from .. import config
 
 logger = logging.getLogger(__name__)
 
@@ -129,7 +132,9 @@ class HistoricListener(StreamListener):
             return
 
         # remove error handler / operation check
+        self.on_update(data)
 
+    def on_update(self, data: dict) -> None:
         # skip on_change / on_update as we know it is always an update
         publish_time = data["pt"]
         self.stream._process(data[self.stream._lookup], publish_time)
@@ -140,14 +145,27 @@ class FlumineHistoricalGeneratorStream(HistoricalGeneratorStream):
 
     def _read_loop(self) -> dict:
         self.listener.register_stream(self.unique_id, self.operation)
-        listener_on_data = self.listener.on_data  # cache functions
+        listener_on_update = self.listener.on_update  # cache functions
         stream_snap = self.listener.stream.snap
-        with open(self.file_path, "r") as f:
-            for update in f:
-                listener_on_data(update)
-                data = stream_snap()
-                if data:  # can return empty list
-                    yield data
+        for update in self._read_updates():
+            listener_on_update(update)
+            data = stream_snap()
+            if data:  # can return empty list
+                yield data
+
+    def _read_updates(self):
+        if config.line_index and config.replay_cache_dir is None:
+            line_index = get_line_index(self.file_path)
+            if line_index:
+                # restore market caches from checkpoint and seek
+                offset, caches = line_index.get_start(
+                    getattr(self.listener, "inplay", None),
+                    getattr(self.listener, "seconds_to_start", None),
+                    self.listener.stream._lightweight,
+                )
+                self.listener.stream._caches.update(caches)
+                return read_raw_file(self.file_path, offset)
+        return read_updates(self.file_path, config.replay_cache_dir)
 
 
 class HistoricalStream(BaseStream):
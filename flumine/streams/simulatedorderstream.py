@@ -6,6 +6,8 @@ from ..events.events import CurrentOrdersEvent
 
 logger = logging.getLogger(__name__)
 
+SNAP_DELTA = 1  # full snap so time based logic in process_orders still runs
+
 
 class CurrentOrders:
     def __init__(self, orders):
@@ -14,6 +16,11 @@ class CurrentOrders:
 
 
 class SimulatedOrderStream(BaseStream):
+    def __init__(self, *args, **kwargs):
+        super(SimulatedOrderStream, self).__init__(*args, **kwargs)
+        self._order_states = {}  # {Order.id: state at last emit}
+        self._last_snap = 0
+
     def run(self) -> None:
         logger.info(
             "Starting SimulatedOrderStream {0}".format(self.stream_id),
@@ -28,16 +35,27 @@ class SimulatedOrderStream(BaseStream):
                 current_orders = self._get_current_orders()
                 if current_orders:
                     self.flumine.handler_queue.put(
-                        CurrentOrdersEvent([CurrentOrders(current_orders)])
+                        CurrentOrdersEvent(
+                            [CurrentOrders(current_orders)],
+                            market_ids={order.market_id for order in current_orders},
+                        )
                     )
             time.sleep(self.streaming_timeout)
         logger.info("Stopped SimulatedOrderStream {0}".format(self.stream_id))
 
     def _get_current_orders(self) -> list:
+        # only live orders which have changed since the last emit (or all on snap)
+        snap = (time.time() - self._last_snap) > SNAP_DELTA
+        if snap:
+            self._last_snap = time.time()
         current_orders = []
-        for market in self.flumine.markets:
-            if market.closed is False:
-                for order in market.blotter:
-                    if order.simulated and order.trade.client == self.client:
+        order_states = {}
+        for market in self.flumine.markets.live_order_markets:
+            for order in market.blotter.live_orders_list():
+                if order.simulated and order.trade.client == self.client:
+                    state = (order.status, order.bet_id, order.simulated.state)
+                    order_states[order.id] = state
+                    if snap or self._order_states.get(order.id) != state:
                         current_orders.append(order)
+        self._order_states = order_states
         return current_orders
@@ -0,0 +1,234 @@
+import os
+import zlib
+import logging
+import multiprocessing
+from typing import Callable
+from betfairlightweight import StreamListener
+
+from .flumine import Flumine
+from .events.events import TerminationEvent
+from .streams.marketstream import MarketStream
+from .streams.datastream import DataStream
+from .streams.orderstream import OrderStream
+from .controls.clientcontrols import SharedMaxTransactionCount
+from .worker import BackgroundWorker, keep_alive
+from .exceptions import RunError
+from . import config
+
+logger = logging.getLogger(__name__)
+
+"""
+Multi-process live runtime, the supervisor holds the
+betfair stream connections and routes change messages
+by market id to the owning worker process. Each worker
+is a normal Flumine instance (created by `setup`) with
+its own markets, blotters, strategies, caches and
+execution, the stream connection is replaced by a
+queue fed by the supervisor.
+"""
+
+
+def get_shard(market_id: str, shards: int) -> int:
+    """Market affinity, stable across processes (unlike hash)"""
+    return zlib.crc32(market_id.encode()) % shards
+
+
+class RouterListener(StreamListener):
+    """
+    Supervisor listener, updates clk (for reconnects)
+    and routes change messages to each worker queue
+    rather than processing/caching.
+    """
+
+    def __init__(self, shard_queues: list = None, **kwargs):
+        super(RouterListener, self).__init__(**kwargs)
+        self.shard_queues = shard_queues or []
+
+    def _on_change_message(self, data: dict, unique_id: int) -> None:
+        self.stream._update_clk(data)
+        lookup = self.stream._lookup
+        if lookup not in data:  # heartbeat
+            return
+        shards = [[] for _ in self.shard_queues]
+        for datum in data[lookup]:
+            market_id = datum.get("id") or datum.get("mid")
+            shards[get_shard(market_id, len(shards))].append(datum)
+        change_type = data.get("ct", "UPDATE")
+        for shard_queue, shard_data in zip(self.shard_queues, shards):
+            if shard_data or change_type != "UPDATE":
+                shard_queue.put({**data, lookup: shard_data})
+
+
+class QueueStream:
+    """
+    Replaces the betfair stream connection in a worker,
+    change messages are read from the supervisor queue
+    and processed by the stream listener as normal.
+    """
+
+    def __init__(self, flumine, unique_id: int, listener: StreamListener, queue):
+        self.flumine = flumine
+        self.unique_id = unique_id
+        self.listener = listener
+        self._queue = queue
+        self._running = False
+
+    def subscribe_to_markets(self, *args, **kwargs) -> int:
+        self.listener.register_stream(self.unique_id, "marketSubscription")
+        return self.unique_id
+
+    def subscribe_to_orders(self, *args, **kwargs) -> int:
+        self.listener.register_stream(self.unique_id, "orderSubscription")
+        return self.unique_id
+
+    def start(self) -> None:
+        self._running = True
+        while self._running:
+            data = self._queue.get()
+            if data is None:
+                if self._running:  # supervisor shutdown
+                    self._running = False
+                    self.flumine.handler_queue.put(TerminationEvent(self.flumine))
+                break
+            self.listener._on_change_message(data, self.unique_id)
+
+    def stop(self) -> None:
+        if self._running:
+            self._running = False
+            self._queue.put(None)
+
+
+class ShardStreaming:
+    """Worker replacement for betting_client.streaming"""
+
+    def __init__(self, flumine, stream_queues: dict):
+        self.flumine = flumine
+        self.stream_queues = stream_queues  # streamId: Queue
+
+    def create_stream(
+        self, unique_id: int = 0, listener: StreamListener = None, **kwargs
+    ) -> QueueStream:
+        return QueueStream(
+            self.flumine, unique_id, listener, self.stream_queues[unique_id]
+        )
+
+
+def get_routed_streams(framework: Flumine) -> list:
+    # streams with a betfair connection (not simulated)
+    return [
+        stream
+        for stream in framework.streams
+        if isinstance(stream, (MarketStream, DataStream, OrderStream))
+    ]
+
+
+def run_worker(
+    setup: Callable[[], Flumine],
+    shard: int,
+    stream_queues: dict,
+    transaction_counts,
+) -> None:
+    """Worker process, creates a new framework and
+    strategies using setup with streams fed by the
+    supervisor and transaction counts shared.
+    """
+    config.process_id = os.getpid()
+    framework = setup()
+    framework.client.betting_client.streaming = ShardStreaming(framework, stream_queues)
+    framework.client.trading_controls = [
+        SharedMaxTransactionCount(framework, framework.client, transaction_counts)
+        if control.NAME == "MAX_TRANSACTION_COUNT"
+        else control
+        for control in framework.client.trading_controls
+    ]
+    logger.info(
+        "Starting worker",
+        extra={"shard": shard, "process_id": config.process_id},
+    )
+    framework.run()
+
+
+class FlumineSupervisor:
+    """Runs `workers` Flumine processes with market affinity, setup as per run_parallel"""
+
+    def __init__(self, setup: Callable[[], Flumine], workers: int = None):
+        self.setup = setup
+        self.workers = workers or os.cpu_count()
+        self.framework = None  # supervisor framework (streams/client only)
+        self.processes = []
+        self._streams = []
+        self._stream_queues = []  # per worker {streamId: Queue}
+        self._running = False
+
+    def run(self) -> None:
+        self.framework = self.setup()
+        self._streams = streams = get_routed_streams(self.framework)
+        if not streams:
+            raise RunError("No live streams to route, check strategies/client")
+        transaction_counts = SharedMaxTransactionCount.create_counts()
+        self._stream_queues = [
+            {stream.stream_id: multiprocessing.Queue() for stream in streams}
+            for _ in range(self.workers)
+        ]
+        for stream in streams:
+            stream._listener = RouterListener(
+                shard_queues=[
+                    queues[stream.stream_id] for queues in self._stream_queues
+                ],
+                max_latency=stream.MAX_LATENCY,
+                debug=False,
+            )
+        logger.info(
+            "Starting supervisor",
+            extra={"workers": self.workers, "streams": len(streams)},
+        )
+        self._running = True
+        self.processes = [
+            multiprocessing.Process(
+                target=run_worker,
+                args=(self.setup, shard, stream_queues, transaction_counts),
+                name="FlumineWorker-{0}".format(shard),
+                daemon=True,
+            )
+            for shard, stream_queues in enumerate(self._stream_queues)
+        ]
+        for process in self.processes:
+            process.start()
+        client = self.framework.client
+        client.login()
+        ka_interval = min((client.betting_client.session_timeout / 2), 1200)
+        keep_alive_worker = BackgroundWorker(
+            self.framework, function=keep_alive, interval=ka_interval
+        )
+        keep_alive_worker.start()
+        for stream in streams:
+            stream.start()
+        try:
+            self._wait()
+        finally:
+            self.stop()
+            keep_alive_worker.shutdown()
+            client.logout()
+
+    def _wait(self) -> None:
+        # returns on shutdown or when any worker exits
+        while self._running:
+            for process in self.processes:
+                process.join(timeout=1)
+                if not process.is_alive():
+                    logger.critical(
+                        "Worker exited, shutting down",
+                        extra={"worker": process.name, "exitcode": process.exitcode},
+                    )
+                    return
+
+    def stop(self) -> None:
+        self._running = False
+        for stream in self._streams:
+            stream.stop()
+        for stream_queues in self._stream_queues:
+            for stream_queue in stream_queues.values():
+                stream_queue.put(None)  # worker shutdown
+        for process in self.processes:
+            process.join(timeout=30)
+        logger.info("Supervisor stopped", extra={"workers": self.workers})
@@ -0,0 +1,184 @@
+import bisect
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+Betfair price ladder as integer tick indices, tick 0
+is 1.01 and tick 349 is 1000. Prices are converted to
+integer hundredths for table lookups so that price to
+tick, tick to price, tick distance and nearest price
+are O(1) without Decimal arithmetic.
+
+Batch variants (numpy arrays) are available for whole
+ladders when numpy is installed.
+"""
+
+CUTOFFS = (
+    (2, 100),
+    (3, 50),
+    (4, 20),
+    (6, 10),
+    (10, 5),
+    (20, 2),
+    (30, 1),
+    (50, 0.5),
+    (100, 0.2),
+    (1000, 0.1),
+)
+MIN_PRICE = 1.01
+MAX_PRICE = 1000
+
+_CUTOFF_PRICES = tuple(cutoff for cutoff, _ in CUTOFFS)
+_INCREMENTS = tuple(round(100 / step) for _, step in CUTOFFS)  # hundredths
+
+
+def _make_ticks() -> tuple:
+    ticks = []
+    cursor = round(MIN_PRICE * 100)
+    for cutoff, increment in zip(_CUTOFF_PRICES, _INCREMENTS):
+        ticks.extend(range(cursor, cutoff * 100, increment))
+        cursor = cutoff * 100
+    ticks.append(MAX_PRICE * 100)
+    return tuple(ticks)
+
+
+TICKS_100 = _make_ticks()  # price * 100 per tick
+PRICES = tuple(t / 100 for t in TICKS_100)
+TICK_COUNT = len(TICKS_100)
+MIN_TICK = 0
+MAX_TICK = TICK_COUNT - 1
+
+_TICK_LOOKUP = {t: tick for tick, t in enumerate(TICKS_100)}
+
+
+def price_to_hundredths(price) -> Optional[int]:
+    """Returns price * 100 as an int or None if the
+    price has more than 2dp.
+    """
+    hundredths = round(price * 100)
+    if hundredths / 100 == price:
+        return hundredths
+
+
+def price_to_tick(price) -> Optional[int]:
+    """Returns tick index or None if price is not valid"""
+    try:
+        return _TICK_LOOKUP.get(price_to_hundredths(price))
+    except (TypeError, ValueError, OverflowError):
+        return
+
+
+def tick_to_price(tick: int) -> float:
+    if not MIN_TICK <= tick <= MAX_TICK:
+        raise IndexError("Tick {0} is out of range".format(tick))
+    return PRICES[tick]
+
+
+def is_valid_price(price) -> bool:
+    return price_to_tick(price) is not None
+
+
+def _get_tick(price) -> int:
+    tick = price_to_tick(price)
+    if tick is None:
+        raise ValueError("{0} is not a valid price".format(price))
+    return tick
+
+
+def price_ticks_away(price, n_ticks: int) -> float:
+    """Returns price n_ticks away, capped at min/max
+    price, raises ValueError if price is not valid.
+    """
+    tick = _get_tick(price) + n_ticks
+    if tick < MIN_TICK:
+        return MIN_PRICE
+    elif tick > MAX_TICK:
+        return MAX_PRICE
+    return PRICES[tick]
+
+
+def ticks_difference(price_a, price_b) -> int:
+    """Returns number of ticks from price_a to price_b,
+    raises ValueError if either price is not valid.
+    """
+    return _get_tick(price_b) - _get_tick(price_a)
+
+
+def nearest_price(price) -> float:
+    """Returns nearest valid price, rounding half up
+    to the increment of the band the price is in.
+    """
+    if price <= MIN_PRICE:
+        return MIN_PRICE
+    if price > MAX_PRICE:
+        return MAX_PRICE
+    band = min(bisect.bisect_right(_CUTOFF_PRICES, price), len(CUTOFFS) - 1)
+    increment = _INCREMENTS[band]
+    # epsilon handles binary representation of halves (1.015 * 100)
+    n = int(price * 100 / increment + 0.5 + 1e-9)
+    return n * increment / 100
+
+
+def nearest_tick(price) -> int:
+    return _TICK_LOOKUP[round(nearest_price(price) * 100)]
+
+
+""" numpy batch variants """
+
+if np is not None:
+    PRICES_ARRAY = np.array(PRICES, dtype=np.float64)
+    _CUTOFF_ARRAY = np.array(_CUTOFF_PRICES, dtype=np.float64)
+    _INCREMENT_ARRAY = np.array(_INCREMENTS, dtype=np.int64)
+else:
+    PRICES_ARRAY = _CUTOFF_ARRAY = _INCREMENT_ARRAY = None
+
+
+def _check_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for batch tick functions")
+
+
+def prices_to_ticks(prices) -> "np.ndarray":
+    """Returns tick index per price, -1 where the price
+    is not valid.
+    """
+    _check_numpy()
+    prices = np.asarray(prices, dtype=np.float64)
+    ticks = np.clip(np.searchsorted(PRICES_ARRAY, prices), MIN_TICK, MAX_TICK)
+    return np.where(PRICES_ARRAY[ticks] == prices, ticks, -1)
+
+
+def ticks_to_prices(ticks) -> "np.ndarray":
+    _check_numpy()
+    ticks = np.asarray(ticks, dtype=np.int64)
+    if ticks.size and (ticks.min() < MIN_TICK or ticks.max() > MAX_TICK):
+        raise IndexError("Tick is out of range")
+    return PRICES_ARRAY[ticks]
+
+
+def prices_ticks_away(prices, n_ticks) -> "np.ndarray":
+    """Batch price_ticks_away, raises ValueError if any
+    price is not valid.
+    """
+    ticks = prices_to_ticks(prices)
+    if (ticks == -1).any():
+        raise ValueError("Prices contain an invalid price")
+    return PRICES_ARRAY[np.clip(ticks + n_ticks, MIN_TICK, MAX_TICK)]
+
+
+def nearest_prices(prices) -> "np.ndarray":
+    """Batch nearest_price"""
+    _check_numpy()
+    prices = np.asarray(prices, dtype=np.float64)
+    band = np.minimum(
+        np.searchsorted(_CUTOFF_ARRAY, prices, side="right"), len(CUTOFFS) - 1
+    )
+    increment = _INCREMENT_ARRAY[band]
+    n = np.floor(prices * 100 / increment + 0.5 + 1e-9)
+    nearest = n * increment / 100
+    nearest = np.where(prices <= MIN_PRICE, MIN_PRICE, nearest)
+    return np.where(prices > MAX_PRICE, MAX_PRICE, nearest)
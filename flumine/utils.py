@@ -6,26 +6,14 @@ from typing import Optional, Tuple, Callable
 from decimal import Decimal, ROUND_HALF_UP
 from betfairlightweight.resources.bettingresources import MarketBook, RunnerBook
 
-from . import config
+from . import config, ticks
 from .exceptions import FlumineException
+from .ticks import CUTOFFS, MIN_PRICE, MAX_PRICE
+from .backtest.historicalfiles import open_file
+from .backtest.lineindex import get_index_header
 
 logger = logging.getLogger(__name__)
 
-CUTOFFS = (
-    (2, 100),
-    (3, 50),
-    (4, 20),
-    (6, 10),
-    (10, 5),
-    (20, 2),
-    (30, 1),
-    (50, 0.5),
-    (100, 0.2),
-    (1000, 0.1),
-)
-MIN_PRICE = 1.01
-MAX_PRICE = 1000
-
 STRATEGY_NAME_HASH_LENGTH = 13
 
 
@@ -34,7 +22,7 @@ def create_short_uuid() -> str:
 
 
 def file_line_count(file_path: str) -> int:
-    with open(file_path) as f:
+    with open_file(file_path) as f:
         for i, l in enumerate(f):
             pass
     return i + 1
@@ -44,7 +32,11 @@ def get_file_md(file_dir: str, value: str) -> Optional[str]:
     # get value from raw streaming file marketDefinition
     if isinstance(file_dir, tuple):
         file_dir = file_dir[0]
-    with open(file_dir, "r") as f:
+    if config.line_index:
+        header = get_index_header(file_dir)
+        if header:
+            return header["market_definition"].get(value)
+    with open_file(file_dir) as f:
         first_line = f.readline()
         update = json.loads(first_line)
     md = update["mc"][0].get("marketDefinition", {})
@@ -69,26 +61,9 @@ def as_dec(value):
     return Decimal(str(value))
 
 
-def arange(start, stop, step):
-    while start < stop:
-        yield start
-        start += step
-
-
-def make_prices(min_price, cutoffs):
-    prices = []
-    cursor = as_dec(min_price)
-    for cutoff, step in cutoffs:
-        prices.extend(arange(as_dec(cursor), as_dec(cutoff), as_dec(1 / step)))
-        cursor = cutoff
-    prices.append(as_dec(MAX_PRICE))
-    return prices
-
-
-PRICES = make_prices(MIN_PRICE, CUTOFFS)
-
-
 def get_nearest_price(price, cutoffs=CUTOFFS):
+    if cutoffs is CUTOFFS or tuple(map(tuple, cutoffs)) == CUTOFFS:
+        return ticks.nearest_price(price)
     if price <= MIN_PRICE:
         return MIN_PRICE
     if price > MAX_PRICE:
@@ -135,13 +110,7 @@ def get_sp(runner: RunnerBook) -> Optional[float]:
 
 
 def price_ticks_away(price: float, n_ticks: int) -> float:
-    try:
-        price_index = PRICES.index(as_dec(price))
-        if price_index + n_ticks < 0:
-            return 1.01
-        return float(PRICES[price_index + n_ticks])
-    except IndexError:
-        return 1000
+    return ticks.price_ticks_away(price, n_ticks)
 
 
 def calculate_matched_exposure(mb: list, ml: list) -> Tuple:
@@ -182,6 +151,45 @@ def calculate_unmatched_exposure(ub: list, ul: list) -> Tuple:
     return round(lay_exp, 2), round(back_exp, 2)
 
 
+def calculate_market_exposure(
+    selection_profits: dict, number_of_winners: int = 1, runner_count: int = None
+) -> float:
+    """Calculates worst-case market exposure based on dict of
+    {(selection_id, handicap): (profit_if_win, profit_if_lose)}
+    returns the largest loss across all outcomes (zero or positive)
+
+    Single winner markets use the profit per outcome (each selection
+    winning whilst the others lose, including an untraded selection
+    winning), otherwise selections are treated as independent.
+    """
+    if not selection_profits:
+        return 0.0
+    if number_of_winners == 1:
+        total_lose = sum(p[1] for p in selection_profits.values())
+        worst = total_lose + min(p[0] - p[1] for p in selection_profits.values())
+        if runner_count is None or runner_count > len(selection_profits):
+            worst = min(worst, total_lose)
+    else:
+        worst = sum(min(p) for p in selection_profits.values())
+    return max(round(-worst, 2), 0.0)
+
+
+def calculate_hedge(
+    profit_if_win: float, profit_if_lose: float, price: float
+) -> Tuple[Optional[str], float]:
+    """Calculates the bet at price that equalises
+    profit_if_win and profit_if_lose (green up)
+    returns the tuple (side, size)
+    """
+    size = round((profit_if_lose - profit_if_win) / price, 2)
+    if size > 0:
+        return "BACK", size
+    elif size < 0:
+        return "LAY", -size
+    else:
+        return None, 0.0
+
+
 def wap(matched: list) -> Tuple[float, float]:
     if not matched:
         return 0, 0
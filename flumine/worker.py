@@ -4,7 +4,7 @@ import logging
 from typing import Callable
 from betfairlightweight import BetfairError, filters, exceptions
 
-from . import config
+from . import config, clock
 from .events import events
 from .utils import chunks
 
@@ -34,8 +34,14 @@ class BackgroundWorker(threading.Thread):
         self.start_delay = start_delay
         self.context = context or {}
         self._running = False
+        self._clock = None  # clock of the starting thread (backtest)
+
+    def start(self) -> None:
+        self._clock = clock.get_clock()
+        super(BackgroundWorker, self).start()
 
     def run(self) -> None:
+        clock.set_clock(self._clock or clock.WALL_CLOCK)
         logger.info(
             "BackgroundWorker {0} starting".format(self.name),
             extra={
@@ -163,6 +169,20 @@ def poll_account_balance(context: dict, flumine) -> None:
         flumine.log_control(events.BalanceEvent(client))
 
 
+def poll_latency(context: dict, flumine) -> None:
+    # interval snapshot, histograms are reset
+    snapshot = flumine.latency.snapshot(reset=True)
+    if snapshot:
+        flumine.log_control(events.LatencyEvent(snapshot))
+
+
+def keep_alive_execution(context: dict, flumine) -> None:
+    # ping idle sessions before MAX_SESSION_AGE
+    client = flumine.client
+    client.execution.ping_sessions(client)
+    logger.info("Execution sessions", extra=client.execution.info)
+
+
 def poll_market_closure(context: dict, flumine) -> None:
     client = flumine.client
     if client.paper_trade:
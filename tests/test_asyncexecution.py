@@ -0,0 +1,362 @@
+import gzip
+import json
+import asyncio
+import threading
+import unittest
+from unittest import mock
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from betfairlightweight import APIClient, resources
+
+from flumine.execution.asyncexecution import (
+    AsyncBetfairExecution,
+    HTTPConnectionPool,
+    HTTPResponse,
+)
+from flumine.execution.baseexecution import OrderPackageType
+from flumine.exceptions import OrderExecutionError
+
+PLACE_RESPONSE = {
+    "jsonrpc": "2.0",
+    "result": {
+        "status": "SUCCESS",
+        "marketId": "1.234",
+        "instructionReports": [
+            {
+                "status": "SUCCESS",
+                "instruction": {
+                    "selectionId": 123,
+                    "side": "BACK",
+                    "orderType": "LIMIT",
+                    "limitOrder": {"size": 2, "price": 3},
+                },
+                "betId": "1",
+                "placedDate": "2021-01-01T00:00:00.000Z",
+                "orderStatus": "EXECUTABLE",
+            }
+        ],
+    },
+    "id": 1,
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the betting API"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.path, dict(self.headers), json.loads(body)))
+        status, content, headers = self.server.responses.pop(0)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if "Transfer-Encoding" in headers:
+            self.end_headers()
+            for i in range(0, len(content), 10):
+                chunk = content[i : i + 10]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        if self.server.close_connections:
+            self.close_connection = True
+
+    def do_HEAD(self):
+        self.server.requests.append((self.path, dict(self.headers), None))
+        self.send_response(405)
+        self.send_header("Content-Length", "10")
+        self.end_headers()
+
+    def log_message(self, *args):
+        return
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInServerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = StandInServer(("127.0.0.1", 0), StandInHandler)
+        self.server.requests = []
+        self.server.responses = []
+        self.server.close_connections = False
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,), daemon=True
+        )
+        self.thread.start()
+        self.url = "http://127.0.0.1:%s/exchange/betting/json-rpc/v1" % (
+            self.server.server_address[1]
+        )
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_response(self, data, status: int = 200, headers: dict = None) -> None:
+        content = data if isinstance(data, bytes) else json.dumps(data).encode()
+        self.server.responses.append((status, content, headers or {}))
+
+
+class HTTPConnectionPoolTest(StandInServerTestCase):
+    def setUp(self) -> None:
+        super(HTTPConnectionPoolTest, self).setUp()
+        self.pool = HTTPConnectionPool(max_idle=2)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.loop.close()
+        super(HTTPConnectionPoolTest, self).tearDown()
+
+    def post(self, data: dict = None) -> HTTPResponse:
+        return self.loop.run_until_complete(
+            self.pool.post(
+                self.url, json.dumps(data or {}).encode(), {"X-Application": "test"}
+            )
+        )
+
+    def test_post(self):
+        self.add_response({"result": 1})
+        response = self.post({"a": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {"result": 1})
+        path, headers, body = self.server.requests[0]
+        self.assertEqual(path, "/exchange/betting/json-rpc/v1")
+        self.assertEqual(headers["X-Application"], "test")
+        self.assertEqual(body, {"a": 1})
+
+    def test_post_keep_alive(self):
+        for i in range(3):
+            self.add_response({"result": i})
+            self.assertEqual(json.loads(self.post().content), {"result": i})
+        self.assertEqual(self.pool.requests, 3)
+        self.assertEqual(self.pool.connections_created, 1)
+        self.assertEqual(self.pool.connections_reused, 2)
+        self.assertEqual(self.pool.idle_count, 1)
+
+    def test_post_stale_connection(self):
+        self.server.close_connections = True  # closed without Connection: close
+        self.add_response({"result": 1})
+        self.add_response({"result": 2})
+        self.post()
+        self.assertEqual(json.loads(self.post().content), {"result": 2})
+        self.assertEqual(self.pool.connections_created, 2)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_post_connection_close(self):
+        self.add_response({"result": 1}, headers={"Connection": "close"})
+        self.post()
+        self.assertEqual(self.pool.idle_count, 0)
+
+    def test_post_chunked_gzip(self):
+        self.add_response(
+            gzip.compress(json.dumps({"result": list(range(20))}).encode()),
+            headers={"Transfer-Encoding": "chunked", "Content-Encoding": "gzip"},
+        )
+        response = self.post()
+        self.assertEqual(json.loads(response.content), {"result": list(range(20))})
+        self.assertEqual(self.pool.idle_count, 1)
+
+    def test_post_error_status(self):
+        self.add_response(b"error", status=503)
+        response = self.post()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.text, "error")
+
+    def test_warm_up(self):
+        self.loop.run_until_complete(self.pool.warm_up(self.url, 3))
+        self.assertEqual(self.pool.connections_created, 2)
+        self.assertEqual(self.pool.idle_count, 2)
+        self.loop.run_until_complete(self.pool.warm_up(self.url, 3))
+        self.assertEqual(self.pool.connections_created, 2)
+        self.add_response({"result": 1})
+        self.post()
+        self.assertEqual(self.pool.connections_reused, 1)
+
+    def test_ping(self):
+        self.loop.run_until_complete(self.pool.warm_up(self.url, 2))
+        connections = list(self.pool._idle.values())[0]
+        connections[0].time_returned -= 150
+        self.loop.run_until_complete(self.pool.ping(self.url, 100))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0][0], "/exchange/betting/json-rpc/v1")
+        self.assertEqual(self.pool.idle_count, 2)
+        # connection still usable after HEAD
+        self.add_response({"result": 1})
+        self.assertEqual(json.loads(self.post().content), {"result": 1})
+
+    def test_ping_closed(self):
+        self.loop.run_until_complete(self.pool.warm_up(self.url, 1))
+        connection = list(self.pool._idle.values())[0][0]
+        connection.time_returned -= 150
+        connection.close()
+        self.loop.run_until_complete(self.pool.ping(self.url, 100))
+        self.assertEqual(self.pool.idle_count, 0)
+
+    def test_ping_concurrent_pop(self):
+        self.loop.run_until_complete(self.pool.warm_up(self.url, 2))
+        connections = list(self.pool._idle.values())[0]
+        for connection in connections:
+            connection.time_returned -= 150
+        request = self.pool._request
+
+        async def _request(key, connection, *args, **kwargs):
+            # concurrent post takes the other idle connection
+            connections.pop()
+            return await request(key, connection, *args, **kwargs)
+
+        with mock.patch.object(self.pool, "_request", side_effect=_request):
+            self.loop.run_until_complete(self.pool.ping(self.url, 100))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.pool.idle_count, 1)
+
+    def test_max_idle(self):
+        mock_connection = mock.Mock()
+        self.pool._return_connection(("http", "a", 1), mock.Mock())
+        self.pool._return_connection(("http", "a", 1), mock.Mock())
+        self.pool._return_connection(("http", "a", 1), mock_connection)
+        self.assertEqual(self.pool.idle_count, 2)
+        mock_connection.close.assert_called_with()
+
+
+class AsyncBetfairExecutionTest(StandInServerTestCase):
+    def setUp(self) -> None:
+        super(AsyncBetfairExecutionTest, self).setUp()
+        self.mock_flumine = mock.Mock()
+        self.execution = AsyncBetfairExecution(self.mock_flumine, max_workers=2)
+        self.trading = APIClient("username", "password", app_key="app_key")
+        self.trading.api_uri = self.url.replace("betting/json-rpc/v1", "")
+        self.trading.session_token = "token"
+        self.mock_order_package = mock.Mock(
+            market_id="1.234",
+            package_type=OrderPackageType.PLACE,
+            place_instructions=[{"selectionId": 123}],
+            market_version=None,
+            customer_strategy_ref="test",
+            async_=False,
+            elapsed_seconds=0.01,
+            retry_count=0,
+            info={},
+        )
+        self.mock_order_package.client.betting_client = self.trading
+        self.mock_order_package.id.hex = "abc"
+
+    def tearDown(self) -> None:
+        self.execution.shutdown()
+        super(AsyncBetfairExecutionTest, self).tearDown()
+
+    def test_init(self):
+        self.assertEqual(self.execution._max_concurrency, 2)
+        self.assertTrue(self.execution._loop_thread.is_alive())
+        self.assertEqual(self.execution._futures, set())
+        self.assertIsNone(self.execution._thread_pool)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution.process_place_response"
+    )
+    def test_handler(self, mock_process_place_response):
+        self.add_response(PLACE_RESPONSE)
+        self.execution.handler(self.mock_order_package)
+        self.execution.shutdown()
+        path, headers, body = self.server.requests[0]
+        self.assertEqual(headers["X-Authentication"], "token")
+        self.assertEqual(body["method"], "SportsAPING/v1.0/placeOrders")
+        self.assertEqual(
+            body["params"],
+            {
+                "marketId": "1.234",
+                "instructions": [{"selectionId": 123}],
+                "customerRef": "abc",
+                "customerStrategyRef": "test",
+                "async": False,
+            },
+        )
+        order_package, response = mock_process_place_response.call_args[0]
+        self.assertEqual(order_package, self.mock_order_package)
+        self.assertIsInstance(response, resources.PlaceOrders)
+        self.assertEqual(response.place_instruction_reports[0].bet_id, "1")
+        self.mock_flumine.latency.record.assert_called()
+        self.assertEqual(self.execution.info["connections_created"], 1)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution.process_place_response"
+    )
+    def test_handler_retry(self, mock_process_place_response):
+        self.add_response(b"error", status=503)
+        self.add_response(PLACE_RESPONSE)
+        self.mock_order_package.retry.return_value = True
+        self.execution.handler(self.mock_order_package)
+        self.execution.shutdown()
+        self.assertEqual(len(self.server.requests), 2)
+        self.mock_order_package.retry.assert_called_with(backoff=False)
+        mock_process_place_response.assert_called()
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution.process_place_response"
+    )
+    def test_handler_no_retry(self, mock_process_place_response):
+        self.add_response({"error": {"code": -1}, "jsonrpc": "2.0"})
+        self.mock_order_package.retry.return_value = False
+        self.execution.handler(self.mock_order_package)
+        self.execution.shutdown()
+        self.assertEqual(len(self.server.requests), 1)
+        mock_process_place_response.assert_not_called()
+
+    def test_handler_empty(self):
+        self.mock_order_package.orders = []
+        self.execution.handler(self.mock_order_package)
+        self.execution.shutdown()
+        self.assertEqual(self.server.requests, [])
+
+    def test_handler_unknown(self):
+        self.mock_order_package.package_type = None
+        with self.assertRaises(NotImplementedError):
+            self.execution.handler(self.mock_order_package)
+
+    def test_create_request(self):
+        for package_type, method in (
+            (OrderPackageType.PLACE, "placeOrders"),
+            (OrderPackageType.CANCEL, "cancelOrders"),
+            (OrderPackageType.UPDATE, "updateOrders"),
+            (OrderPackageType.REPLACE, "replaceOrders"),
+        ):
+            self.mock_order_package.package_type = package_type
+            self.assertEqual(
+                self.execution._create_request(self.mock_order_package)[0], method
+            )
+
+    def test_cancel_params_empty(self):
+        self.mock_order_package.cancel_instructions = []
+        with self.assertRaises(OrderExecutionError):
+            self.execution.cancel_params(self.mock_order_package)
+
+    def test_replace_params(self):
+        self.mock_order_package.replace_instructions = [{"betId": "1"}]
+        self.mock_order_package.market_version = {"version": 1}
+        self.assertEqual(
+            self.execution.replace_params(self.mock_order_package),
+            {
+                "marketId": "1.234",
+                "instructions": [{"betId": "1"}],
+                "customerRef": "abc",
+                "marketVersion": {"version": 1},
+                "async": False,
+            },
+        )
+
+    def test_warm_up(self):
+        mock_client = mock.Mock(betting_client=self.trading)
+        self.execution.warm_up(mock_client)
+        self.assertEqual(self.execution.info["idle_connections"], 2)
+        self.execution.ping_sessions(mock_client)
+        self.assertEqual(self.execution.info["connections_created"], 2)
+
+    def test_shutdown(self):
+        self.execution.shutdown()
+        self.assertFalse(self.execution._loop_thread.is_alive())
+        self.execution.shutdown()  # already stopped
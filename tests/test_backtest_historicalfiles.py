@@ -0,0 +1,155 @@
+import os
+import bz2
+import gzip
+import lzma
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import unittest
+from unittest import mock
+
+from flumine import utils
+from flumine.backtest import historicalfiles
+
+FILE_PATH = "tests/resources/BASIC-1.132153978"
+
+
+class HistoricalFilesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        with open(FILE_PATH, "rb") as f:
+            self.data = f.read()
+        with open(FILE_PATH, "r") as f:
+            self.lines = f.readlines()
+        self.paths = {}
+        for ext, module in ((".gz", gzip), (".bz2", bz2), (".xz", lzma)):
+            path = os.path.join(self.tmp_dir, "1.132153978" + ext)
+            with open(path, "wb") as f:
+                f.write(module.compress(self.data))
+            self.paths[ext] = path
+        # tar/zip archives containing a compressed member
+        self.tar_path = os.path.join(self.tmp_dir, "data.tar")
+        with tarfile.open(self.tar_path, "w") as t:
+            t.add(self.paths[".bz2"], arcname="PRO/2021/1.132153978.bz2")
+        self.zip_path = os.path.join(self.tmp_dir, "data.zip")
+        with zipfile.ZipFile(self.zip_path, "w") as z:
+            z.write(self.paths[".bz2"], arcname="PRO/2021/1.132153978.bz2")
+
+    def tearDown(self) -> None:
+        historicalfiles.clear_archive_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_split_archive_path(self):
+        self.assertEqual(
+            historicalfiles.split_archive_path(FILE_PATH), (FILE_PATH, None)
+        )
+        self.assertEqual(
+            historicalfiles.split_archive_path(
+                os.path.join(self.tar_path, "PRO", "2021", "1.132153978.bz2")
+            ),
+            (self.tar_path, "PRO/2021/1.132153978.bz2"),
+        )
+        self.assertEqual(
+            historicalfiles.split_archive_path(
+                os.path.join(self.zip_path, "PRO", "2021", "1.132153978.bz2")
+            ),
+            (self.zip_path, "PRO/2021/1.132153978.bz2"),
+        )
+        self.assertEqual(
+            historicalfiles.split_archive_path("/not/a/file"), ("/not/a/file", None)
+        )
+
+    def test_is_compressed(self):
+        self.assertFalse(historicalfiles.is_compressed(FILE_PATH))
+        for path in self.paths.values():
+            self.assertTrue(historicalfiles.is_compressed(path))
+        self.assertTrue(
+            historicalfiles.is_compressed(
+                os.path.join(self.tar_path, "PRO/2021/1.132153978.bz2")
+            )
+        )
+
+    def test_open_binary(self):
+        for path in self.paths.values():
+            with historicalfiles.open_binary(path) as f:
+                self.assertEqual(f.read(), self.data)
+
+    def test_open_binary_no_decompress(self):
+        with historicalfiles.open_binary(self.paths[".gz"], decompress=False) as f:
+            self.assertEqual(f.read(), open(self.paths[".gz"], "rb").read())
+
+    def test_open_binary_archive_missing(self):
+        with self.assertRaises(KeyError):
+            with historicalfiles.open_binary(os.path.join(self.tar_path, "1.23")):
+                pass
+
+    def test_open_binary_archive_cached(self):
+        with tarfile.open(self.tar_path, "a") as t:
+            t.add(self.paths[".gz"], arcname="PRO/2021/1.132153978.gz")
+        calls = []
+        getmembers = tarfile.TarFile.getmembers
+
+        def _getmembers(tar):
+            calls.append(tar)
+            return getmembers(tar)
+
+        with mock.patch.object(tarfile.TarFile, "getmembers", _getmembers):
+            for member in ("PRO/2021/1.132153978.bz2", "PRO/2021/1.132153978.gz"):
+                for _ in range(2):
+                    with historicalfiles.open_binary(
+                        os.path.join(self.tar_path, member)
+                    ) as f:
+                        self.assertEqual(f.read(), self.data)
+        self.assertEqual(len(calls), 1)
+        zip_path = os.path.join(self.zip_path, "PRO/2021/1.132153978.bz2")
+        with mock.patch("flumine.backtest.historicalfiles.zipfile.ZipFile") as mock_zip:
+            mock_zip.return_value.open.side_effect = lambda m: open(
+                self.paths[".bz2"], "rb"
+            )
+            for _ in range(2):
+                with historicalfiles.open_binary(zip_path) as f:
+                    self.assertEqual(f.read(), self.data)
+            mock_zip.assert_called_once_with(self.zip_path)
+
+    def test_get_archive_modified(self):
+        index = historicalfiles.get_archive(self.tar_path)
+        self.assertEqual(list(index), ["PRO/2021/1.132153978.bz2"])
+        with tarfile.open(self.tar_path, "a") as t:
+            t.add(self.paths[".gz"], arcname="PRO/2021/1.132153978.gz")
+        os.utime(self.tar_path, ns=(0, 0))  # ensure mtime changes
+        self.assertEqual(len(historicalfiles.get_archive(self.tar_path)), 2)
+
+    def test_open_file(self):
+        with historicalfiles.open_file(
+            os.path.join(self.zip_path, "PRO/2021/1.132153978.bz2")
+        ) as f:
+            self.assertEqual(f.readlines(), self.lines)
+
+    def test_read_lines(self):
+        self.assertEqual(list(historicalfiles.read_lines(FILE_PATH)), self.lines)
+        for path in self.paths.values():
+            self.assertEqual(list(historicalfiles.read_lines(path)), self.lines)
+
+    def test_read_lines_archive(self):
+        for archive_path in (self.tar_path, self.zip_path):
+            path = os.path.join(archive_path, "PRO/2021/1.132153978.bz2")
+            self.assertEqual(list(historicalfiles.read_lines(path)), self.lines)
+
+    @mock.patch("flumine.backtest.historicalfiles.READ_BATCH_SIZE", 1)
+    @mock.patch("flumine.backtest.historicalfiles.READ_BUFFER_SIZE", 1)
+    def test_read_lines_close(self):
+        lines = historicalfiles.read_lines(self.paths[".gz"])
+        self.assertEqual(next(lines), self.lines[0])
+        lines.close()  # reader thread stopped and joined
+
+    def test_read_lines_error(self):
+        with self.assertRaises(KeyError):
+            list(historicalfiles.read_lines(os.path.join(self.zip_path, "1.23")))
+
+    def test_get_file_md(self):
+        self.assertEqual(
+            utils.get_file_md(self.paths[".gz"], "marketDefinition"),
+            utils.get_file_md(FILE_PATH, "marketDefinition"),
+        )
+        self.assertEqual(utils.file_line_count(self.paths[".xz"]), len(self.lines))
@@ -0,0 +1,148 @@
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+from flumine import config, utils
+from flumine.backtest import lineindex
+from flumine.streams.historicalstream import HistoricalStream
+
+FILE_PATH = "tests/resources/BASIC-1.132153978"
+
+
+def get_snaps(file_path: str, **listener_kwargs) -> list:
+    stream = HistoricalStream(
+        mock.Mock(), 1, None, None, file_path, None, **listener_kwargs
+    )
+    snaps = []
+    for market_books in stream.create_generator()():
+        for market_book in market_books:
+            snaps.append(
+                (
+                    market_book.publish_time_epoch,
+                    market_book.status,
+                    market_book.inplay,
+                    market_book.total_matched,
+                    market_book._data["runners"],
+                )
+            )
+    return snaps
+
+
+class LineIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "1.132153978")
+        shutil.copy(FILE_PATH, self.file_path)
+        self.line_index = lineindex.build_line_index(self.file_path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+        config.line_index = False
+
+    def test_get_index_path(self):
+        self.assertEqual(
+            lineindex.get_index_path(self.file_path), self.file_path + ".index"
+        )
+        tar_path = os.path.join(self.tmp_dir, "data.tar")
+        with tarfile.open(tar_path, "w") as t:
+            t.add(self.file_path, arcname="1.132153978")
+        self.assertIsNone(
+            lineindex.get_index_path(os.path.join(tar_path, "1.132153978"))
+        )
+
+    def test_build_line_index(self):
+        self.assertEqual(len(self.line_index.publish_times), 480)
+        self.assertTrue(self.line_index.seekable)
+        self.assertEqual(self.line_index.header["market_ids"], ["1.132153978"])
+        self.assertEqual(
+            self.line_index.market_definition["eventId"],
+            utils.get_file_md(FILE_PATH, "eventId"),
+        )
+        self.assertEqual(self.line_index.definitions[0][:3], (0, "OPEN", False))
+        self.assertTrue(self.line_index.checkpoints)
+        for line, offset, caches in self.line_index.checkpoints:
+            self.assertGreater(line, 0)
+
+    def test_first_line(self):
+        self.assertEqual(self.line_index.first_line(), 0)
+        inplay = self.line_index.first_line(inplay=True)
+        self.assertGreater(inplay, 0)
+        seconds_to_start = self.line_index.first_line(seconds_to_start=600)
+        self.assertGreater(seconds_to_start, 0)
+        self.assertLess(seconds_to_start, inplay)
+
+    def test_first_line_not_seekable(self):
+        self.line_index.header["seekable"] = False
+        self.assertEqual(self.line_index.first_line(inplay=True), 0)
+
+    def test_get_start(self):
+        self.assertEqual(self.line_index.get_start(), (0, {}))
+        offset, caches = self.line_index.get_start(inplay=True)
+        self.assertGreater(offset, 0)
+        self.assertEqual(list(caches), ["1.132153978"])
+        self.assertFalse(caches["1.132153978"].lightweight)
+
+    def test_get_start_lightweight(self):
+        offset, caches = self.line_index.get_start(inplay=True, lightweight=True)
+        self.assertTrue(caches["1.132153978"].lightweight)
+
+    def test_write_load_line_index(self):
+        self.assertIsNone(lineindex.load_line_index(self.file_path))
+        self.assertIsNone(lineindex.load_index_header(self.file_path))
+        lineindex.write_line_index(self.line_index, self.file_path + ".index")
+        line_index = lineindex.load_line_index(self.file_path)
+        self.assertEqual(line_index.header, self.line_index.header)
+        self.assertEqual(line_index.publish_times, self.line_index.publish_times)
+        self.assertEqual(line_index.definitions, self.line_index.definitions)
+        self.assertEqual(line_index.checkpoints, self.line_index.checkpoints)
+        self.assertEqual(
+            lineindex.load_index_header(self.file_path), self.line_index.header
+        )
+
+    def test_load_line_index_stale(self):
+        lineindex.write_line_index(self.line_index, self.file_path + ".index")
+        with open(self.file_path, "a") as f:
+            f.write("\n")
+        self.assertIsNone(lineindex.load_line_index(self.file_path))
+        self.assertIsNone(lineindex.load_index_header(self.file_path))
+
+    def test_get_line_index(self):
+        line_index = lineindex.get_line_index(self.file_path)
+        self.assertTrue(os.path.exists(self.file_path + ".index"))
+        self.assertEqual(line_index.header, self.line_index.header)
+        with mock.patch("flumine.backtest.lineindex.build_line_index") as mock_build:
+            lineindex.get_line_index(self.file_path)
+            mock_build.assert_not_called()
+
+    @mock.patch("flumine.backtest.lineindex.write_line_index", side_effect=OSError)
+    def test_get_line_index_write_error(self, _):
+        line_index = lineindex.get_line_index(self.file_path)
+        self.assertEqual(line_index.header, self.line_index.header)
+
+    def test_get_index_header(self):
+        self.assertEqual(
+            lineindex.get_index_header(self.file_path), self.line_index.header
+        )
+        self.assertTrue(os.path.exists(self.file_path + ".index"))
+
+    def test_get_file_md(self):
+        event_id = utils.get_file_md(self.file_path, "eventId")
+        config.line_index = True
+        self.assertEqual(utils.get_file_md(self.file_path, "eventId"), event_id)
+        self.assertTrue(os.path.exists(self.file_path + ".index"))
+
+    def test_snaps(self):
+        for listener_kwargs in (
+            {},
+            {"inplay": True},
+            {"inplay": False},
+            {"seconds_to_start": 600},
+            {"inplay": False, "seconds_to_start": 300},
+        ):
+            config.line_index = False
+            snaps = get_snaps(self.file_path, **listener_kwargs)
+            config.line_index = True
+            self.assertEqual(get_snaps(self.file_path, **listener_kwargs), snaps)
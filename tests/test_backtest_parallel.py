@@ -0,0 +1,160 @@
+import unittest
+from unittest import mock
+
+from flumine import FlumineBacktest, clients, BaseStrategy, config
+from flumine.backtest import parallel
+from flumine.controls.loggingcontrols import LoggingControl
+from flumine.order.trade import Trade
+from flumine.order.ordertype import LimitOrder
+
+
+class ExampleStrategy(BaseStrategy):
+    def check_market_book(self, market, market_book):
+        return True
+
+
+class ExampleOrderStrategy(ExampleStrategy):
+    def process_market_book(self, market, market_book):
+        # single order per market
+        if not market.blotter.strategy_orders(self):
+            runner = market_book.runners[0]
+            trade = Trade(
+                market_book.market_id, runner.selection_id, runner.handicap, self
+            )
+            order = trade.create_order(side="BACK", order_type=LimitOrder(1000, 2))
+            market.place_order(order)
+
+
+class ExampleLoggingControl(LoggingControl):
+    NAME = "EXAMPLE"
+
+    def _process_market(self, event):
+        self.cache.append(event.event.market_id)
+
+
+def setup():
+    framework = FlumineBacktest(client=clients.BacktestClient())
+    framework.add_strategy(
+        ExampleOrderStrategy(
+            market_filter={"markets": ["tests/resources/BASIC-1.132153978"]}
+        )
+    )
+    framework.add_logging_control(ExampleLoggingControl())
+    return framework
+
+
+def setup_duplicate_market_filters():
+    # same market file in two streams (event_processing differs)
+    framework = setup()
+    framework.add_strategy(
+        ExampleOrderStrategy(
+            market_filter={
+                "markets": ["tests/resources/BASIC-1.132153978"],
+                "event_processing": True,
+            }
+        )
+    )
+    return framework
+
+
+class ShardsTest(unittest.TestCase):
+    def test_create_shards(self):
+        streams = [mock.Mock(stream_id=i) for i in range(5)]
+        event_streams = {
+            None: streams[:3],
+            "123": streams[3:],
+        }
+        self.assertEqual(parallel.create_shards(event_streams, 2), [[3, 4, 2], [0, 1]])
+
+    def test_create_shards_more_processes(self):
+        streams = [mock.Mock(stream_id=i) for i in range(2)]
+        self.assertEqual(parallel.create_shards({None: streams}, 8), [[0], [1]])
+
+    def test_create_shards_event_kept_together(self):
+        streams = [mock.Mock(stream_id=i) for i in range(4)]
+        self.assertEqual(parallel.create_shards({"123": streams}, 4), [[0, 1, 2, 3]])
+
+    def test_create_shards_duplicate_market_filters(self):
+        streams = [
+            mock.Mock(stream_id=i, market_filter="1.23", event_processing=bool(i))
+            for i in range(2)
+        ]
+        shards = parallel.create_shards({None: streams}, 2)
+        self.assertEqual(shards, [[0], [1]])
+
+
+class BacktestResultTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.result = parallel.BacktestResult()
+
+    def test_init(self):
+        self.assertEqual(self.result.markets, {})
+        self.assertEqual(self.result.cleared_orders_meta, [])
+        self.assertEqual(self.result.logging_controls, {})
+
+    def test_update(self):
+        self.result.update(
+            {
+                "markets": {"1.1": [1, 2]},
+                "cleared_orders_meta": [[1, 2]],
+                "logging_controls": {"TEST": [1]},
+            }
+        )
+        self.result.update(
+            {
+                "markets": {"1.2": [3]},
+                "cleared_orders_meta": [[3]],
+                "logging_controls": {"TEST": [2]},
+            }
+        )
+        self.assertEqual(self.result.markets, {"1.1": [1, 2], "1.2": [3]})
+        self.assertEqual(self.result.cleared_orders_meta, [[1, 2], [3]])
+        self.assertEqual(self.result.logging_controls, {"TEST": [1, 2]})
+        self.assertEqual(self.result.orders, [1, 2, 3])
+
+    def test_update_same_market(self):
+        for orders in ([1, 2], [3]):
+            self.result.update(
+                {
+                    "markets": {"1.1": orders},
+                    "cleared_orders_meta": [],
+                    "logging_controls": {},
+                }
+            )
+        self.assertEqual(self.result.markets, {"1.1": [1, 2, 3]})
+
+
+class RunParallelTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        config.simulated = False
+
+    def test_run_shard(self):
+        result = parallel.run_shard(setup, [1000])
+        self.assertEqual(list(result["markets"]), ["1.132153978"])
+        self.assertEqual(len(result["cleared_orders_meta"]), 1)
+        self.assertEqual(result["logging_controls"], {"EXAMPLE": ["1.132153978"]})
+
+    def test_run_shard_filtered(self):
+        result = parallel.run_shard(setup, [])
+        self.assertEqual(result["markets"], {})
+
+    def test_run_shard_duplicate_market_filters(self):
+        # streams sharing a market filter are only run by their shard
+        result = parallel.run_shard(setup_duplicate_market_filters, [2000])
+        self.assertEqual(list(result["markets"]), ["1.132153978"])
+        self.assertEqual(len(result["cleared_orders_meta"]), 1)
+
+    def test_run_parallel_duplicate_market_filters(self):
+        result = parallel.run_parallel(setup_duplicate_market_filters, processes=2)
+        # orders from both shards
+        self.assertEqual(list(result.markets), ["1.132153978"])
+        self.assertEqual(len(result.orders), 2)
+        self.assertEqual(len(result.cleared_orders_meta), 2)
+        self.assertEqual(
+            result.logging_controls, {"EXAMPLE": ["1.132153978", "1.132153978"]}
+        )
+
+    def test_run_parallel(self):
+        result = parallel.run_parallel(setup, processes=2)
+        self.assertEqual(list(result.markets), ["1.132153978"])
+        self.assertEqual(result.logging_controls, {"EXAMPLE": ["1.132153978"]})
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from flumine.backtest import replay
+
+FILE_PATH = "tests/resources/BASIC-1.132153978"
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def test_file_hash(self):
+        self.assertEqual(replay.file_hash(FILE_PATH), replay.file_hash(FILE_PATH))
+        self.assertEqual(len(replay.file_hash(FILE_PATH)), 40)
+
+    def test_get_replay_path(self):
+        self.assertEqual(
+            replay.get_replay_path(FILE_PATH, self.cache_dir),
+            os.path.join(self.cache_dir, replay.file_hash(FILE_PATH) + ".replay"),
+        )
+
+    def test_read_raw_file(self):
+        updates = list(replay.read_raw_file(FILE_PATH))
+        self.assertEqual(len(updates), 480)
+        self.assertEqual(updates[0]["pt"], 1497351220318)
+
+    @mock.patch("flumine.backtest.replay.logger")
+    def test_read_raw_file_error(self, mock_logger):
+        file_path = os.path.join(self.cache_dir, "1.23")
+        with open(file_path, "w") as f:
+            f.write('{"pt": 1}\np\n{"pt": 2}\n')
+        self.assertEqual(list(replay.read_raw_file(file_path)), [{"pt": 1}, {"pt": 2}])
+        mock_logger.error.assert_called_with("value error: p\n")
+
+    @mock.patch("flumine.backtest.replay.logger")
+    def test_read_raw_file_invalid_update(self, mock_logger):
+        file_path = os.path.join(self.cache_dir, "1.23")
+        with open(file_path, "w") as f:
+            f.write('{"pt": 1}\n[1]\n{"op": "status"}\n{"pt": 2}\n')
+        self.assertEqual(list(replay.read_raw_file(file_path)), [{"pt": 1}, {"pt": 2}])
+        mock_logger.error.assert_called_with('invalid update: {"op": "status"}\n')
+
+    def test_compile_replay_file(self):
+        replay_path = replay.compile_replay_file(FILE_PATH, self.cache_dir)
+        self.assertTrue(os.path.exists(replay_path))
+        self.assertEqual(
+            list(replay.read_replay_file(replay_path)),
+            list(replay.read_raw_file(FILE_PATH)),
+        )
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(replay_path)])
+
+    def test_create_replay_file_incomplete(self):
+        replay_path = replay.get_replay_path(FILE_PATH, self.cache_dir)
+        updates = replay.create_replay_file(FILE_PATH, replay_path)
+        next(updates)
+        updates.close()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_read_updates(self):
+        self.assertEqual(
+            list(replay.read_updates(FILE_PATH)), list(replay.read_raw_file(FILE_PATH))
+        )
+
+    @mock.patch("flumine.backtest.replay.read_replay_file")
+    @mock.patch("flumine.backtest.replay.create_replay_file")
+    def test_read_updates_cache(self, mock_create_replay_file, mock_read_replay_file):
+        replay_path = replay.get_replay_path(FILE_PATH, self.cache_dir)
+        self.assertEqual(
+            replay.read_updates(FILE_PATH, self.cache_dir),
+            mock_create_replay_file.return_value,
+        )
+        mock_create_replay_file.assert_called_with(FILE_PATH, replay_path)
+        open(replay_path, "w").close()
+        self.assertEqual(
+            replay.read_updates(FILE_PATH, self.cache_dir),
+            mock_read_replay_file.return_value,
+        )
+        mock_read_replay_file.assert_called_with(replay_path)
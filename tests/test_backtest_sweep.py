@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+
+from flumine import FlumineBacktest, clients, BaseStrategy, config
+from flumine.backtest import sweep
+from flumine.exceptions import RunError
+
+
+class ExampleStrategy(BaseStrategy):
+    def check_market_book(self, market, market_book):
+        return True
+
+
+def setup(context):
+    framework = FlumineBacktest(client=clients.BacktestClient())
+    framework.add_strategy(
+        ExampleStrategy(market_filter={"markets": context["markets"]}, context=context)
+    )
+    return framework
+
+
+class FlumineSweepTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.frameworks = [
+            setup({"markets": ["tests/resources/BASIC-1.132153978"]}),
+            setup(
+                {
+                    "markets": [
+                        "tests/resources/SELF-1.181223995",
+                        "tests/resources/BASIC-1.132153978",
+                    ]
+                }
+            ),
+        ]
+        self.sweep = sweep.FlumineSweep(self.frameworks)
+
+    def tearDown(self) -> None:
+        config.simulated = False
+
+    def test_init(self):
+        self.assertEqual(self.sweep.frameworks, self.frameworks)
+        self.assertEqual(self.sweep.framework, self.frameworks[0])
+        self.assertEqual(self.sweep._stream_contexts, {})
+
+    def test_init_error(self):
+        with self.assertRaises(RunError):
+            sweep.FlumineSweep([])
+
+    def test_run_error(self):
+        self.frameworks[1].client = mock.Mock(EXCHANGE=69)
+        with self.assertRaises(RunError):
+            self.sweep.run()
+
+    def test_run_shared_client_error(self):
+        self.frameworks[1].client = self.frameworks[0].client
+        with self.assertRaises(RunError):
+            self.sweep.run()
+
+    def test__map_streams(self):
+        self.sweep._map_streams()
+        basic, self_ = self.frameworks[0].streams._streams
+        self.assertEqual(basic.market_filter, "tests/resources/BASIC-1.132153978")
+        self.assertEqual(self_.market_filter, "tests/resources/SELF-1.181223995")
+        self.assertEqual(
+            self.sweep._stream_contexts,
+            {
+                basic.stream_id: self.frameworks,
+                self_.stream_id: [self.frameworks[1]],
+            },
+        )
+        self.assertEqual(
+            list(self.frameworks[0].strategies)[0].stream_ids, [basic.stream_id]
+        )
+        self.assertEqual(
+            list(self.frameworks[1].strategies)[0].stream_ids,
+            [self_.stream_id, basic.stream_id],
+        )
+
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_end_flumine")
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_market_books")
+    def test_run(self, mock__process_market_books, mock__process_end_flumine):
+        self.sweep.run()
+        # BASIC (480 snaps) processed by both, SELF by one
+        processed = [
+            c[0][0].event[0].market_id
+            for c in mock__process_market_books.call_args_list
+        ]
+        self.assertEqual(processed.count("1.132153978"), 480 * 2)
+        self.assertGreater(processed.count("1.181223995"), 0)
+        self.assertEqual(mock__process_end_flumine.call_count, 2)
+
+
+class RunSweepTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        config.simulated = False
+
+    def test_run_sweep(self):
+        results = sweep.run_sweep(
+            setup,
+            [
+                {"markets": ["tests/resources/BASIC-1.132153978"]},
+                {"markets": ["tests/resources/BASIC-1.132153978"]},
+            ],
+        )
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual(list(result.markets), ["1.132153978"])
+            self.assertEqual(len(result.cleared_orders_meta), 1)
@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+from flumine.backtest.utils import PendingPackages
+
+
+class PendingPackagesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pending_packages = PendingPackages()
+        self.now = 1617121200000  # epoch ms
+
+    def _create_package(self, market_id, delay, elapsed_seconds):
+        return mock.Mock(
+            market_id=market_id,
+            _time_created=self.now,
+            simulated_delay=delay,
+            elapsed_seconds=elapsed_seconds,
+        )
+
+    def test_init(self):
+        self.assertEqual(len(self.pending_packages), 0)
+        self.assertFalse(self.pending_packages)
+        self.assertIsNone(self.pending_packages.next_due)
+
+    def test_append(self):
+        order_package = self._create_package("1.23", 0.2, 0)
+        self.pending_packages.append(order_package)
+        self.assertEqual(len(self.pending_packages), 1)
+        self.assertEqual(list(self.pending_packages), [order_package])
+        self.assertEqual(
+            self.pending_packages.next_due,
+            self.now + 200,
+        )
+
+    def test_pop_due(self):
+        order_package_one = self._create_package("1.23", 1.2, 0.5)
+        order_package_two = self._create_package("1.23", 0.2, 0.5)
+        order_package_three = self._create_package("1.23", 0.2, 0.5)
+        order_package_four = self._create_package("1.24", 0.2, 0.5)
+        for order_package in (
+            order_package_one,
+            order_package_two,
+            order_package_three,
+            order_package_four,
+        ):
+            self.pending_packages.append(order_package)
+        self.assertEqual(
+            list(self.pending_packages.pop_due("1.23")),
+            [order_package_two, order_package_three],
+        )
+        self.assertEqual(len(self.pending_packages), 2)
+        self.assertEqual(list(self.pending_packages.pop_due("1.25")), [])
+
+    def test_pop_due_empty(self):
+        order_package = self._create_package("1.23", 0.2, 0.5)
+        self.pending_packages.append(order_package)
+        self.assertEqual(list(self.pending_packages.pop_due("1.23")), [order_package])
+        self.assertEqual(self.pending_packages._markets, {})
+
+    def test_pop_all_due(self):
+        order_package_one = self._create_package("1.23", 0.2, 0.5)
+        order_package_two = self._create_package("1.24", 0.2, 0.5)
+        order_package_three = self._create_package("1.24", 1.2, 0.5)
+        self.pending_packages.append(order_package_one)
+        self.pending_packages.append(order_package_two)
+        self.pending_packages.append(order_package_three)
+        self.assertEqual(
+            self.pending_packages.pop_all_due(),
+            [order_package_one, order_package_two],
+        )
+        self.assertEqual(list(self.pending_packages), [order_package_three])
+
+    def test_clear(self):
+        self.pending_packages.append(self._create_package("1.23", 0.2, 0.5))
+        self.pending_packages.clear()
+        self.assertEqual(len(self.pending_packages), 0)
+        self.assertEqual(list(self.pending_packages), [])
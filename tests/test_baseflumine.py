@@ -2,6 +2,7 @@ import unittest
 from unittest import mock
 
 from flumine.baseflumine import BaseFlumine, FlumineException
+from flumine.events import events
 
 
 class BaseFlumineTest(unittest.TestCase):
@@ -17,14 +18,19 @@ class BaseFlumineTest(unittest.TestCase):
         self.assertEqual(self.base_flumine._logging_controls, [])
         self.assertEqual(len(self.base_flumine.trading_controls), 3)
         self.assertEqual(self.base_flumine._workers, [])
+        self.assertEqual(self.base_flumine.events_processed, 0)
+        self.assertEqual(self.base_flumine.market_books_conflated, 0)
+        self.assertTrue(self.base_flumine.latency.enabled)
+        self.assertFalse(self.base_flumine.profiler.enabled)
 
     @mock.patch("flumine.baseflumine.SimulatedMiddleware")
     @mock.patch("flumine.baseflumine.BaseFlumine.add_market_middleware")
     def test_init_backtest(self, mock_add_market_middleware, mock_SimulatedMiddleware):
         BaseFlumine.BACKTEST = True
         mock_client = mock.Mock(paper_trade=False)
-        BaseFlumine(mock_client)
+        framework = BaseFlumine(mock_client)
         mock_add_market_middleware.assert_called_with(mock_SimulatedMiddleware())
+        self.assertFalse(framework.latency.enabled)
         BaseFlumine.BACKTEST = False
 
     @mock.patch("flumine.baseflumine.SimulatedMiddleware")
@@ -36,6 +42,15 @@ class BaseFlumineTest(unittest.TestCase):
         BaseFlumine(mock_client)
         mock_add_market_middleware.assert_called_with(mock_SimulatedMiddleware())
 
+    @mock.patch("flumine.baseflumine.AsyncBetfairExecution")
+    @mock.patch("flumine.baseflumine.config")
+    def test_init_asyncio_execution(self, mock_config, mock_async_execution):
+        mock_config.execution_engine = "asyncio"
+        mock_config.max_execution_workers = 2
+        framework = BaseFlumine(self.mock_client)
+        mock_async_execution.assert_called_with(framework, 2)
+        self.assertEqual(framework.betfair_execution, mock_async_execution())
+
     def test_run(self):
         with self.assertRaises(NotImplementedError):
             self.base_flumine.run()
@@ -43,7 +58,7 @@ class BaseFlumineTest(unittest.TestCase):
     @mock.patch("flumine.baseflumine.events")
     @mock.patch("flumine.baseflumine.BaseFlumine.log_control")
     def test_add_strategy(self, mock_log_control, mock_events):
-        mock_strategy = mock.Mock()
+        mock_strategy = mock.Mock(stream_ids=[1])
         mock_client = mock.Mock()
         self.base_flumine.add_strategy(mock_strategy, mock_client)
         self.assertEqual(len(self.base_flumine.strategies), 1)
@@ -78,6 +93,7 @@ class BaseFlumineTest(unittest.TestCase):
         mock_control = mock.Mock()
         self.base_flumine.add_logging_control(mock_control)
         self.assertEqual(len(self.base_flumine._logging_controls), 1)
+        self.assertEqual(mock_control.profiler, self.base_flumine.profiler)
 
     def test_log_control(self):
         mock_control = mock.Mock()
@@ -97,6 +113,81 @@ class BaseFlumineTest(unittest.TestCase):
         mock_event.event = [mock_market_book]
         self.base_flumine._process_market_books(mock_event)
 
+    def test__process_market_books_latency(self):
+        mock_strategy = mock.Mock(stream_ids=[1])
+        mock_strategy.name = "test"
+        self.base_flumine.strategies(mock_strategy, self.mock_client)
+        mock_market = mock.Mock(closed=False, market_type="WIN")
+        self.base_flumine.markets.add_market("1.234", mock_market)
+        mock_market_book = mock.Mock(
+            market_id="1.234",
+            status="OPEN",
+            streaming_snap=False,
+            streaming_unique_id=1,
+        )
+        mock_event = mock.Mock(_time_created=1500, event=[mock_market_book])
+        mock_market_book.publish_time_epoch = 1000
+        self.base_flumine._process_market_books(mock_event)
+        histogram = self.base_flumine.latency.get("publish_to_event", None, "WIN")
+        self.assertEqual(histogram.count, 1)
+        self.assertEqual(histogram.max, 500000)
+        histogram = self.base_flumine.latency.get("strategy_processing", "test", "WIN")
+        self.assertEqual(histogram.count, 1)
+
+    def test__process_strategy_market_book(self):
+        mock_strategy = mock.Mock()
+        mock_strategy.name = "test"
+        mock_market, mock_market_book = mock.Mock(), mock.Mock()
+        self.base_flumine.profiler.enabled = True
+        self.base_flumine.profiler.sample_rate = 1
+        self.assertGreater(
+            self.base_flumine._process_strategy_market_book(
+                mock_strategy, mock_market, mock_market_book
+            ),
+            0,
+        )
+        mock_strategy.check_market.assert_called_with(mock_market, mock_market_book)
+        mock_strategy.process_market_book.assert_called_with(
+            mock_market, mock_market_book
+        )
+        self.assertEqual(
+            set(self.base_flumine.profiler.histograms),
+            {("test", "check_market"), ("test", "process_market_book")},
+        )
+
+    @mock.patch("flumine.baseflumine.logger")
+    @mock.patch("flumine.baseflumine.config")
+    def test__process_strategy_market_book_budget(self, mock_config, mock_logger):
+        mock_config.strategy_time_budget = 0
+        mock_strategy = mock.Mock()
+        mock_strategy.check_market.return_value = False
+        self.base_flumine._process_strategy_market_book(
+            mock_strategy, mock.Mock(), mock.Mock()
+        )
+        mock_strategy.process_market_book.assert_not_called()
+        mock_logger.warning.assert_called()
+
+    @mock.patch("flumine.baseflumine.logger")
+    @mock.patch("flumine.baseflumine.config")
+    def test__process_strategy_market_book_budget_backtest(
+        self, mock_config, mock_logger
+    ):
+        mock_config.strategy_time_budget = 0
+        self.base_flumine.BACKTEST = True
+        self.base_flumine._process_strategy_market_book(
+            mock.Mock(), mock.Mock(), mock.Mock()
+        )
+        mock_logger.warning.assert_not_called()
+
+    @mock.patch("flumine.baseflumine.logger")
+    @mock.patch("flumine.baseflumine.config")
+    def test__process_strategy_market_book_no_budget(self, mock_config, mock_logger):
+        mock_config.strategy_time_budget = None
+        self.base_flumine._process_strategy_market_book(
+            mock.Mock(), mock.Mock(), mock.Mock()
+        )
+        mock_logger.warning.assert_not_called()
+
     def test_process_order_package(self):
         mock_order_package = mock.Mock()
         self.base_flumine.process_order_package(mock_order_package)
@@ -177,12 +268,62 @@ class BaseFlumineTest(unittest.TestCase):
         self.assertFalse(mock_market.update_market_catalogue)
 
     def test__process_current_orders(self):
-        mock_event = mock.Mock()
+        mock_event = mock.Mock(market_ids=None)
         mock_current_orders = mock.Mock()
         mock_current_orders.orders = []
         mock_event.event = [mock_current_orders]
         self.base_flumine._process_current_orders(mock_event)
 
+    @mock.patch("flumine.baseflumine.process_current_orders")
+    def test__process_current_orders_live(self, mock_process_current_orders):
+        mock_strategy = mock.Mock()
+        mock_strategy.stream_ids = [1]
+        self.base_flumine.strategies(mock_strategy, self.mock_client)
+        mock_market = mock.Mock(closed=False)
+        mock_market_two = mock.Mock(closed=False)
+        self.base_flumine.markets._markets = {
+            "1.1": mock_market,
+            "1.2": mock_market_two,
+        }
+        mock_event = mock.Mock(market_ids=None)
+        mock_current_orders = mock.Mock()
+        mock_current_orders.orders = [mock.Mock(market_id="1.1")]
+        mock_event.event = [mock_current_orders]
+        self.base_flumine._process_current_orders(mock_event)
+        # live OrderStream, all open markets processed
+        mock_strategy.process_orders.assert_has_calls(
+            [
+                mock.call(
+                    mock_market, mock_market.blotter.strategy_orders(mock_strategy)
+                ),
+                mock.call(
+                    mock_market_two,
+                    mock_market_two.blotter.strategy_orders(mock_strategy),
+                ),
+            ]
+        )
+        self.assertEqual(mock_strategy.process_orders.call_count, 2)
+
+    @mock.patch("flumine.baseflumine.process_current_orders")
+    def test__process_current_orders_simulated(self, mock_process_current_orders):
+        mock_strategy = mock.Mock()
+        mock_strategy.stream_ids = [1]
+        self.base_flumine.strategies(mock_strategy, self.mock_client)
+        mock_market = mock.Mock(closed=False)
+        mock_market_two = mock.Mock(closed=False)
+        self.base_flumine.markets._markets = {
+            "1.1": mock_market,
+            "1.2": mock_market_two,
+        }
+        mock_current_orders = mock.Mock()
+        mock_current_orders.orders = [mock.Mock(market_id="1.1")]
+        event = events.CurrentOrdersEvent([mock_current_orders], market_ids={"1.1"})
+        self.base_flumine._process_current_orders(event)
+        # market 1.2 has no order changes in the event
+        mock_strategy.process_orders.assert_called_once_with(
+            mock_market, mock_market.blotter.strategy_orders(mock_strategy)
+        )
+
     def test__process_custom_event(self):
         mock_market = mock.Mock()
         self.base_flumine.markets = [mock_market]
@@ -221,7 +362,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, self.mock_client)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         self.base_flumine.markets._markets = {"1.23": mock_market}
         mock_event = mock.Mock()
@@ -240,7 +381,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market_datum(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, self.mock_client)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         self.base_flumine.markets._markets = {"1.23": mock_market}
         mock_event = mock.Mock()
@@ -270,7 +411,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market_closed(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, self.mock_client)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         self.base_flumine.markets._markets = {
@@ -283,12 +424,16 @@ class BaseFlumineTest(unittest.TestCase):
                 market_id="1.01", closed=False, elapsed_seconds_closed=3601
             ),
         }
+        self.base_flumine.markets._closed_markets.extend(
+            [(0, "4.56"), (0, "7.89"), (0, "1.01")]
+        )
         mock_event = mock.Mock()
         mock_market_book = mock.Mock(market_id="1.23")
         mock_event.event = mock_market_book
         self.base_flumine._process_close_market(mock_event)
 
         self.assertEqual(len(self.base_flumine.markets._markets), 3)
+        self.assertNotIn("7.89", self.base_flumine.markets._markets)
 
     @mock.patch("flumine.baseflumine.events")
     @mock.patch("flumine.baseflumine.BaseFlumine._process_cleared_orders")
@@ -300,7 +445,7 @@ class BaseFlumineTest(unittest.TestCase):
         self.base_flumine.client.paper_trade = True
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, self.mock_client)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         self.base_flumine.markets._markets = {
@@ -368,9 +513,11 @@ class BaseFlumineTest(unittest.TestCase):
         self.base_flumine._logging_controls = [control]
         self.base_flumine.simulated_execution = mock.Mock()
         self.base_flumine.betfair_execution = mock.Mock()
+        self.mock_client.execution = self.base_flumine.betfair_execution
         with self.base_flumine:
             self.assertTrue(self.base_flumine._running)
             self.mock_client.login.assert_called_with()
+            self.base_flumine.betfair_execution.warm_up.assert_not_called()
             mock_log_control.assert_called_with(mock_events.ConfigEvent(None))
 
         self.assertFalse(self.base_flumine._running)
@@ -1,9 +1,20 @@
 import unittest
 from unittest import mock
 
-from flumine.markets.blotter import Blotter
-from flumine.order.order import OrderStatus
-from flumine.order.ordertype import MarketOnCloseOrder, LimitOrder, LimitOnCloseOrder
+from flumine.markets.blotter import Blotter, order_exposure
+from flumine.order.order import BetfairOrder, OrderStatus
+from flumine.order.ordertype import (
+    MarketOnCloseOrder,
+    LimitOrder,
+    LimitOnCloseOrder,
+    OrderTypes,
+)
+
+
+def create_mock_order(**kwargs):
+    mock_order = mock.Mock(lookup=(1, 2, 3), size_matched=0, size_remaining=0, **kwargs)
+    mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
+    return mock_order
 
 
 class BlotterTest(unittest.TestCase):
@@ -13,36 +24,94 @@ class BlotterTest(unittest.TestCase):
     def test_init(self):
         self.assertEqual(self.blotter.market_id, "1.23")
         self.assertEqual(self.blotter._orders, {})
-        self.assertEqual(self.blotter._live_orders, [])
+        self.assertEqual(self.blotter._live_orders, {})
         self.assertEqual(self.blotter._trades, {})
         self.assertEqual(self.blotter._strategy_orders, {})
         self.assertEqual(self.blotter._strategy_selection_orders, {})
+        self.assertEqual(self.blotter._strategy_live_orders, {})
+        self.assertEqual(self.blotter._strategy_selection_live_orders, {})
+        self.assertEqual(self.blotter._bet_id_orders, {})
 
     def test_strategy_orders(self):
-        mock_order = mock.Mock(lookup=(1, 2, 3))
+        mock_order = create_mock_order()
         mock_order.trade.strategy = 69
         self.blotter["12345"] = mock_order
         self.assertEqual(self.blotter.strategy_orders(12), [])
         self.assertEqual(self.blotter.strategy_orders(69), [mock_order])
 
     def test_strategy_selection_orders(self):
-        mock_order = mock.Mock(lookup=(1, 2, 3))
+        mock_order = create_mock_order()
         mock_order.trade.strategy = 69
         self.blotter["12345"] = mock_order
         self.assertEqual(self.blotter.strategy_selection_orders(12, 2, 3), [])
         self.assertEqual(self.blotter.strategy_selection_orders(69, 2, 3), [mock_order])
 
+    def test_strategy_live_orders(self):
+        mock_order = create_mock_order()
+        mock_order.trade.strategy = 69
+        self.blotter["12345"] = mock_order
+        self.assertEqual(self.blotter.strategy_live_orders(12), [])
+        self.assertEqual(self.blotter.strategy_live_orders(69), [mock_order])
+        self.assertEqual(
+            self.blotter.strategy_selection_live_orders(69, 2, 3), [mock_order]
+        )
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(self.blotter.strategy_live_orders(69), [])
+        self.assertEqual(self.blotter.strategy_selection_live_orders(69, 2, 3), [])
+        self.assertEqual(self.blotter.strategy_orders(69), [mock_order])
+
     def test_live_orders(self):
         self.assertEqual(list(self.blotter.live_orders), [])
-        mock_order = mock.Mock(complete=False)
-        self.blotter._live_orders = [mock_order]
-        self.assertEqual(list(self.blotter.live_orders), [mock_order])
+        mock_order = create_mock_order()
+        mock_order_two = create_mock_order()
+        self.blotter["1"] = mock_order
+        self.blotter["2"] = mock_order_two
+        self.assertEqual(list(self.blotter.live_orders), [mock_order, mock_order_two])
+        # complete whilst iterating
+        for order in self.blotter.live_orders:
+            self.blotter.complete_order(order)
+        self.assertEqual(list(self.blotter.live_orders), [])
+
+    def test_live_orders_snapshot(self):
+        mock_order = create_mock_order()
+        self.blotter["1"] = mock_order
+        snapshot = self.blotter._live_orders_snapshot = (mock_order,)
+        list(self.blotter.live_orders)
+        self.assertIs(self.blotter._live_orders_snapshot, snapshot)
+        self.blotter.complete_order(mock_order)
+        self.assertIsNone(self.blotter._live_orders_snapshot)
+
+    def test_live_orders_list(self):
+        mock_order = create_mock_order()
+        self.blotter["1"] = mock_order
+        self.assertEqual(self.blotter.live_orders_list(), [mock_order])
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(self.blotter.live_orders_list(), [])
 
     def test_has_live_orders(self):
         self.assertFalse(self.blotter.has_live_orders)
-        self.blotter._live_orders = [mock.Mock()]
+        self.blotter["1"] = create_mock_order()
         self.assertTrue(self.blotter.has_live_orders)
 
+    def test_get_order_from_bet_id(self):
+        mock_order = create_mock_order(bet_id="123")
+        mock_order_two = create_mock_order(bet_id=None)
+        self.blotter["1"] = mock_order
+        self.blotter["2"] = mock_order_two
+        self.assertEqual(self.blotter.get_order_from_bet_id("123"), mock_order)
+        self.assertIsNone(self.blotter.get_order_from_bet_id("456"))
+        mock_order_two.bet_id = "456"  # placed
+        self.assertEqual(self.blotter.get_order_from_bet_id("456"), mock_order_two)
+        self.assertEqual(self.blotter._unindexed_orders, {})
+
+    def test_get_order_from_bet_id_completed(self):
+        mock_order = create_mock_order(bet_id=None)
+        self.blotter["1"] = mock_order
+        mock_order.bet_id = "123"
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(self.blotter._unindexed_orders, {})
+        self.assertEqual(self.blotter.get_order_from_bet_id("123"), mock_order)
+
     def test_process_closed_market(self):
         mock_market_book = mock.Mock(number_of_winners=1)
         mock_runner = mock.Mock(selection_id=123, handicap=0.0)
@@ -155,7 +224,7 @@ class BlotterTest(unittest.TestCase):
             },
         )
 
-    def test_get_exposures_value_error(self):
+    def test_get_exposures_completed(self):
         mock_strategy = mock.Mock()
         mock_trade = mock.Mock(strategy=mock_strategy)
         mock_order = mock.Mock(
@@ -165,12 +234,167 @@ class BlotterTest(unittest.TestCase):
             average_price_matched=5.6,
             size_matched=2.0,
             size_remaining=0.0,
-            order_type=mock.Mock(ORDER_TYPE="INVALID"),
+            order_type=LimitOrder(price=5.6, size=2.0),
+        )
+        mock_order_live = mock.Mock(
+            trade=mock_trade,
+            lookup=(self.blotter.market_id, 123, 0),
+            side="LAY",
+            average_price_matched=0,
+            size_matched=0,
+            size_remaining=2.0,
+            order_type=LimitOrder(price=3.0, size=2.0),
         )
         self.blotter["12345"] = mock_order
+        self.blotter["23456"] = mock_order_live
+        expected = self.blotter.get_exposures(mock_strategy, mock_order.lookup)
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(
+            self.blotter._order_exposures[mock_order.id],
+            ((mock_strategy, 123, 0), (9.2, -2.0, 0.0, 0.0, 0.0, 0.0)),
+        )
+        self.assertEqual(
+            self.blotter.get_exposures(mock_strategy, mock_order.lookup), expected
+        )
+        self.assertEqual(
+            self.blotter.get_exposures(
+                mock_strategy, mock_order.lookup, exclusion=mock_order
+            )["matched_profit_if_win"],
+            0,
+        )
+
+    def test_get_exposures_running_totals(self):
+        mock_strategy = mock.Mock()
+        mock_trade = mock.Mock(
+            strategy=mock_strategy, market_id=self.blotter.market_id, selection_id=123
+        )
+        mock_trade.client.paper_trade = True
+        orders = [
+            BetfairOrder(mock_trade, "BACK", LimitOrder(3.0, 10.0)),
+            BetfairOrder(mock_trade, "LAY", LimitOrder(2.5, 8.0)),
+            BetfairOrder(mock_trade, "BACK", LimitOrder(4.0, 6.0)),
+        ]
+        for order in orders:
+            self.blotter[order.id] = order
+            order.placing()
+            order.executable()
+        # partial matches
+        orders[0].simulated._update_matched([1, 3.0, 4.0])
+        orders[1].simulated._update_matched([1, 2.4, 3.0])
+        # cancel remaining
+        orders[1].simulated.size_cancelled += orders[1].size_remaining
+        orders[1].execution_complete()
+        self.blotter.complete_order(orders[1])
+        # fully matched
+        orders[2].simulated._update_matched([2, 4.2, 6.0])
+        orders[2].execution_complete()
+        self.blotter.complete_order(orders[2])
+        orders[0].simulated._update_matched([3, 3.1, 2.5])
+
+        lookup = orders[0].lookup
+        key = (mock_strategy, *lookup[1:])
+        expected = [sum(v) for v in zip(*(order_exposure(o) for o in orders))]
+        for value, expected_value in zip(self.blotter._exposures[key], expected):
+            self.assertAlmostEqual(value, expected_value)
+        # brute force recomputation from orders in their current state
+        blotter = Blotter(self.blotter.market_id)
+        for order in orders[1:]:
+            blotter[order.id] = order
+        self.assertEqual(
+            self.blotter.get_exposures(mock_strategy, lookup, exclusion=orders[0]),
+            blotter.get_exposures(mock_strategy, lookup),
+        )
+        blotter[orders[0].id] = orders[0]
+        self.assertEqual(
+            self.blotter.get_exposures(mock_strategy, lookup),
+            blotter.get_exposures(mock_strategy, lookup),
+        )
+
+    def test_selection_profits(self):
+        mock_strategy, mock_strategy_two = mock.Mock(), mock.Mock()
+        for i, (strategy, selection_id, side) in enumerate(
+            [
+                (mock_strategy, 1, "BACK"),
+                (mock_strategy_two, 1, "BACK"),
+                (mock_strategy, 2, "LAY"),
+            ]
+        ):
+            mock_order = mock.Mock(
+                lookup=(self.blotter.market_id, selection_id, 0),
+                side=side,
+                average_price_matched=3.0,
+                size_matched=10.0,
+                size_remaining=0,
+                order_type=LimitOrder(price=3.0, size=10.0),
+            )
+            mock_order.trade.strategy = strategy
+            self.blotter[str(i)] = mock_order
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(
+            self.blotter.selection_profits(),
+            {(1, 0): (40.0, -20.0), (2, 0): (-20.0, 10.0)},
+        )
+        # 1 wins: 40 + 10, 2 wins: -20 - 20, other: -20 + 10
+        self.assertEqual(self.blotter.market_exposure(), 40)
+        self.assertEqual(self.blotter.market_exposure(order=mock_order), 60)
 
+    def test_selection_profits_exclusion(self):
+        mock_strategy = mock.Mock()
+        mock_order = mock.Mock(
+            lookup=(self.blotter.market_id, 1, 0),
+            side="LAY",
+            average_price_matched=3.0,
+            size_matched=2.0,
+            size_remaining=8.0,
+            order_type=LimitOrder(price=3.0, size=10.0),
+        )
+        mock_order.trade.strategy = mock_strategy
+        self.blotter["1"] = mock_order
+        self.assertEqual(self.blotter.selection_profits(), {(1, 0): (-20.0, 2.0)})
+        self.assertEqual(
+            self.blotter.selection_profits(exclusion=mock_order), {(1, 0): (0, 0)}
+        )
+        # replace remaining at 2.0
+        self.assertEqual(
+            self.blotter.market_exposure(
+                order=mock_order, exclusion=mock_order, price=2.0
+            ),
+            12,
+        )
+        mock_order.size_matched, mock_order.size_remaining = 10.0, 0
+        self.blotter.update_order_exposure(mock_order)
+        self.assertEqual(self.blotter.selection_profits(), {(1, 0): (-20.0, 10.0)})
+
+    def test_hedge(self):
+        mock_strategy = mock.Mock()
+        mock_order = mock.Mock(
+            lookup=(self.blotter.market_id, 123, 0),
+            side="BACK",
+            average_price_matched=3.0,
+            size_matched=10.0,
+            size_remaining=0,
+            order_type=LimitOrder(price=3.0, size=10.0),
+        )
+        mock_order.trade.strategy = mock_strategy
+        self.blotter["1"] = mock_order
+        self.assertEqual(
+            self.blotter.hedge(mock_strategy, mock_order.lookup, 2.0), ("LAY", 15)
+        )
+
+    def test_get_exposures_value_error(self):
+        mock_strategy = mock.Mock()
+        mock_trade = mock.Mock(strategy=mock_strategy)
+        mock_order = mock.Mock(
+            trade=mock_trade,
+            lookup=(self.blotter.market_id, 123, 0),
+            side="BACK",
+            average_price_matched=5.6,
+            size_matched=2.0,
+            size_remaining=0.0,
+            order_type=mock.Mock(ORDER_TYPE="INVALID"),
+        )
         with self.assertRaises(ValueError) as e:
-            self.blotter.get_exposures(mock_strategy, mock_order.lookup)
+            self.blotter["12345"] = mock_order
 
         self.assertEqual("Unexpected order type: INVALID", e.exception.args[0])
 
@@ -384,8 +608,22 @@ class BlotterTest(unittest.TestCase):
         )
 
     def test_complete_order(self):
-        self.blotter._live_orders = ["test"]
-        self.blotter.complete_order("test")
+        mock_order = create_mock_order()
+        self.blotter["123"] = mock_order
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(self.blotter._live_orders, {})
+        self.assertFalse(self.blotter.has_live_orders)
+
+    def test_on_live_orders(self):
+        mock_on_live_orders = mock.Mock()
+        self.blotter.on_live_orders = mock_on_live_orders
+        mock_order = create_mock_order()
+        self.blotter["123"] = mock_order
+        mock_on_live_orders.assert_called_once_with(self.blotter.market_id, True)
+        self.blotter.complete_order(mock_order)
+        mock_on_live_orders.assert_called_with(self.blotter.market_id, False)
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(mock_on_live_orders.call_count, 2)
 
     def test_has_trade(self):
         self.assertFalse(self.blotter.has_trade("123"))
@@ -398,10 +636,13 @@ class BlotterTest(unittest.TestCase):
         self.assertNotIn("321", self.blotter)
 
     def test__setitem(self):
-        mock_order = mock.Mock(lookup=(1, 2, 3))
+        mock_order = create_mock_order()
         self.blotter["123"] = mock_order
+        self.assertEqual(
+            mock_order.on_exposure_change, self.blotter.update_order_exposure
+        )
         self.assertEqual(self.blotter._orders, {"123": mock_order})
-        self.assertEqual(self.blotter._live_orders, [mock_order])
+        self.assertEqual(self.blotter._live_orders, {mock_order.id: mock_order})
         self.assertEqual(self.blotter._trades, {mock_order.trade.id: [mock_order]})
         self.assertEqual(
             self.blotter._strategy_orders, {mock_order.trade.strategy: [mock_order]}
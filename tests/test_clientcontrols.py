@@ -5,6 +5,7 @@ from unittest import mock
 from flumine.controls.clientcontrols import (
     BaseControl,
     MaxTransactionCount,
+    SharedMaxTransactionCount,
     OrderPackageType,
 )
 from flumine.exceptions import ControlError
@@ -127,3 +128,56 @@ class TestMaxTransactionCount(unittest.TestCase):
         self.assertEqual(
             self.trading_control.transaction_limit, self.mock_client.transaction_limit
         )
+
+
+class TestSharedMaxTransactionCount(unittest.TestCase):
+    def setUp(self):
+        self.mock_client = mock.Mock()
+        self.mock_client.transaction_limit = 1000
+        self.mock_flumine = mock.Mock()
+        self.counts = SharedMaxTransactionCount.create_counts()
+        self.trading_control = SharedMaxTransactionCount(
+            self.mock_flumine, self.mock_client, self.counts
+        )
+
+    def test_init(self):
+        self.assertEqual(self.trading_control.client, self.mock_client)
+        self.assertEqual(self.trading_control.NAME, "MAX_TRANSACTION_COUNT")
+        self.assertIs(self.trading_control._counts, self.counts)
+        self.assertEqual(self.trading_control.current_transaction_count_total, 0)
+        self.assertEqual(self.trading_control.transaction_count_total, 0)
+
+    def test_add_transaction(self):
+        other_control = SharedMaxTransactionCount(
+            self.mock_flumine, self.mock_client, self.counts
+        )
+        self.trading_control.add_transaction(12)
+        other_control.add_transaction(3, failed=True)
+        for control in (self.trading_control, other_control):
+            self.assertEqual(control.transaction_count, 12)
+            self.assertEqual(control.current_transaction_count, 12)
+            self.assertEqual(control.failed_transaction_count, 3)
+            self.assertEqual(control.current_failed_transaction_count, 3)
+            self.assertEqual(control.current_transaction_count_total, 15)
+
+    @mock.patch("flumine.controls.clientcontrols.clock")
+    def test__check_hour(self, mock_clock):
+        mock_clock.epoch_ms.return_value = 3600000 * 10 + 5
+        self.trading_control._check_hour()
+        self.assertEqual(self.counts[SharedMaxTransactionCount.HOUR], 10)
+        self.trading_control.add_transaction(5)
+        self.trading_control.add_transaction(2, failed=True)
+        self.trading_control._check_hour()
+        self.assertEqual(self.trading_control.current_transaction_count_total, 7)
+        mock_clock.epoch_ms.return_value = 3600000 * 11
+        self.trading_control._check_hour()
+        self.assertEqual(self.counts[SharedMaxTransactionCount.HOUR], 11)
+        self.assertEqual(self.trading_control.current_transaction_count_total, 0)
+        self.assertEqual(self.trading_control.transaction_count_total, 7)
+
+    def test_validate(self):
+        self.mock_client.transaction_limit = 5
+        self.trading_control._check_hour()
+        self.trading_control.add_transaction(10)
+        with self.assertRaises(ControlError):
+            self.trading_control._validate(mock.Mock(), OrderPackageType.PLACE)
@@ -0,0 +1,72 @@
+import time
+import datetime
+import threading
+import unittest
+
+from flumine import clock
+
+
+class ClockTest(unittest.TestCase):
+    def test_epoch_ms(self):
+        self.assertAlmostEqual(clock.Clock.epoch_ms(), time.time() * 1e3, delta=1000)
+        self.assertIsInstance(clock.Clock.epoch_ms(), int)
+
+    def test_utcnow(self):
+        self.assertAlmostEqual(
+            clock.Clock.utcnow().timestamp(),
+            datetime.datetime.utcnow().timestamp(),
+            delta=1,
+        )
+
+
+class BacktestClockTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = clock.BacktestClock(1617121200000)
+
+    def test_init(self):
+        self.assertEqual(self.clock.epoch_ms(), 1617121200000)
+        self.assertIsNone(self.clock._utcnow)
+        self.assertIsInstance(clock.BacktestClock().epoch_ms(), int)
+
+    def test_update(self):
+        now = datetime.datetime(2021, 3, 30, 16, 20, 1)
+        self.clock.update(1617121201000, now)
+        self.assertEqual(self.clock.epoch_ms(), 1617121201000)
+        self.assertIs(self.clock.utcnow(), now)
+
+    def test_utcnow(self):
+        self.assertEqual(self.clock.utcnow(), datetime.datetime(2021, 3, 30, 16, 20))
+
+
+class ClockContextTest(unittest.TestCase):
+    def test_default(self):
+        self.assertIs(clock.get_clock(), clock.WALL_CLOCK)
+
+    def test_set_reset_clock(self):
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        self.assertIs(clock.get_clock(), backtest_clock)
+        self.assertEqual(clock.epoch_ms(), 1000)
+        self.assertEqual(clock.utcnow(), datetime.datetime(1970, 1, 1, 0, 0, 1))
+        backtest_clock.update(3500)
+        self.assertEqual(clock.elapsed_seconds(1000), 2.5)
+        clock.reset_clock(token)
+        self.assertIs(clock.get_clock(), clock.WALL_CLOCK)
+
+    def test_thread_isolation(self):
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        try:
+            clocks = []
+            thread = threading.Thread(target=lambda: clocks.append(clock.get_clock()))
+            thread.start()
+            thread.join()
+            self.assertEqual(clocks, [clock.WALL_CLOCK])
+        finally:
+            clock.reset_clock(token)
+
+    def test_to_datetime(self):
+        self.assertEqual(
+            clock.to_datetime(1617121200123),
+            datetime.datetime(2021, 3, 30, 16, 20, 0, 123000),
+        )
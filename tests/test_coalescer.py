@@ -0,0 +1,117 @@
+import unittest
+from unittest import mock
+from unittest.mock import call
+
+from flumine.execution.coalescer import OrderCoalescer
+from flumine.order.orderpackage import OrderPackageType
+
+
+class OrderCoalescerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock_flumine = mock.Mock()
+        self.coalescer = OrderCoalescer(self.mock_flumine)
+        self.mock_market = mock.Mock(market_id="1.234")
+
+    def test_init(self):
+        self.assertEqual(self.coalescer.flumine, self.mock_flumine)
+        self.assertEqual(self.coalescer._pending, {})
+        self.assertEqual(self.coalescer.pending_count, 0)
+
+    def test_add(self):
+        mock_order_one, mock_order_two = mock.Mock(), mock.Mock()
+        self.coalescer.add(
+            self.mock_market, [(mock_order_one, None)], OrderPackageType.PLACE, False
+        )
+        self.coalescer.add(
+            self.mock_market, [(mock_order_two, 123)], OrderPackageType.PLACE, False
+        )
+        self.assertEqual(
+            self.coalescer._pending,
+            {
+                "1.234": (
+                    self.mock_market,
+                    {
+                        (OrderPackageType.PLACE, False): [
+                            (mock_order_one, None),
+                            (mock_order_two, 123),
+                        ]
+                    },
+                )
+            },
+        )
+        self.assertEqual(self.coalescer.pending_count, 2)
+        self.assertEqual(self.coalescer.transactions, 2)
+
+    @mock.patch("flumine.execution.coalescer.create_order_packages")
+    def test_flush(self, mock_create_order_packages):
+        mock_create_order_packages.return_value = [mock.Mock()]
+        mock_order = mock.Mock()
+        self.coalescer.add(
+            self.mock_market, [(mock_order, None)], OrderPackageType.CANCEL, False
+        )
+        self.coalescer.add(
+            self.mock_market, [(mock_order, None)], OrderPackageType.PLACE, True
+        )
+        self.coalescer.add(
+            self.mock_market, [(mock_order, None)], OrderPackageType.PLACE, False
+        )
+        self.assertEqual(self.coalescer.flush(), 3)
+        mock_create_order_packages.assert_has_calls(
+            [
+                call(
+                    self.mock_market,
+                    [(mock_order, None)],
+                    OrderPackageType.PLACE,
+                    False,
+                ),
+                call(
+                    self.mock_market,
+                    [(mock_order, None)],
+                    OrderPackageType.PLACE,
+                    True,
+                ),
+                call(
+                    self.mock_market,
+                    [(mock_order, None)],
+                    OrderPackageType.CANCEL,
+                    False,
+                ),
+            ]
+        )
+        self.assertEqual(self.mock_flumine.process_order_package.call_count, 3)
+        self.assertEqual(self.coalescer._pending, {})
+        self.assertEqual(self.coalescer.info["packages"], 3)
+
+    @mock.patch("flumine.execution.coalescer.create_order_packages")
+    def test_flush_market(self, mock_create_order_packages):
+        mock_create_order_packages.return_value = [mock.Mock()]
+        mock_market_two = mock.Mock(market_id="1.567")
+        self.coalescer.add(
+            self.mock_market, [(mock.Mock(), None)], OrderPackageType.PLACE, False
+        )
+        self.coalescer.add(
+            mock_market_two, [(mock.Mock(), None)], OrderPackageType.PLACE, False
+        )
+        self.assertEqual(self.coalescer.flush("1.567"), 1)
+        self.assertEqual(list(self.coalescer._pending), ["1.234"])
+        self.assertEqual(self.coalescer.flush("1.890"), 0)
+
+    def test_flush_empty(self):
+        self.assertEqual(self.coalescer.flush(), 0)
+        self.mock_flumine.process_order_package.assert_not_called()
+
+    def test_flush_merged_package(self):
+        mock_client = mock.Mock()
+        mock_client.execution.EXCHANGE = None
+        self.mock_market.flumine.client = mock_client
+        self.mock_market.market_book.bet_delay = 0
+        orders = [mock.Mock(status=None) for _ in range(3)]
+        for order in orders:
+            self.coalescer.add(
+                self.mock_market, [(order, 1)], OrderPackageType.PLACE, False
+            )
+        self.assertEqual(self.coalescer.flush(), 1)
+        package = self.mock_flumine.process_order_package.call_args[0][0]
+        self.assertEqual(package.orders, orders)
+        self.assertEqual(package.market_version, {"version": 1})
+        self.assertEqual(package.client, mock_client)
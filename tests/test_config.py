@@ -8,7 +8,8 @@ class ConfigTest(unittest.TestCase):
         self.assertFalse(config.simulated)
         self.assertIsInstance(config.hostname, str)
         self.assertIsInstance(config.process_id, int)
-        self.assertIsNone(config.current_time)
+        self.assertIsNone(config.replay_cache_dir)
+        self.assertFalse(config.line_index)
         self.assertFalse(config.raise_errors)
         self.assertEqual(config.max_execution_workers, 32)
         self.assertFalse(config.async_place_orders)
@@ -23,3 +23,20 @@ class BaseEventTest(unittest.TestCase):
     def test_str(self):
         self.base_event = events.MarketBookEvent(None)
         self.assertEqual(str(self.base_event), "<MARKET_BOOK [HANDLER]>")
+
+    def test_priority(self):
+        self.assertEqual(self.base_event.PRIORITY, events.EventPriority.NORMAL)
+        self.assertEqual(
+            events.CurrentOrdersEvent(None).PRIORITY, events.EventPriority.HIGH
+        )
+        self.assertEqual(
+            events.TerminationEvent(None).PRIORITY, events.EventPriority.HIGH
+        )
+
+    def test_custom_event_priority(self):
+        self.assertEqual(
+            events.CustomEvent(None, None).PRIORITY, events.EventPriority.NORMAL
+        )
+        custom_event = events.CustomEvent(None, None, priority=events.EventPriority.LOW)
+        self.assertEqual(custom_event.PRIORITY, events.EventPriority.LOW)
+        self.assertEqual(events.CustomEvent.PRIORITY, events.EventPriority.NORMAL)
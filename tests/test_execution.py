@@ -1,11 +1,12 @@
 import time
 import unittest
+import requests
 from unittest import mock
 from unittest.mock import call
 
 from betfairlightweight import BetfairError
 
-from flumine import config
+from flumine import config, clock
 from flumine.clients.clients import ExchangeType
 from flumine.exceptions import OrderExecutionError
 from flumine.execution.baseexecution import (
@@ -47,6 +48,24 @@ class BaseExecutionTest(unittest.TestCase):
             mock_execute_place, mock_order_package, mock__get_http_session()
         )
         mock__get_http_session.assert_called_with()
+        self.mock_flumine.latency.record.assert_called_with(
+            "execute_to_submit",
+            1,
+            market_type=self.mock_flumine.markets.markets.get().market_type,
+        )
+
+    def test__record_latency(self):
+        self.mock_flumine.markets.markets = {"1.234": mock.Mock(market_type="WIN")}
+        mock_order_package = mock.Mock(market_id="1.234")
+        self.execution._record_latency("test", 0.1, mock_order_package)
+        self.mock_flumine.latency.record.assert_called_with(
+            "test", 0.1, market_type="WIN"
+        )
+
+    def test__record_latency_disabled(self):
+        self.mock_flumine.latency.enabled = False
+        self.execution._record_latency("test", 0.1, mock.Mock())
+        self.mock_flumine.latency.record.assert_not_called()
 
     @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
     @mock.patch("flumine.execution.baseexecution.BaseExecution.execute_cancel")
@@ -145,6 +164,74 @@ class BaseExecutionTest(unittest.TestCase):
         self.assertEqual(self.execution._sessions, [mock_session, mock_session])
         self.assertGreater(mock_session.time_returned, 0)
 
+    def test__task_done(self):
+        self.execution._submitted = 2
+        self.execution._task_done(None)
+        self.assertEqual(self.execution.in_flight, 1)
+
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._ping_session")
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._create_new_session")
+    def test_warm_up(self, mock__create_new_session, mock__ping_session):
+        mock__create_new_session.side_effect = lambda: mock.Mock()
+        mock__ping_session.side_effect = [True, False]
+        self.execution.warm_up(self.mock_flumine.client)
+        self.assertEqual(mock__create_new_session.call_count, 2)
+        self.assertEqual(len(self.execution._sessions), 1)
+        self.assertEqual(self.execution._sessions_deleted, 1)
+
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._create_new_session")
+    def test_warm_up_disabled(self, mock__create_new_session):
+        with mock.patch.object(config, "execution_warm_sessions", 0):
+            self.execution.warm_up(self.mock_flumine.client)
+        mock__create_new_session.assert_not_called()
+
+    @mock.patch("flumine.execution.baseexecution.BaseExecution.warm_up")
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._ping_session")
+    def test_ping_sessions(self, mock__ping_session, mock_warm_up):
+        mock_client = mock.Mock()
+        mock_session_fresh = mock.Mock(time_returned=time.time())
+        mock_session_idle = mock.Mock(time_returned=time.time() - 150)
+        mock_session_stale = mock.Mock(time_returned=time.time() - 250)
+        self.execution._sessions = [
+            mock_session_fresh,
+            mock_session_idle,
+            mock_session_stale,
+        ]
+        self.execution.ping_sessions(mock_client)
+        mock__ping_session.assert_called_once_with(mock_client, mock_session_idle)
+        self.assertEqual(
+            self.execution._sessions, [mock_session_fresh, mock_session_idle]
+        )
+        mock_session_stale.close.assert_called_with()
+        mock_warm_up.assert_called_with(mock_client)
+
+    def test__ping_session(self):
+        with self.assertRaises(NotImplementedError):
+            self.execution._ping_session(None, None)
+
+    def test__record_session_request(self):
+        session = self.execution._create_new_session()
+        self.execution._record_session_request(session, 0.1)
+        self.execution._record_session_request(session, err=True)
+        self.assertEqual(session.requests, 2)
+        self.assertEqual(session.errors, 1)
+        self.assertEqual(session.elapsed_time, 0.1)
+        self.assertEqual(self.execution._request_latency.count, 1)
+
+    def test_info(self):
+        session = self.execution._create_new_session()
+        self.execution._record_session_request(session, 0.1)
+        self.execution._record_session_request(session, err=True)
+        self.execution._return_http_session(session)
+        info = self.execution.info
+        self.assertEqual(info["requests"], 2)
+        self.assertEqual(info["errors"], 1)
+        self.assertEqual(info["error_rate"], 0.5)
+        self.assertEqual(info["latency"]["count"], 1)
+        self.assertEqual(info["sessions_created"], 1)
+        self.assertEqual(info["idle_sessions"][0]["requests"], 2)
+        self.assertEqual(info["idle_sessions"][0]["mean_latency"], 0.1)
+
     def test__return_http_session_returned(self):
         self.execution._sessions = [1, 2]
         mock_session = mock.Mock()
@@ -745,13 +832,28 @@ class BetfairExecutionTest(unittest.TestCase):
             mock_order_package.client.betting_client.betting.replace_orders(),
         )
 
+    def test__ping_session(self):
+        mock_client = mock.Mock()
+        mock_session = mock.Mock()
+        self.assertTrue(self.execution._ping_session(mock_client, mock_session))
+        betting = mock_client.betting_client.betting
+        mock_session.head.assert_called_with(
+            betting.url, timeout=(betting.connect_timeout, betting.read_timeout)
+        )
+
+    def test__ping_session_error(self):
+        mock_session = mock.Mock()
+        mock_session.head.side_effect = requests.ConnectionError()
+        self.assertFalse(self.execution._ping_session(mock.Mock(), mock_session))
+
     @mock.patch(
         "flumine.execution.betfairexecution.BetfairExecution._return_http_session"
     )
     def test__execution_helper(self, mock__return_http_session):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
-        mock_session = mock.Mock()
+        mock_trading_function.return_value.elapsed_time = 0.1
+        mock_session = mock.Mock(requests=0, errors=0, elapsed_time=0)
         mock_order_package = mock.Mock(elapsed_seconds=0.001)
         mock_order_package.info = {}
         self.execution._execution_helper(
@@ -759,6 +861,14 @@ class BetfairExecutionTest(unittest.TestCase):
         )
         mock_trading_function.assert_called_with(mock_order_package, mock_session)
         mock__return_http_session.assert_called_with(mock_session)
+        self.assertEqual(mock_session.requests, 1)
+        self.assertEqual(mock_session.elapsed_time, 0.1)
+        self.assertEqual(self.execution.info["requests"], 1)
+        self.execution.flumine.latency.record.assert_called_with(
+            "http_round_trip",
+            mock_trading_function().elapsed_time,
+            market_type=self.execution.flumine.markets.markets.get().market_type,
+        )
 
     @mock.patch(
         "flumine.execution.betfairexecution.BetfairExecution._return_http_session"
@@ -766,7 +876,8 @@ class BetfairExecutionTest(unittest.TestCase):
     def test__execution_helper_warning(self, mock__return_http_session):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
-        mock_session = mock.Mock()
+        mock_trading_function.return_value.elapsed_time = 0.1
+        mock_session = mock.Mock(requests=0, errors=0, elapsed_time=0)
         mock_order_package = mock.Mock(elapsed_seconds=0.2, retry_count=0)
         mock_order_package.info = {}
         self.execution._execution_helper(
@@ -781,7 +892,7 @@ class BetfairExecutionTest(unittest.TestCase):
     def test__execution_helper_empty(self, mock__return_http_session):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
-        mock_session = mock.Mock()
+        mock_session = mock.Mock(requests=0, errors=0, elapsed_time=0)
         mock_order_package = mock.Mock(orders=[], elapsed_seconds=0.001)
         mock_order_package.info = {}
         self.execution._execution_helper(
@@ -798,7 +909,7 @@ class BetfairExecutionTest(unittest.TestCase):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
         mock_trading_function.side_effect = BetfairError()
-        mock_session = mock.Mock()
+        mock_session = mock.Mock(requests=0, errors=0, elapsed_time=0)
         mock_order_package = mock.Mock(elapsed_seconds=0.001)
         mock_order_package.info = {}
         mock_order_package.retry.return_value = True
@@ -810,6 +921,8 @@ class BetfairExecutionTest(unittest.TestCase):
         mock_trading_function.assert_called_with(mock_order_package, mock_session)
         mock__return_http_session.assert_called_with(mock_session, err=True)
         mock_handler.assert_called_with(mock_order_package)
+        self.assertEqual(mock_session.errors, 1)
+        self.assertEqual(self.execution.info["error_rate"], 1)
 
     @mock.patch("flumine.execution.betfairexecution.BetfairExecution.handler")
     @mock.patch(
@@ -821,7 +934,7 @@ class BetfairExecutionTest(unittest.TestCase):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
         mock_trading_function.side_effect = BetfairError()
-        mock_session = mock.Mock()
+        mock_session = mock.Mock(requests=0, errors=0, elapsed_time=0)
         mock_order_package = mock.Mock(elapsed_seconds=0.001)
         mock_order_package.info = {}
         mock_order_package.retry.return_value = False
@@ -841,7 +954,7 @@ class BetfairExecutionTest(unittest.TestCase):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
         mock_trading_function.side_effect = ValueError()
-        mock_session = mock.Mock()
+        mock_session = mock.Mock(requests=0, errors=0, elapsed_time=0)
         mock_order_package = mock.Mock(elapsed_seconds=0.001)
         mock_order_package.info = {}
         mock_order_package.retry.return_value = True
@@ -868,13 +981,47 @@ class SimulatedExecutionTest(unittest.TestCase):
     def test_handler_paper_trade(self, mock_execute_place):
         mock_thread_pool = mock.Mock()
         self.execution._thread_pool = mock_thread_pool
-        mock_order_package = mock.Mock()
+        mock_order_package = mock.Mock(
+            market_id="1.23",
+            _time_created=clock.epoch_ms(),
+            simulated_delay=0.01,
+            elapsed_seconds=0.02,
+        )
         mock_order_package.client.paper_trade = True
         mock_order_package.package_type = OrderPackageType.PLACE
         self.execution.handler(mock_order_package)
+        for _ in range(100):  # wait for scheduler
+            if mock_thread_pool.submit.called:
+                break
+            time.sleep(0.01)
+        self.execution.shutdown()
+        self.execution._scheduler.join()
         mock_thread_pool.submit.assert_called_with(
             mock_execute_place, mock_order_package, None
         )
+        self.assertEqual(len(self.execution._pending_packages), 0)
+
+    @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution.execute_place")
+    def test_handler_paper_trade_pending(self, mock_execute_place):
+        mock_thread_pool = mock.Mock()
+        self.execution._thread_pool = mock_thread_pool
+        mock_order_package = mock.Mock(
+            market_id="1.23",
+            _time_created=clock.epoch_ms(),
+            simulated_delay=10,
+            elapsed_seconds=0,
+        )
+        mock_order_package.client.paper_trade = True
+        mock_order_package.package_type = OrderPackageType.PLACE
+        self.execution.handler(mock_order_package)
+        self.execution.shutdown()
+        self.execution._scheduler.join()
+        mock_thread_pool.submit.assert_not_called()
+        self.assertEqual(list(self.execution._pending_packages), [mock_order_package])
+
+    def test_shutdown(self):
+        self.execution.shutdown()
+        self.assertFalse(self.execution._running)
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution.execute_place")
     def test_handler_place(self, mock_execute_place):
@@ -972,8 +1119,7 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_place_paper_trade(self, mock_time):
+    def test_execute_place_paper_trade(self):
         mock_order_package = mock.MagicMock(
             market_id="1.23", place_instructions=[], bet_delay=1
         )
@@ -981,7 +1127,6 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
         mock_order_package.client.paper_trade = True
         self.execution.execute_place(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.place_latency + 1)
         mock_order_package.client.add_transaction.assert_called_with(1)
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
@@ -1048,13 +1193,12 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1, failed=True)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_cancel_paper_trade(self, mock_time):
+    def test_execute_cancel_paper_trade(self):
         mock_order_package = mock.Mock(market_id="1.23", bet_delay=1)
         mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
         mock_order_package.client.paper_trade = True
         self.execution.execute_cancel(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.cancel_latency)
+        mock_order_package.client.add_transaction.assert_not_called()
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_update(self, mock__order_logger):
@@ -1105,15 +1249,14 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1, failed=True)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_update_paper_trade(self, mock_time):
+    def test_execute_update_paper_trade(self):
         mock_order_package = mock.Mock(
             market_id="1.23", update_instructions=[], bet_delay=1
         )
         mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
         mock_order_package.client.paper_trade = True
         self.execution.execute_update(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.update_latency)
+        mock_order_package.client.add_transaction.assert_not_called()
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_replace(self, mock__order_logger):
@@ -1196,8 +1339,7 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__enter__.assert_called_with()
         mock_order.trade.__exit__.assert_called_with(None, None, None)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_replace_paper_trade(self, mock_time):
+    def test_execute_replace_paper_trade(self):
         mock_order_package = mock.MagicMock(
             market_id="1.23", replace_instructions=[], bet_delay=1
         )
@@ -1205,4 +1347,4 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
         mock_order_package.client.paper_trade = True
         self.execution.execute_replace(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.replace_latency + 1)
+        mock_order_package.client.add_transaction.assert_called_with(1)
@@ -42,10 +42,13 @@ class FlumineTest(unittest.TestCase):
             events.ClearedOrdersEvent(None),
             events.CloseMarketEvent(None),
             events.CustomEvent(None, None),
-            events.TerminationEvent(None),
         ]
         for i in mock_events:
             self.flumine.handler_queue.put(i)
+        # termination is high priority so added once the others are processed
+        mock__process_custom_event.side_effect = (
+            lambda _: self.flumine.handler_queue.put(events.TerminationEvent(None))
+        )
         self.flumine.run()
 
         mock__process_market_books.assert_called_with(mock_events[1])
@@ -59,13 +62,94 @@ class FlumineTest(unittest.TestCase):
         mock__process_custom_event.assert_called_with(mock_events[7])
         mock__add_default_workers.assert_called()
 
+    def test__get_events(self):
+        mock_events = [events.MarketBookEvent(None), events.CustomEvent(None, None)]
+        for event in mock_events:
+            self.flumine.handler_queue.put(event)
+        self.assertEqual(self.flumine._get_events(), mock_events)
+        self.assertEqual(self.flumine.events_processed, 2)
+        self.assertTrue(self.flumine.handler_queue.empty())
+        self.assertEqual(self.flumine.latency.get("queue_wait").count, 2)
+
+    def test__get_events_conflate(self):
+        book_a, book_b = mock.Mock(market_id="1.1", streaming_unique_id=1), mock.Mock(
+            market_id="1.2", streaming_unique_id=1
+        )
+        book_a_2 = mock.Mock(market_id="1.1", streaming_unique_id=1)
+        mock_events = [
+            events.MarketBookEvent([book_a, book_b]),
+            events.CurrentOrdersEvent(None),
+            events.MarketBookEvent([book_a_2]),
+        ]
+        for event in mock_events:
+            self.flumine.handler_queue.put(event)
+        # current orders served first (high priority)
+        self.assertEqual(
+            self.flumine._get_events(),
+            [mock_events[1], mock_events[0], mock_events[2]],
+        )
+        self.assertEqual(mock_events[0].event, [book_b])
+        self.assertEqual(self.flumine.market_books_conflated, 1)
+
+    @mock.patch("flumine.flumine.config")
+    def test__get_events_conflate_disabled(self, mock_config):
+        mock_config.conflate_market_books = False
+        book, book_2 = mock.Mock(market_id="1.1", streaming_unique_id=1), mock.Mock(
+            market_id="1.1", streaming_unique_id=1
+        )
+        mock_events = [events.MarketBookEvent([book]), events.MarketBookEvent([book_2])]
+        for event in mock_events:
+            self.flumine.handler_queue.put(event)
+        self.assertEqual(self.flumine._get_events(), mock_events)
+        self.assertEqual(mock_events[0].event, [book])
+        self.assertEqual(self.flumine.market_books_conflated, 0)
+
+    def test__conflate_market_books(self):
+        book_a, book_b = mock.Mock(market_id="1.1", streaming_unique_id=1), mock.Mock(
+            market_id="1.2", streaming_unique_id=1
+        )
+        book_a_2, book_b_2 = mock.Mock(
+            market_id="1.1", streaming_unique_id=1
+        ), mock.Mock(market_id="1.2", streaming_unique_id=1)
+        book_a_3 = mock.Mock(market_id="1.1", streaming_unique_id=1)
+        mock_events = [
+            events.MarketBookEvent([book_a, book_b]),
+            events.CloseMarketEvent(None),
+            events.MarketBookEvent([book_a_2]),
+            events.RawDataEvent(None),
+            events.MarketBookEvent([book_b_2, book_a_3]),
+            events.CustomEvent(None, None),
+        ]
+        self.assertEqual(
+            self.flumine._conflate_market_books(mock_events),
+            [mock_events[1], mock_events[3], mock_events[4], mock_events[5]],
+        )
+        self.assertEqual(mock_events[4].event, [book_b_2, book_a_3])
+        self.assertEqual(self.flumine.market_books_conflated, 3)
+
+    def test__conflate_market_books_streams(self):
+        book_a = mock.Mock(market_id="1.1", streaming_unique_id=1)
+        book_a_2 = mock.Mock(market_id="1.1", streaming_unique_id=2)
+        book_a_3 = mock.Mock(market_id="1.1", streaming_unique_id=1)
+        mock_events = [
+            events.MarketBookEvent([book_a]),
+            events.MarketBookEvent([book_a_2]),
+            events.MarketBookEvent([book_a_3]),
+        ]
+        self.assertEqual(
+            self.flumine._conflate_market_books(mock_events),
+            [mock_events[1], mock_events[2]],
+        )
+        self.assertEqual(mock_events[1].event, [book_a_2])
+        self.assertEqual(self.flumine.market_books_conflated, 1)
+
     @mock.patch("flumine.worker.BackgroundWorker")
     @mock.patch("flumine.Flumine.add_worker")
     def test__add_default_workers(self, mock_add_worker, mock_worker):
         self.mock_trading.betting_client.session_timeout = 1200
         self.flumine.client.market_recording_mode = False
         self.flumine._add_default_workers()
-        self.assertEqual(len(mock_add_worker.call_args_list), 4)
+        self.assertEqual(len(mock_add_worker.call_args_list), 5)
         self.assertEqual(
             mock_worker.call_args_list,
             [
@@ -88,9 +172,30 @@ class FlumineTest(unittest.TestCase):
                     interval=60,
                     start_delay=10,
                 ),
+                mock.call(
+                    self.flumine,
+                    function=worker.poll_latency,
+                    interval=60,
+                    start_delay=60,
+                ),
             ],
         )
 
+    @mock.patch("flumine.flumine.worker.BackgroundWorker")
+    @mock.patch("flumine.flumine.Flumine.add_worker")
+    def test__add_default_workers_execution(self, mock_add_worker, mock_worker):
+        self.mock_trading.betting_client.session_timeout = 1200
+        self.flumine.client.market_recording_mode = True
+        self.flumine.client.execution = self.flumine.betfair_execution
+        self.flumine.latency.enabled = False
+        self.flumine._add_default_workers()
+        mock_worker.assert_called_with(
+            self.flumine,
+            function=worker.keep_alive_execution,
+            interval=50,
+            start_delay=0,
+        )
+
     def test_str(self):
         assert str(self.flumine) == "<Flumine>"
 
@@ -1,10 +1,11 @@
 import unittest
+import datetime
 from unittest import mock
 
 from flumine import FlumineBacktest
 from flumine.clients import ExchangeType
 from flumine.order.orderpackage import OrderPackageType
-from flumine import config
+from flumine import config, clock
 from flumine.exceptions import RunError
 from flumine.order.trade import TradeStatus
 from flumine.markets.blotter import Blotter
@@ -18,6 +19,8 @@ class FlumineBacktestTest(unittest.TestCase):
 
     def test_init(self):
         self.assertTrue(self.flumine.BACKTEST)
+        self.assertFalse(self.flumine.chronological)
+        self.assertIsInstance(self.flumine.clock, clock.BacktestClock)
 
     def test_run_error(self):
         mock_client = mock.Mock()
@@ -26,18 +29,18 @@ class FlumineBacktestTest(unittest.TestCase):
         with self.assertRaises(RunError):
             self.flumine.run()
 
-    @mock.patch("flumine.backtest.backtest.FlumineBacktest._unpatch_datetime")
+    @mock.patch("flumine.backtest.backtest.reset_clock")
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_end_flumine")
     @mock.patch("flumine.backtest.backtest.events")
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_market_books")
-    @mock.patch("flumine.backtest.backtest.FlumineBacktest._monkey_patch_datetime")
+    @mock.patch("flumine.backtest.backtest.set_clock")
     def test_run(
         self,
-        mock__monkey_patch_datetime,
+        mock_set_clock,
         mock__process_market_books,
         mock_events,
         mock__process_end_flumine,
-        mock__unpatch_datetime,
+        mock_reset_clock,
     ):
         mock_stream = mock.Mock(event_processing=False)
         mock_market_book = mock.Mock()
@@ -45,23 +48,23 @@ class FlumineBacktestTest(unittest.TestCase):
         mock_stream.create_generator.return_value = mock_gen
         self.flumine.streams._streams = [mock_stream]
         self.flumine.run()
-        mock__monkey_patch_datetime.assert_called_with()
+        mock_set_clock.assert_called_with(self.flumine.clock)
         mock__process_market_books.assert_called_with(mock_events.MarketBookEvent())
         mock__process_end_flumine.assert_called_with()
-        mock__unpatch_datetime.assert_called_with()
+        mock_reset_clock.assert_called_with(mock_set_clock())
 
-    @mock.patch("flumine.backtest.backtest.FlumineBacktest._unpatch_datetime")
+    @mock.patch("flumine.backtest.backtest.reset_clock")
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_end_flumine")
     @mock.patch("flumine.backtest.backtest.events")
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_market_books")
-    @mock.patch("flumine.backtest.backtest.FlumineBacktest._monkey_patch_datetime")
+    @mock.patch("flumine.backtest.backtest.set_clock")
     def test_run_event(
         self,
-        mock__monkey_patch_datetime,
+        mock_set_clock,
         mock__process_market_books,
         mock_events,
         mock__process_end_flumine,
-        mock__unpatch_datetime,
+        mock_reset_clock,
     ):
         mock_stream_one = mock.Mock(event_processing=True, event_id=123)
         mock_market_book_one = mock.Mock(publish_time_epoch=321)
@@ -75,10 +78,96 @@ class FlumineBacktestTest(unittest.TestCase):
 
         self.flumine.streams._streams = [mock_stream_one, mock_stream_two]
         self.flumine.run()
-        mock__monkey_patch_datetime.assert_called_with()
+        mock_set_clock.assert_called_with(self.flumine.clock)
         mock__process_market_books.assert_called_with(mock_events.MarketBookEvent())
         mock__process_end_flumine.assert_called_with()
-        mock__unpatch_datetime.assert_called_with()
+        mock_reset_clock.assert_called_with(mock_set_clock())
+
+    @mock.patch("flumine.backtest.backtest.reset_clock")
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_end_flumine")
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._merge_streams")
+    @mock.patch("flumine.backtest.backtest.set_clock")
+    def test_run_chronological(
+        self,
+        mock_set_clock,
+        mock__merge_streams,
+        mock__process_end_flumine,
+        mock_reset_clock,
+    ):
+        self.flumine.chronological = True
+        mock_stream_one = mock.Mock(event_processing=True, event_id=123)
+        mock_stream_two = mock.Mock(event_processing=False, event_id=456)
+        self.flumine.streams._streams = [mock_stream_one, mock_stream_two]
+        self.flumine.run()
+        mock__merge_streams.assert_called_once_with([mock_stream_one, mock_stream_two])
+
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_market_books")
+    def test_run_clears_handler_queue(self, mock__process_market_books):
+        mock_stream = mock.Mock(event_processing=False)
+        mock_stream.create_generator.return_value = mock.Mock(
+            return_value=[[mock.Mock()]]
+        )
+        self.flumine.streams._streams = [mock_stream]
+        mock__process_market_books.side_effect = (
+            lambda _: self.flumine.handler_queue.append(
+                mock.Mock(
+                    market_id="1.23",
+                    _time_created=clock.epoch_ms(),
+                    simulated_delay=0.2,
+                )
+            )
+        )
+        self.flumine.run()
+        self.assertEqual(len(self.flumine.handler_queue), 0)
+
+    def test__stream_market_books(self):
+        mock_stream_one = mock.Mock(event_processing=False)
+        mock_stream_one.create_generator.return_value = mock.Mock(
+            return_value=[[1], [2]]
+        )
+        mock_stream_two = mock.Mock(event_processing=False)
+        mock_stream_two.create_generator.return_value = mock.Mock(return_value=[[3]])
+        self.flumine.streams._streams = [mock_stream_one, mock_stream_two]
+        self.assertEqual(
+            [e if e is None else e.event for e in self.flumine._stream_market_books()],
+            [[1], [2], None, [3], None],
+        )
+
+    def test_event_streams(self):
+        mock_stream_one = mock.Mock(event_processing=True, event_id=123)
+        mock_stream_two = mock.Mock(event_processing=False, event_id=123)
+        mock_stream_three = mock.Mock(event_processing=True, event_id=123)
+        self.flumine.streams._streams = [
+            mock_stream_one,
+            mock_stream_two,
+            mock_stream_three,
+        ]
+        self.assertEqual(
+            self.flumine.event_streams,
+            {123: [mock_stream_one, mock_stream_three], None: [mock_stream_two]},
+        )
+
+    def test__merge_streams(self):
+        mock_streams = []
+        for stream_index, publish_times in enumerate(([1, 4, 5], [2, 4], [1, 3])):
+            mock_stream = mock.Mock()
+            mock_stream.create_generator.return_value = mock.Mock(
+                return_value=iter(
+                    [
+                        [mock.Mock(publish_time_epoch=pt, stream_index=stream_index)]
+                        for pt in publish_times
+                    ]
+                )
+            )
+            mock_streams.append(mock_stream)
+        processed = [
+            (e.event[0].publish_time_epoch, e.event[0].stream_index)
+            for e in self.flumine._merge_streams(mock_streams)
+        ]
+        # ties broken by stream order
+        self.assertEqual(
+            processed, [(1, 0), (1, 2), (2, 1), (3, 2), (4, 0), (4, 1), (5, 0)]
+        )
 
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_backtest_orders")
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._check_pending_packages")
@@ -87,9 +176,16 @@ class FlumineBacktestTest(unittest.TestCase):
         mock__check_pending_packages,
         mock__process_backtest_orders,
     ):
-        self.flumine.handler_queue.append(mock.Mock())
+        self.flumine.handler_queue.append(
+            mock.Mock(
+                market_id="1.23",
+                _time_created=clock.epoch_ms(),
+                simulated_delay=0.2,
+                elapsed_seconds=0,
+            )
+        )
         mock_event = mock.Mock()
-        mock_market_book = mock.Mock(market_id="1.23")
+        mock_market_book = mock.Mock(market_id="1.23", publish_time_epoch=123)
         mock_market_book.runners = []
         mock_market = mock.Mock(market_book=mock_market_book, context={})
         mock_market.blotter.live_orders = []
@@ -98,24 +194,35 @@ class FlumineBacktestTest(unittest.TestCase):
         self.flumine._process_market_books(mock_event)
         mock__check_pending_packages.assert_called_with("1.23")
         mock__process_backtest_orders.assert_called_with(mock_market)
+        self.assertEqual(self.flumine.clock.epoch_ms(), 123)
+        self.assertEqual(self.flumine.clock.utcnow(), mock_market_book.publish_time)
+        self.assertEqual(config.current_time, mock_market_book.publish_time)
 
     def test_process_order_package(self):
-        mock_order_package = mock.Mock()
+        mock_order_package = mock.Mock(
+            market_id="1.23",
+            _time_created=clock.epoch_ms(),
+            simulated_delay=0.2,
+        )
         self.flumine.process_order_package(mock_order_package)
-        self.assertEqual(self.flumine.handler_queue, [mock_order_package])
+        self.assertEqual(list(self.flumine.handler_queue), [mock_order_package])
 
     def test__process_backtest_orders(self):
         mock_market = mock.Mock(context={})
         mock_market.blotter = Blotter("1.23")
-        mock_order = mock.Mock(size_remaining=0)
+        mock_order = mock.Mock(size_remaining=0, size_matched=0, lookup=(1, 2, 3))
         mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
         mock_order.trade.status = TradeStatus.COMPLETE
-        mock_order_two = mock.Mock(size_remaining=1)
+        mock_order_two = mock.Mock(size_remaining=1, size_matched=0, lookup=(1, 2, 3))
         mock_order_two.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order_two.order_type.price = 2.0
         mock_order_two.trade.status = TradeStatus.COMPLETE
-        mock_market.blotter._live_orders = [mock_order, mock_order_two]
+        mock_market.blotter._live_orders = {
+            mock_order.id: mock_order,
+            mock_order_two.id: mock_order_two,
+        }
         self.flumine._process_backtest_orders(mock_market)
-        self.assertEqual(mock_market.blotter._live_orders, [])
+        self.assertEqual(mock_market.blotter._live_orders, {})
         mock_order.execution_complete.assert_called()
         mock_order_two.execution_complete.assert_not_called()
 
@@ -132,6 +239,7 @@ class FlumineBacktestTest(unittest.TestCase):
     def test__check_pending_packages_place(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=clock.epoch_ms(),
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=5,
@@ -139,13 +247,14 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_place_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=clock.epoch_ms(),
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=0.2,
@@ -153,13 +262,14 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_not_called()
 
     def test__check_pending_packages_place_diff_market_id(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=clock.epoch_ms(),
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=2,
@@ -167,49 +277,66 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.24")
         mock_client.execution.handler.assert_not_called()
 
     def test__check_pending_packages_cancel(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=3, client=mock_client, simulated_delay=0.2
+            _time_created=clock.epoch_ms(),
+            market_id="1.23",
+            elapsed_seconds=3,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_cancel_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=2, client=mock_client, simulated_delay=0.2
+            _time_created=clock.epoch_ms(),
+            market_id="1.23",
+            elapsed_seconds=2,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_update(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=3, client=mock_client, simulated_delay=0.2
+            _time_created=clock.epoch_ms(),
+            market_id="1.23",
+            elapsed_seconds=3,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_update_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=2, client=mock_client, simulated_delay=0.2
+            _time_created=clock.epoch_ms(),
+            market_id="1.23",
+            elapsed_seconds=2,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_replace(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=clock.epoch_ms(),
             market_id="1.23",
             package_type=OrderPackageType.REPLACE,
             elapsed_seconds=5,
@@ -217,13 +344,14 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_replace_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=clock.epoch_ms(),
             market_id="1.23",
             package_type=OrderPackageType.REPLACE,
             elapsed_seconds=2,
@@ -240,7 +368,7 @@ class FlumineBacktestTest(unittest.TestCase):
     def test__process_close_market_closed(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.flumine.strategies = [mock_strategy]
+        self.flumine.strategies(mock_strategy, mock.Mock())
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         mock_market.blotter.process_cleared_orders.return_value = []
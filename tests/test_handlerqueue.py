@@ -0,0 +1,88 @@
+import queue
+import threading
+import unittest
+from unittest import mock
+
+from flumine.events import events
+from flumine.events.handlerqueue import HandlerQueue
+
+
+class HandlerQueueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queue = HandlerQueue({"HIGH": 3, "NORMAL": 2, "LOW": 1})
+
+    def test_init(self):
+        self.assertEqual(
+            self.queue.weights,
+            {
+                events.EventPriority.HIGH: 3,
+                events.EventPriority.NORMAL: 2,
+                events.EventPriority.LOW: 1,
+            },
+        )
+        self.assertEqual(self.queue.qsize(), 0)
+        self.assertTrue(self.queue.empty())
+
+    @mock.patch("flumine.events.handlerqueue.config")
+    def test_init_config(self, mock_config):
+        mock_config.handler_queue_weights = {"HIGH": 5, "NORMAL": 0, "LOW": 1}
+        handler_queue = HandlerQueue()
+        self.assertEqual(handler_queue.weights[events.EventPriority.HIGH], 5)
+        self.assertEqual(handler_queue.weights[events.EventPriority.NORMAL], 1)
+
+    def test_put(self):
+        self.queue.put(events.MarketBookEvent(None))
+        self.queue.put_nowait(events.CurrentOrdersEvent(None))
+        self.assertEqual(self.queue.qsize(), 2)
+        self.assertFalse(self.queue.empty())
+        self.assertEqual(self.queue.lane_size(events.EventPriority.HIGH), 1)
+        self.assertEqual(self.queue.lane_size(events.EventPriority.NORMAL), 1)
+
+    def test_get_priority(self):
+        market_book = events.MarketBookEvent(None)
+        current_orders = events.CurrentOrdersEvent(None)
+        self.queue.put(market_book)
+        self.queue.put(current_orders)
+        self.assertIs(self.queue.get(), current_orders)
+        self.assertIs(self.queue.get(), market_book)
+        self.assertTrue(self.queue.empty())
+
+    def test_get_fifo(self):
+        market_books = [events.MarketBookEvent(i) for i in range(5)]
+        for event in market_books:
+            self.queue.put(event)
+        self.assertEqual([self.queue.get() for _ in range(5)], market_books)
+
+    def test_get_weighted(self):
+        for i in range(6):
+            self.queue.put(events.CurrentOrdersEvent(i))
+            self.queue.put(events.MarketBookEvent(i))
+            self.queue.put(
+                events.CustomEvent(i, None, priority=events.EventPriority.LOW)
+            )
+        served = [self.queue.get().PRIORITY.name[0] for _ in range(18)]
+        self.assertEqual("".join(served), "HHHNNLHHHNNLNNLLLL")
+
+    def test_get_weighted_no_starvation(self):
+        for i in range(100):
+            self.queue.put(events.CurrentOrdersEvent(i))
+        self.queue.put(
+            events.CustomEvent(None, None, priority=events.EventPriority.LOW)
+        )
+        served = [self.queue.get().PRIORITY for _ in range(10)]
+        self.assertIn(events.EventPriority.LOW, served)
+
+    def test_get_nowait_empty(self):
+        with self.assertRaises(queue.Empty):
+            self.queue.get_nowait()
+
+    def test_get_timeout(self):
+        with self.assertRaises(queue.Empty):
+            self.queue.get(timeout=0.01)
+
+    def test_get_blocks(self):
+        event = events.CurrentOrdersEvent(None)
+        threading.Timer(0.01, self.queue.put, args=(event,)).start()
+        self.assertIs(self.queue.get(), event)
+        threading.Timer(0.01, self.queue.put, args=(event,)).start()
+        self.assertIs(self.queue.get(timeout=5), event)
@@ -1,10 +1,14 @@
+import os
+import tempfile
 import unittest
+import threading
 
 from flumine import FlumineBacktest, clients, BaseStrategy, config
 from flumine.order.trade import Trade
 from flumine.order.order import OrderStatus
 from flumine.order.ordertype import LimitOrder, MarketOnCloseOrder
 from flumine.utils import get_price
+from flumine.backtest.sweep import run_sweep
 
 
 class IntegrationTest(unittest.TestCase):
@@ -270,6 +274,177 @@ class IntegrationTest(unittest.TestCase):
         self.assertEqual(len(limit_inplay_orders), 200)
         self.assertEqual(place_market._transaction_id, 2436)
 
+    def test_backtest_replay_cache(self):
+        class LimitOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                if not market_book.inplay and market.seconds_to_start < 100:
+                    return True
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    runner_context = self.get_runner_context(
+                        market.market_id, runner.selection_id
+                    )
+                    if runner.status == "ACTIVE" and runner_context.trade_count == 0:
+                        trade = Trade(
+                            market_book.market_id,
+                            runner.selection_id,
+                            runner.handicap,
+                            self,
+                        )
+                        order = trade.create_order(
+                            side="LAY",
+                            order_type=LimitOrder(
+                                get_price(runner.ex.available_to_lay, 0), 2.00
+                            ),
+                        )
+                        market.place_order(order)
+
+        def run():
+            client = clients.BacktestClient()
+            framework = FlumineBacktest(client=client)
+            strategy = LimitOrders(
+                market_filter={"markets": ["tests/resources/SELF-1.181223995"]},
+                max_order_exposure=1000,
+                max_selection_exposure=105,
+            )
+            framework.add_strategy(strategy)
+            framework.run()
+            return [
+                (o.selection_id, o.size_matched, o.simulated.profit)
+                for o in framework.markets.markets["1.181223995"].blotter
+            ]
+
+        expected = run()
+        self.assertEqual(len(expected), 10)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            config.replay_cache_dir = cache_dir
+            self.assertEqual(run(), expected)  # compile
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            self.assertEqual(run(), expected)  # replay
+
+    def test_backtest_sweep(self):
+        class LimitOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                if not market_book.inplay and market.seconds_to_start < 100:
+                    return True
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    runner_context = self.get_runner_context(
+                        market.market_id, runner.selection_id
+                    )
+                    if runner.status == "ACTIVE" and runner_context.trade_count == 0:
+                        trade = Trade(
+                            market_book.market_id,
+                            runner.selection_id,
+                            runner.handicap,
+                            self,
+                        )
+                        order = trade.create_order(
+                            side="LAY",
+                            order_type=LimitOrder(
+                                get_price(runner.ex.available_to_lay, 0),
+                                self.context["size"],
+                            ),
+                        )
+                        market.place_order(order)
+
+        def setup(context):
+            framework = FlumineBacktest(client=clients.BacktestClient())
+            strategy = LimitOrders(
+                market_filter={"markets": ["tests/resources/SELF-1.181223995"]},
+                max_order_exposure=1000,
+                max_selection_exposure=105,
+                context=context,
+            )
+            framework.add_strategy(strategy)
+            return framework
+
+        variants = [{"size": 2.00}, {"size": 10.00}, {"size": 50.00}]
+        expected = []
+        for variant in variants:
+            framework = setup(variant)
+            framework.run()
+            expected.append(
+                [
+                    (o.selection_id, o.status, o.size_matched, o.simulated.profit)
+                    for o in framework.markets.markets["1.181223995"].blotter
+                ]
+            )
+        # exposure controls reject some orders on the larger sizes
+        self.assertNotEqual(len(expected[0]), len(expected[2]))
+        results = run_sweep(setup, variants)
+        self.assertEqual(len(results), 3)
+        for result, orders in zip(results, expected):
+            self.assertEqual(
+                [
+                    (
+                        o["selection_id"],
+                        o["status"],
+                        o["info"]["size_matched"],
+                        o["simulated"]["profit"],
+                    )
+                    for o in result.markets["1.181223995"]
+                ],
+                [(s, st.value, m, p) for s, st, m, p in orders],
+            )
+
+    def test_backtest_threads(self):
+        # backtests do not share the clock so can run side by side
+        class LimitOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                if not market_book.inplay and market.seconds_to_start < 100:
+                    return True
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    runner_context = self.get_runner_context(
+                        market.market_id, runner.selection_id
+                    )
+                    if runner.status == "ACTIVE" and runner_context.trade_count == 0:
+                        trade = Trade(
+                            market_book.market_id,
+                            runner.selection_id,
+                            runner.handicap,
+                            self,
+                        )
+                        order = trade.create_order(
+                            side="LAY",
+                            order_type=LimitOrder(
+                                get_price(runner.ex.available_to_lay, 0), 2.00
+                            ),
+                        )
+                        market.place_order(order)
+
+        def run(results: list):
+            framework = FlumineBacktest(client=clients.BacktestClient())
+            framework.add_strategy(
+                LimitOrders(
+                    market_filter={"markets": ["tests/resources/SELF-1.181223995"]},
+                    max_order_exposure=1000,
+                    max_selection_exposure=105,
+                )
+            )
+            framework.run()
+            results.append(
+                [
+                    (o.selection_id, o.size_matched, o.simulated.profit)
+                    for o in framework.markets.markets["1.181223995"].blotter
+                ]
+            )
+
+        expected = []
+        run(expected)
+        results = []
+        threads = [threading.Thread(target=run, args=(results,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, expected * 2)
+
     def tearDown(self) -> None:
         config.simulated = False
         config.raise_errors = False
+        config.replay_cache_dir = None
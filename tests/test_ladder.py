@@ -0,0 +1,123 @@
+import math
+import unittest
+from unittest import mock
+from betfairlightweight.resources.bettingresources import MarketBook
+
+from flumine.markets import ladder
+from flumine.markets.market import Market
+
+
+def create_market_book() -> MarketBook:
+    return MarketBook(
+        marketId="1.234",
+        runners=[
+            {
+                "selectionId": 1,
+                "handicap": 0,
+                "status": "ACTIVE",
+                "lastPriceTraded": 2.0,
+                "totalMatched": 100,
+                "sp": {"nearPrice": 2.1, "farPrice": 1.9, "actualSP": "NaN"},
+                "ex": {
+                    "availableToBack": [
+                        {"price": 2.0, "size": 10},
+                        {"price": 1.99, "size": 20},
+                    ],
+                    "availableToLay": [{"price": 2.02, "size": 30}],
+                    "tradedVolume": [],
+                },
+            },
+            {
+                "selectionId": 2,
+                "handicap": 0,
+                "status": "ACTIVE",
+                "ex": {
+                    "availableToBack": [{"price": 3.0, "size": 5}],
+                    "availableToLay": [
+                        {"price": 3.1, "size": 5},
+                        {"price": 3.15, "size": 5},
+                        {"price": 3.2, "size": 10},
+                    ],
+                    "tradedVolume": [],
+                },
+            },
+            {"selectionId": 3, "handicap": 0, "status": "REMOVED"},
+        ],
+    )
+
+
+@unittest.skipIf(ladder.np is None, "numpy not installed")
+class LadderViewTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.market_book = create_market_book()
+        self.ladder = ladder.LadderView(self.market_book)
+
+    def assertArrayEqual(self, array, expected):
+        self.assertEqual(len(array), len(expected))
+        for value, expected_value in zip(array.tolist(), expected):
+            if expected_value is None:
+                self.assertTrue(math.isnan(value))
+            else:
+                self.assertAlmostEqual(value, expected_value)
+
+    def test_init(self):
+        self.assertIs(self.ladder.market_book, self.market_book)
+        self.assertEqual(self.ladder.selection_ids.tolist(), [1, 2, 3])
+        self.assertEqual(self.ladder.active.tolist(), [True, True, False])
+        self.assertEqual(self.ladder.depth, 3)
+        self.assertEqual(self.ladder.back_prices.shape, (3, 3))
+        self.assertArrayEqual(self.ladder.back_prices[0], [2.0, 1.99, None])
+        self.assertArrayEqual(self.ladder.lay_sizes[1], [5, 5, 10])
+        self.assertArrayEqual(self.ladder.last_price_traded, [2.0, None, None])
+        self.assertArrayEqual(self.ladder.total_matched, [100, None, None])
+        self.assertArrayEqual(self.ladder.sp_near, [2.1, None, None])
+        self.assertArrayEqual(self.ladder.sp_far, [1.9, None, None])
+        self.assertArrayEqual(self.ladder.sp_actual, [None, None, None])
+
+    def test_init_empty(self):
+        view = ladder.LadderView(MarketBook(marketId="1.234", runners=[]))
+        self.assertEqual(view.back_prices.shape, (0, 1))
+        self.assertEqual(view.back_overround, 0)
+
+    @mock.patch("flumine.markets.ladder.np", None)
+    def test_init_no_numpy(self):
+        with self.assertRaises(ImportError):
+            ladder.LadderView(self.market_book)
+
+    def test_index(self):
+        self.assertEqual(self.ladder.index(1), 0)
+        self.assertEqual(self.ladder.index(2, 0.0), 1)
+        self.assertEqual(self.ladder.index(3, None), 2)
+        self.assertIsNone(self.ladder.index(4))
+
+    def test_best(self):
+        self.assertArrayEqual(self.ladder.best_back, [2.0, 3.0, None])
+        self.assertArrayEqual(self.ladder.best_lay, [2.02, 3.1, None])
+        self.assertArrayEqual(self.ladder.best_back_size, [10, 5, None])
+        self.assertArrayEqual(self.ladder.best_lay_size, [30, 5, None])
+
+    def test_spread(self):
+        self.assertArrayEqual(self.ladder.spread, [0.02, 0.1, None])
+        self.assertArrayEqual(self.ladder.spread_ticks, [1, 2, None])
+
+    def test_overround(self):
+        self.assertAlmostEqual(self.ladder.back_overround, 1 / 2 + 1 / 3)
+        self.assertAlmostEqual(self.ladder.lay_overround, 1 / 2.02 + 1 / 3.1)
+
+    def test_weight_of_money(self):
+        self.assertArrayEqual(self.ladder.weight_of_money(), [0.5, 0.2, None])
+        self.assertArrayEqual(self.ladder.weight_of_money(1), [0.25, 0.5, None])
+
+
+@unittest.skipIf(ladder.np is None, "numpy not installed")
+class MarketLadderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.market = Market(mock.Mock(), "1.234", create_market_book())
+
+    def test_ladder(self):
+        view = self.market.ladder
+        self.assertIs(view.market_book, self.market.market_book)
+        self.assertIs(self.market.ladder, view)  # cached
+        self.market(create_market_book())
+        self.assertIsNot(self.market.ladder, view)
+        self.assertIs(self.market.ladder.market_book, self.market.market_book)
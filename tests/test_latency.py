@@ -0,0 +1,118 @@
+import unittest
+
+from flumine import latency
+
+
+class BucketTest(unittest.TestCase):
+    def test_bucket(self):
+        self.assertEqual(latency._bucket(0), 0)
+        self.assertEqual(latency._bucket(31), 31)
+        self.assertEqual(latency._bucket(32), 32)
+        self.assertEqual(latency._bucket(33), 32)
+        self.assertEqual(latency._bucket(34), 33)
+        self.assertEqual(latency._bucket(2**40), latency.BUCKETS - 1)
+
+    def test_bucket_value(self):
+        previous = -1
+        for value in range(100000):
+            bucket = latency._bucket(value)
+            self.assertLessEqual(value, latency._bucket_value(bucket))
+            self.assertGreaterEqual(bucket, previous)
+            previous = bucket
+        # ~6% precision
+        for value in (100, 1000, 12345, 10**6):
+            upper = latency._bucket_value(latency._bucket(value))
+            self.assertLess((upper - value) / value, 0.0625)
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.histogram = latency.LatencyHistogram()
+
+    def test_init(self):
+        self.assertEqual(len(self.histogram.counts), latency.BUCKETS)
+        self.assertEqual(self.histogram.count, 0)
+        self.assertIsNone(self.histogram.min)
+        self.assertIsNone(self.histogram.percentile(50))
+        self.assertIsNone(self.histogram.mean)
+
+    def test_record(self):
+        self.histogram.record(0.001)
+        self.histogram.record(0.003)
+        self.histogram.record(-1)
+        self.assertEqual(self.histogram.count, 3)
+        self.assertEqual(self.histogram.total, 4000)
+        self.assertEqual(self.histogram.min, 0)
+        self.assertEqual(self.histogram.max, 3000)
+
+    def test_percentile(self):
+        for i in range(1, 101):
+            self.histogram.record(i / 1e3)
+        self.assertAlmostEqual(self.histogram.percentile(50), 50, delta=50 * 0.0625)
+        self.assertAlmostEqual(self.histogram.percentile(99), 99, delta=99 * 0.0625)
+        self.assertEqual(self.histogram.percentile(100), 100)
+        self.assertEqual(self.histogram.percentile(0), 1.023)
+        self.assertAlmostEqual(self.histogram.mean, 50.5)
+
+    def test_reset(self):
+        self.histogram.record(1)
+        self.histogram.reset()
+        self.assertEqual(self.histogram.count, 0)
+        self.assertEqual(sum(self.histogram.counts), 0)
+        self.assertIsNone(self.histogram.max)
+
+    def test_info(self):
+        self.histogram.record(0.002)
+        self.assertEqual(
+            self.histogram.info,
+            {
+                "count": 1,
+                "min": 2,
+                "mean": 2,
+                "max": 2,
+                "p50": 2,
+                "p90": 2,
+                "p99": 2,
+                "p99.9": 2,
+            },
+        )
+
+
+class LatencyRecorderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.recorder = latency.LatencyRecorder()
+
+    def test_init(self):
+        self.assertTrue(self.recorder.enabled)
+        self.assertEqual(self.recorder.histograms, {})
+
+    def test_record(self):
+        self.recorder.record(latency.QUEUE_WAIT, 0.1)
+        self.recorder.record(latency.STRATEGY_PROCESSING, 0.1, "test", "WIN")
+        self.recorder.record(latency.STRATEGY_PROCESSING, 0.2, "test", "WIN")
+        self.assertEqual(self.recorder.get(latency.QUEUE_WAIT).count, 1)
+        self.assertEqual(
+            self.recorder.get(latency.STRATEGY_PROCESSING, "test", "WIN").count, 2
+        )
+        self.assertIsNone(self.recorder.get(latency.STRATEGY_PROCESSING))
+
+    def test_record_disabled(self):
+        self.recorder.enabled = False
+        self.recorder.record(latency.QUEUE_WAIT, 0.1)
+        self.assertEqual(self.recorder.histograms, {})
+
+    def test_snapshot(self):
+        self.recorder.record(latency.QUEUE_WAIT, 0.001)
+        self.recorder.record(latency.HTTP_ROUND_TRIP, 0.1, market_type="WIN")
+        snapshot = self.recorder.snapshot()
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot[0]["stage"], latency.QUEUE_WAIT)
+        self.assertIsNone(snapshot[0]["strategy"])
+        self.assertEqual(snapshot[1]["market_type"], "WIN")
+        self.assertEqual(snapshot[1]["max"], 100)
+        self.assertEqual(len(self.recorder.snapshot()), 2)
+
+    def test_snapshot_reset(self):
+        self.recorder.record(latency.QUEUE_WAIT, 0.001)
+        self.assertEqual(len(self.recorder.snapshot(reset=True)), 1)
+        self.assertEqual(self.recorder.snapshot(), [])
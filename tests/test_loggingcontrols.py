@@ -2,6 +2,7 @@ import unittest
 from unittest import mock
 from queue import Queue
 
+from flumine import clock
 from flumine.controls.loggingcontrols import LoggingControl, EventType
 
 
@@ -18,6 +19,32 @@ class TestLoggingControl(unittest.TestCase):
         self.logging_control.logging_queue.put(None)
         self.logging_control.run()
 
+    @mock.patch("flumine.controls.loggingcontrols.LoggingControl.process_event")
+    def test_start_clock(self, mock_process_event):
+        clocks = []
+        mock_process_event.side_effect = lambda event: clocks.append(clock.get_clock())
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        try:
+            self.logging_control.start()
+        finally:
+            clock.reset_clock(token)
+        self.logging_control.logging_queue.put(1)
+        self.logging_control.logging_queue.put(None)
+        self.logging_control.join()
+        self.assertEqual(clocks, [backtest_clock])
+
+    @mock.patch("flumine.controls.loggingcontrols.LoggingControl.process_event")
+    def test_run_profiler(self, mock_process_event):
+        mock_profiler = mock.Mock()
+        self.logging_control.profiler = mock_profiler
+        self.logging_control.logging_queue.put(1)
+        self.logging_control.logging_queue.put(None)
+        self.logging_control.run()
+        mock_profiler.call.assert_called_with(
+            "LOGGING_CONTROL", "process_event", mock_process_event, 1
+        )
+
     def test_run_error(self):
         self.logging_control.logging_queue.put(1)
         self.logging_control.logging_queue.put(None)
@@ -65,6 +92,13 @@ class TestLoggingControl(unittest.TestCase):
         self.logging_control.process_event(mock_event)
         _process_balance.assert_called_with(mock_event)
 
+    @mock.patch("flumine.controls.loggingcontrols.LoggingControl._process_latency")
+    def test_process_event_latency(self, _process_latency):
+        mock_event = mock.Mock()
+        mock_event.EVENT_TYPE = EventType.LATENCY
+        self.logging_control.process_event(mock_event)
+        _process_latency.assert_called_with(mock_event)
+
     @mock.patch(
         "flumine.controls.loggingcontrols.LoggingControl._process_cleared_orders"
     )
@@ -134,6 +168,9 @@ class TestLoggingControl(unittest.TestCase):
     def test_process_balance(self):
         self.logging_control._process_balance(None)
 
+    def test_process_latency(self):
+        self.logging_control._process_latency(None)
+
     def test_process_cleared_orders(self):
         self.logging_control._process_cleared_orders(None)
 
@@ -2,8 +2,10 @@ import unittest
 import datetime
 from unittest import mock
 
+from flumine import clock
 from flumine.markets.markets import Markets
 from flumine.markets.market import Market
+from flumine.order.ordertype import OrderTypes
 
 
 class MarketsTest(unittest.TestCase):
@@ -12,11 +14,21 @@ class MarketsTest(unittest.TestCase):
 
     def test_init(self):
         self.assertEqual(self.markets._markets, {})
+        self.assertEqual(self.markets._open_market_ids, {})
+        self.assertEqual(self.markets._live_order_market_ids, set())
+        self.assertEqual(self.markets._open_live_order_count, 0)
+        self.assertEqual(len(self.markets._closed_markets), 0)
 
     def test_add_market(self):
         mock_market = mock.Mock()
+        mock_market.blotter.has_live_orders = False
         self.markets.add_market("1.1", mock_market)
         self.assertEqual(self.markets._markets, {"1.1": mock_market})
+        self.assertEqual(self.markets.open_market_ids, ["1.1"])
+        self.assertEqual(
+            mock_market.blotter.on_live_orders, self.markets._update_live_orders
+        )
+        self.assertFalse(self.markets.live_orders)
 
     def test_add_market_reopen(self):
         mock_market = mock.Mock()
@@ -25,18 +37,78 @@ class MarketsTest(unittest.TestCase):
 
         self.assertEqual(self.markets._markets, {"1.1": mock_market})
         mock_market.open_market.assert_called_with()
+        self.assertEqual(self.markets.open_market_ids, ["1.1"])
 
-    def test_close_market(self):
+    @mock.patch("flumine.markets.markets.clock")
+    def test_close_market(self, mock_clock):
+        mock_clock.epoch_ms.return_value = 123
         mock_market = mock.Mock()
-        self.markets._markets = {"1.1": mock_market}
+        mock_market.blotter.has_live_orders = False
+        self.markets.add_market("1.1", mock_market)
         self.markets.close_market("1.1")
         mock_market.close_market.assert_called_with()
+        self.assertEqual(self.markets.open_market_ids, [])
+        self.assertEqual(list(self.markets._closed_markets), [(123, "1.1")])
 
     def test_remove_market(self):
         mock_market = mock.Mock()
-        self.markets._markets = {"1.1": mock_market}
+        mock_market.blotter.has_live_orders = True
+        self.markets.add_market("1.1", mock_market)
         self.markets.remove_market("1.1")
         self.assertEqual(self.markets._markets, {})
+        self.assertEqual(self.markets.open_market_ids, [])
+        self.assertEqual(self.markets._live_order_market_ids, set())
+        self.assertFalse(self.markets.live_orders)
+
+    def test_index_market(self):
+        mock_market = mock.Mock(
+            market_id="1.1", event_type_id=None, event_id=None, market_type=None
+        )
+        mock_market.blotter.has_live_orders = False
+        self.markets.add_market("1.1", mock_market)
+        self.assertEqual(self.markets._events, {})
+        self.assertEqual(self.markets._unindexed_market_ids, {"1.1"})
+        # definition / catalogue received
+        mock_market.event_type_id = "7"
+        mock_market.event_id = "123"
+        mock_market.market_type = "WIN"
+        self.markets.index_market(mock_market)
+        self.assertEqual(self.markets.event_markets("123"), [mock_market])
+        self.assertEqual(self.markets.event_type_markets("7"), [mock_market])
+        self.assertEqual(self.markets.market_type_markets("WIN"), [mock_market])
+        self.assertEqual(self.markets._unindexed_market_ids, set())
+        self.assertEqual(self.markets.event_markets("456"), [])
+
+    def test_index_market_remove(self):
+        mock_market = mock.Mock(
+            market_id="1.1", event_type_id="7", event_id="123", market_type="WIN"
+        )
+        mock_market.blotter.has_live_orders = False
+        self.markets.add_market("1.1", mock_market)
+        self.assertEqual(self.markets.event_markets("123"), [mock_market])
+        self.markets.remove_market("1.1")
+        self.assertEqual(self.markets._events, {})
+        self.assertEqual(self.markets._event_types, {})
+        self.assertEqual(self.markets._market_types, {})
+        self.assertEqual(self.markets._market_index_keys, {})
+
+    @mock.patch("flumine.markets.markets.clock")
+    def test_expired_markets(self, mock_clock):
+        mock_clock.elapsed_seconds.side_effect = lambda x: 4000 - x
+        mock_market = mock.Mock(closed=True, elapsed_seconds_closed=3700)
+        mock_market_reopened = mock.Mock(closed=False, elapsed_seconds_closed=None)
+        mock_market_recent = mock.Mock(closed=True, elapsed_seconds_closed=1000)
+        self.markets._markets = {
+            "1.1": mock_market,
+            "1.2": mock_market_reopened,
+            "1.3": mock_market_recent,
+        }
+        self.markets._closed_markets.extend(
+            [(100, "1.1"), (200, "1.2"), (250, "1.4"), (300, "1.3"), (3000, "1.3")]
+        )
+        self.assertEqual(self.markets.expired_markets(3600), [mock_market])
+        self.assertEqual(list(self.markets._closed_markets), [(3000, "1.3")])
+        self.assertEqual(self.markets.expired_markets(3600), [])
 
     def test_get_order(self):
         mock_market = mock.Mock()
@@ -48,14 +120,13 @@ class MarketsTest(unittest.TestCase):
         self.assertIsNone(self.markets.get_order("1.2", "test"))
 
     def test_get_order_from_bet_id(self):
-        mock_order = mock.Mock()
-        mock_order.bet_id = "321"
         mock_market = mock.Mock()
         mock_market.closed = False
-        mock_market.blotter.__iter__ = mock.Mock(return_value=iter([mock_order]))
         self.markets._markets = {"1.1": mock_market}
 
+        mock_order = mock_market.blotter.get_order_from_bet_id.return_value
         self.assertEqual(self.markets.get_order_from_bet_id("1.1", "321"), mock_order)
+        mock_market.blotter.get_order_from_bet_id.assert_called_with("321")
         self.assertIsNone(self.markets.get_order("1.2", "test"))
 
     def test_markets(self):
@@ -69,22 +140,45 @@ class MarketsTest(unittest.TestCase):
 
     def test_open_market_ids(self):
         self.assertEqual(self.markets.open_market_ids, [])
-        mock_market = mock.Mock()
-        mock_market.closed = False
-        mock_market_two = mock.Mock()
-        mock_market_two.closed = True
-        self.markets._markets = {"1.1": mock_market, "2.1": mock_market_two}
-        self.assertEqual(self.markets.open_market_ids, [mock_market.market_id])
+        self.markets.add_market("1.1", mock.Mock())
+        self.markets.add_market("2.1", mock.Mock())
+        self.markets.close_market("2.1")
+        open_market_ids = self.markets.open_market_ids
+        self.assertEqual(open_market_ids, ["1.1"])
+        self.assertIs(self.markets.open_market_ids, open_market_ids)
+        self.markets.add_market("2.1", mock.Mock())
+        self.assertEqual(self.markets.open_market_ids, ["1.1", "2.1"])
 
     def test_live_orders(self):
         self.assertFalse(self.markets.live_orders)
-        mock_market = mock.Mock()
-        mock_market.closed = False
-        mock_market.blotter.has_live_orders = True
-        self.markets._markets = {"1.234": mock_market}
+        market = Market(mock.Mock(), "1.234", mock.Mock())
+        self.markets.add_market("1.234", market)
+        self.assertFalse(self.markets.live_orders)
+        mock_order = mock.Mock(
+            id="123",
+            bet_id=None,
+            lookup=("1.234", 1, 0),
+            size_matched=0,
+            size_remaining=0,
+        )
+        mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        market.blotter["123"] = mock_order
         self.assertTrue(self.markets.live_orders)
-        mock_market.blotter.has_live_orders = False
+        self.markets.close_market("1.234")
         self.assertFalse(self.markets.live_orders)
+        self.markets.add_market("1.234", market)
+        self.assertTrue(self.markets.live_orders)
+        market.blotter.complete_order(mock_order)
+        self.assertFalse(self.markets.live_orders)
+
+    def test_live_order_markets(self):
+        self.assertEqual(self.markets.live_order_markets, [])
+        mock_market = mock.Mock()
+        mock_market.blotter.has_live_orders = True
+        self.markets.add_market("1.1", mock_market)
+        self.assertEqual(self.markets.live_order_markets, [mock_market])
+        self.markets.close_market("1.1")
+        self.assertEqual(self.markets.live_order_markets, [])
 
     def test_iter(self):
         self.assertEqual(len([i for i in self.markets]), 0)
@@ -178,14 +272,16 @@ class MarketTest(unittest.TestCase):
         mock_market_catalogue.event.id = 12
         self.market.market_catalogue = mock_market_catalogue
 
-        self.market.flumine.markets = []
+        self.market.flumine.markets = Markets()
         self.assertEqual(self.market.event, {})
 
-        m_one = mock.Mock(market_type=1, event_id=12)
-        m_two = mock.Mock(market_type=2, event_id=12)
-        m_three = mock.Mock(market_type=3, event_id=123)
-        m_four = mock.Mock(market_type=1, event_id=12)
-        self.market.flumine.markets = [m_one, m_two, m_three, m_four]
+        m_one = mock.Mock(market_id="1.1", market_type=1, event_id=12)
+        m_two = mock.Mock(market_id="1.2", market_type=2, event_id=12)
+        m_three = mock.Mock(market_id="1.3", market_type=3, event_id=123)
+        m_four = mock.Mock(market_id="1.4", market_type=1, event_id=12)
+        for m in (m_one, m_two, m_three, m_four):
+            m.blotter.has_live_orders = False
+            self.market.flumine.markets.add_market(m.market_id, m)
         self.assertEqual(self.market.event, {1: [m_one, m_four], 2: [m_two]})
 
     def test_event_type_id_mc(self):
@@ -257,9 +353,14 @@ class MarketTest(unittest.TestCase):
 
     def test_elapsed_seconds_closed(self):
         self.assertIsNone(self.market.elapsed_seconds_closed)
-        self.market.closed = True
-        self.market.date_time_closed = datetime.datetime.utcnow()
-        self.assertGreaterEqual(self.market.elapsed_seconds_closed, 0)
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        try:
+            self.market.close_market()
+            backtest_clock.update(3500)
+            self.assertEqual(self.market.elapsed_seconds_closed, 2.5)
+        finally:
+            clock.reset_clock(token)
 
     def test_event_name_mc(self):
         mock_market_catalogue = mock.Mock()
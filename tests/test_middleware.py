@@ -103,6 +103,7 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         self.middleware._process_runner_removal(mock_market, 12345, 0, 16.2)
         self.assertEqual(mock_order.simulated.matched, [[123, 7.21, 10]])
         self.assertEqual(mock_order.simulated.average_price_matched, 7.21)
+        mock_order.exposure_changed.assert_called_with()
         self.assertEqual(mock_order_two.simulated.matched, [[123, 8.6, 10]])
 
     def test__process_runner_removal_under_limit(self):
@@ -127,6 +128,7 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         self.assertEqual(mock_order.simulated.average_price_matched, 0)
         self.assertEqual(mock_order.simulated.matched, [])
         self.assertEqual(mock_order.simulated.size_voided, 10)
+        mock_order.exposure_changed.assert_called_with()
 
     def test__process_runner_removal_none(self):
         mock_simulated = mock.MagicMock(matched=[[123, 8.6, 10]])
@@ -179,7 +181,7 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         mock_order_three = mock.Mock(
             selection_id=123, handicap=1, status=OrderStatus.EXECUTABLE, simulated=False
         )
-        mock_market.blotter._live_orders = [
+        mock_market.blotter.live_orders = [
             mock_order,
             mock_order_two,
             mock_order_three,
@@ -1,6 +1,5 @@
 import string
 import unittest
-import datetime
 import collections
 from unittest import mock
 
@@ -13,6 +12,7 @@ from flumine.order.order import (
     VALID_BETFAIR_CUSTOMER_ORDER_REF_CHARACTERS,
 )
 from flumine.exceptions import OrderUpdateError
+from flumine import clock
 
 
 class BaseOrderTest(unittest.TestCase):
@@ -60,6 +60,12 @@ class BaseOrderTest(unittest.TestCase):
         self.assertEqual(self.order.status, OrderStatus.EXECUTION_COMPLETE)
         self.mock_trade.complete_trade.assert_called()
 
+    @mock.patch("flumine.order.order.BaseOrder.info")
+    def test__update_status_exposure_changed(self, mock_info):
+        self.order.on_exposure_change = mock.Mock()
+        self.order._update_status(OrderStatus.EXECUTABLE)
+        self.order.on_exposure_change.assert_called_with(self.order)
+
     @mock.patch("flumine.order.order.BaseOrder._update_status")
     def test_placing(self, mock__update_status):
         self.order.placing()
@@ -140,6 +146,12 @@ class BaseOrderTest(unittest.TestCase):
         self.order.update_current_order(mock_current_order)
         self.assertEqual(self.order.responses.current_order, mock_current_order)
 
+    def test_exposure_changed(self):
+        self.order.exposure_changed()
+        self.order.on_exposure_change = mock.Mock()
+        self.order.update_current_order(mock.Mock())
+        self.order.on_exposure_change.assert_called_with(self.order)
+
     def test_current_order(self):
         self.assertIsNone(self.order.current_order)
         mock_responses = mock.Mock()
@@ -202,18 +214,27 @@ class BaseOrderTest(unittest.TestCase):
 
     def test_elapsed_seconds(self):
         self.assertIsNone(self.order.elapsed_seconds)
-        mock_responses = mock.Mock()
-        mock_responses.date_time_placed = datetime.datetime.utcnow()
-        self.order.responses = mock_responses
-        self.assertGreaterEqual(self.order.elapsed_seconds, 0)
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        try:
+            self.order.responses.placed(None)
+            backtest_clock.update(3500)
+            self.assertEqual(self.order.elapsed_seconds, 2.5)
+        finally:
+            clock.reset_clock(token)
 
     def test_elapsed_seconds_executable(self):
         self.assertIsNone(self.order.elapsed_seconds_executable)
-        mock_responses = mock.Mock()
-        mock_responses.date_time_placed = datetime.datetime.utcnow()
-        self.order.responses = mock_responses
-        self.order.date_time_execution_complete = datetime.datetime.utcnow()
-        self.assertGreaterEqual(self.order.elapsed_seconds_executable, 0)
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        try:
+            self.order.responses.placed(None)
+            backtest_clock.update(1250)
+            self.order._time_execution_complete = clock.epoch_ms()
+            backtest_clock.update(3500)
+            self.assertEqual(self.order.elapsed_seconds_executable, 0.25)
+        finally:
+            clock.reset_clock(token)
 
     def test_market_id(self):
         self.assertEqual(self.order.market_id, self.mock_trade.market_id)
@@ -61,6 +61,13 @@ class OrderPackageTest(unittest.TestCase):
         self.assertEqual(self.order_package._retry_count, 3)
         mock_time.sleep.assert_called()
 
+    @mock.patch("flumine.order.orderpackage.time")
+    def test_retry_no_backoff(self, mock_time):
+        self.order_package._retry_count = 1
+        self.assertTrue(self.order_package.retry(backoff=False))
+        self.assertEqual(self.order_package._retry_count, 2)
+        mock_time.sleep.assert_not_called()
+
     def test_calc_simulated_delay(self):
         config.place_latency = 0.1
         config.cancel_latency = 0.2
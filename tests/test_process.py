@@ -58,6 +58,39 @@ class BaseOrderTest(unittest.TestCase):
         )
         self.assertEqual(current_order, betfair_order.responses.current_order)
 
+    @mock.patch("flumine.order.process.process_current_order")
+    def test_process_current_orders_complete(self, mock_process_current_order):
+        mock_order = mock.Mock(complete=True, bet_id=None)
+        mock_market = mock.Mock()
+        mock_markets = mock.Mock()
+        mock_markets.get_order.return_value = mock_order
+        mock_markets.markets = {"market_id": mock_market}
+        current_order = mock.Mock(customer_order_ref="abc-123", market_id="market_id")
+        event = mock.Mock(event=[mock.Mock(orders=[current_order])])
+        process.process_current_orders(
+            mock_markets, mock.Mock(), event, mock.Mock(), mock.Mock()
+        )
+        mock_market.blotter.complete_order.assert_called_with(mock_order)
+
+    def test_record_order_confirmation(self):
+        markets = Markets()
+        markets.add_market("1.234", mock.Mock(market_type="WIN"))
+        mock_order = mock.Mock(market_id="1.234")
+        mock_order.trade.strategy.name = "test"
+        mock_latency = mock.Mock()
+        with mock.patch("flumine.order.process.clock.elapsed_seconds", return_value=1):
+            process.record_order_confirmation(markets, mock_order, mock_latency)
+        mock_latency.record.assert_called_with(
+            "order_stream_confirmation", 1, strategy="test", market_type="WIN"
+        )
+
+    def test_record_order_confirmation_not_placed(self):
+        mock_order = mock.Mock()
+        mock_order.responses.time_placed = None
+        mock_latency = mock.Mock()
+        process.record_order_confirmation(Markets(), mock_order, mock_latency)
+        mock_latency.record.assert_not_called()
+
     def test_process_current_order(self):
         mock_order = mock.Mock(status=OrderStatus.EXECUTABLE)
         mock_order.current_order.status = "EXECUTION_COMPLETE"
@@ -76,7 +109,7 @@ class BaseOrderTest(unittest.TestCase):
         )
         markets.add_market("market_id", market)
         cheap_hash = create_cheap_hash("strategy_name", 13)
-        strategy = mock.Mock(name_hash=cheap_hash)
+        strategy = mock.Mock(name_hash=cheap_hash, stream_ids=[])
         strategies = Strategies()
         strategies(strategy=strategy, client=mock.Mock())
         current_order = mock.Mock(
@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+
+from flumine.profiler import Profiler
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profiler = Profiler(enabled=True, sample_rate=2)
+
+    def test_init(self):
+        self.assertTrue(self.profiler.enabled)
+        self.assertEqual(self.profiler.sample_rate, 2)
+        self.assertEqual(self.profiler.histograms, {})
+        self.assertEqual(Profiler(sample_rate=0).sample_rate, 1)
+
+    def test_call(self):
+        mock_function = mock.Mock(return_value=1)
+        for _ in range(4):
+            self.assertEqual(self.profiler.call("test", "hook", mock_function, 2), 1)
+        mock_function.assert_called_with(2)
+        self.assertEqual(mock_function.call_count, 4)
+        self.assertEqual(self.profiler.histograms[("test", "hook")].count, 2)
+
+    def test_call_disabled(self):
+        self.profiler.enabled = False
+        mock_function = mock.Mock()
+        self.profiler.call("test", "hook", mock_function)
+        mock_function.assert_called_with()
+        self.assertEqual(self.profiler.histograms, {})
+
+    def test_call_error(self):
+        mock_function = mock.Mock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            self.profiler.call("test", "hook", mock_function)
+        self.assertEqual(self.profiler.histograms[("test", "hook")].count, 1)
+
+    def test_record(self):
+        self.profiler.record("test", "hook", 2000)
+        self.profiler.record("test", "hook", 4000)
+        histogram = self.profiler.histograms[("test", "hook")]
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.max, 4000)
+
+    def test_info(self):
+        self.assertEqual(self.profiler.info, {})
+        self.profiler.record("test", "hook", 2000)
+        self.assertEqual(
+            self.profiler.info,
+            {"test.hook": {"count": 1, "p50": 2, "p99": 2, "max": 2}},
+        )
@@ -1,7 +1,7 @@
 import uuid
 import unittest
-import datetime
 
+from flumine import clock
 from flumine.strategy.runnercontext import RunnerContext
 
 
@@ -54,10 +54,22 @@ class RunnerContextTest(unittest.TestCase):
 
     def test_placed_elapsed_seconds(self):
         self.assertIsNone(self.context.placed_elapsed_seconds)
-        self.context.datetime_last_placed = datetime.datetime.utcnow()
-        self.assertGreaterEqual(self.context.placed_elapsed_seconds, 0)
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        try:
+            self.context.place(self.id_)
+            backtest_clock.update(3500)
+            self.assertEqual(self.context.placed_elapsed_seconds, 2.5)
+        finally:
+            clock.reset_clock(token)
 
     def test_reset_elapsed_seconds(self):
         self.assertIsNone(self.context.reset_elapsed_seconds)
-        self.context.datetime_last_reset = datetime.datetime.utcnow()
-        self.assertGreaterEqual(self.context.reset_elapsed_seconds, 0)
+        backtest_clock = clock.BacktestClock(1000)
+        token = clock.set_clock(backtest_clock)
+        try:
+            self.context.reset(self.id_)
+            backtest_clock.update(3500)
+            self.assertEqual(self.context.reset_elapsed_seconds, 2.5)
+        finally:
+            clock.reset_clock(token)
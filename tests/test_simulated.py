@@ -80,6 +80,7 @@ class SimulatedTest(unittest.TestCase):
         self.simulated(mock_market_book, mock_runner_analytics)
         self.assertEqual(self.simulated.size_lapsed, 2.0)
         self.assertEqual(self.simulated.size_remaining, 0.0)
+        self.mock_order.exposure_changed.assert_called_with()
         mock__process_sp.assert_not_called()
         mock__process_traded.assert_not_called()
 
@@ -650,6 +651,7 @@ class SimulatedTest(unittest.TestCase):
         self.assertEqual(self.simulated.matched, [[12345, 10.0, 2.64]])
         self.assertEqual(self.simulated.size_matched, 2.64)
         self.assertEqual(self.simulated.average_price_matched, 10.0)
+        self.mock_order.exposure_changed.assert_called_with()
 
     def test_size_remaining(self):
         self.assertEqual(self.simulated.size_remaining, 2)
@@ -749,6 +751,16 @@ class SimulatedTest(unittest.TestCase):
         mock_size_remaining.return_value = 0
         self.assertEqual(self.simulated.status, "EXECUTION_COMPLETE")
 
+    @mock.patch(
+        "flumine.backtest.simulated.Simulated.status",
+        new_callable=mock.PropertyMock,
+        return_value="EXECUTABLE",
+    )
+    def test_state(self, mock_status):
+        self.assertEqual(self.simulated.state, ("EXECUTABLE", 0, 0, 0, 0))
+        self.simulated._update_matched([123, 12, 1])
+        self.assertEqual(self.simulated.state, ("EXECUTABLE", 1, 0, 0, 0))
+
     def test_info(self):
         self.assertEqual(
             self.simulated.info,
@@ -12,18 +12,32 @@ class StrategiesTest(unittest.TestCase):
         self.assertEqual(self.strategies._strategies, [])
 
     def test_call(self):
-        mock_strategy = mock.Mock()
+        mock_strategy = mock.Mock(stream_ids=[1])
         mock_client = mock.Mock()
         self.strategies(mock_strategy, mock_client)
         self.assertEqual(self.strategies._strategies, [mock_strategy])
+        self.assertEqual(self.strategies.stream_strategies(1), [mock_strategy])
         mock_strategy.add.assert_called_with()
         mock_strategy.client = mock_client
 
     def test_start(self):
-        mock_strategy = mock.Mock()
+        mock_strategy = mock.Mock(stream_ids=[1])
         self.strategies._strategies.append(mock_strategy)
         self.strategies.start()
         mock_strategy.start.assert_called_with()
+        self.assertEqual(self.strategies.stream_strategies(1), [mock_strategy])
+
+    def test_update_stream_index(self):
+        strategy_one = mock.Mock(stream_ids=[1, 2])
+        strategy_two = mock.Mock(stream_ids=[2, 2, 3])
+        self.strategies._strategies = [strategy_one, strategy_two]
+        self.strategies.update_stream_index()
+        self.assertEqual(self.strategies.stream_strategies(1), [strategy_one])
+        self.assertEqual(
+            self.strategies.stream_strategies(2), [strategy_one, strategy_two]
+        )
+        self.assertEqual(self.strategies.stream_strategies(3), [strategy_two])
+        self.assertEqual(self.strategies.stream_strategies(4), [])
 
     def test_iter(self):
         for i in self.strategies:
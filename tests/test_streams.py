@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 from unittest import mock
 
@@ -547,6 +550,32 @@ class TestHistoricalStream(unittest.TestCase):
         self.assertEqual(generator, mock_generator().get_generator())
 
 
+class TestFlumineHistoricalGeneratorStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def _market_books(self, file_path: str) -> list:
+        stream = historicalstream.HistoricalStream(mock.Mock(), 1, 0.0, None, file_path)
+        return [
+            [(mb.market_id, mb.publish_time_epoch) for mb in market_books]
+            for market_books in stream.create_generator()()
+        ]
+
+    def test_read_loop_corrupt_line(self):
+        file_path = os.path.join(self.tmp_dir, "1.132153978")
+        with open("tests/resources/BASIC-1.132153978") as f:
+            lines = f.readlines()
+        with open(file_path, "w") as f:
+            f.writelines(lines[:10] + ['{"op":"mcm","pt":\n', "[]\n"] + lines[10:])
+        self.assertEqual(
+            self._market_books(file_path),
+            self._market_books("tests/resources/BASIC-1.132153978"),
+        )
+
+
 class TestFlumineMarketStream(unittest.TestCase):
     def setUp(self) -> None:
         self.listener = mock.Mock()
@@ -688,6 +717,12 @@ class TestHistoricListener(unittest.TestCase):
         # error
         self.assertIsNone(self.listener.on_data("p"))
 
+    def test_on_update(self):
+        mock_stream = mock.Mock(_lookup="mc")
+        self.listener.stream = mock_stream
+        self.listener.on_update({"pt": 123, "mc": [1]})
+        self.listener.stream._process.assert_called_with([1], 123)
+
 
 class TestOrderStream(unittest.TestCase):
     def setUp(self) -> None:
@@ -731,15 +766,65 @@ class TestSimulatedOrderStream(unittest.TestCase):
         self.assertEqual(current_orders.orders, [1])
         self.assertFalse(current_orders.more_available)
 
-    # def test_run(self):
-    #     pass
+    @mock.patch("flumine.streams.simulatedorderstream.time")
+    @mock.patch(
+        "flumine.streams.simulatedorderstream.SimulatedOrderStream.is_alive",
+        side_effect=[True, False],
+    )
+    @mock.patch(
+        "flumine.streams.simulatedorderstream.SimulatedOrderStream._get_current_orders"
+    )
+    def test_run(self, mock__get_current_orders, _, mock_time):
+        order_one, order_two = mock.Mock(market_id="1.1"), mock.Mock(market_id="1.1")
+        mock__get_current_orders.return_value = [order_one, order_two]
+        self.stream.run()
+        event = self.mock_flumine.handler_queue.put.call_args[0][0]
+        self.assertEqual(event.event[0].orders, [order_one, order_two])
+        self.assertEqual(event.market_ids, {"1.1"})
 
     def test__get_current_orders(self):
         mock_market = mock.Mock(closed=False)
-        order_one = mock.Mock(simulated=True)
+        order_one = mock.Mock()
         order_one.trade.client = self.stream.client
-        order_two = mock.Mock(simulated=True)
-        order_three = mock.Mock(simulated=True)
-        mock_market.blotter = [order_one, order_two, order_three]
-        self.stream.flumine.markets = [mock_market, mock.Mock(closed=True)]
+        order_two = mock.Mock()  # other client
+        order_three = mock.Mock(simulated=False)
+        order_three.trade.client = self.stream.client
+        mock_market.blotter.live_orders_list.return_value = [
+            order_one,
+            order_two,
+            order_three,
+        ]
+        self.stream.flumine.markets.live_order_markets = [mock_market]
         self.assertEqual(self.stream._get_current_orders(), [order_one])
+        self.assertEqual(
+            self.stream._order_states,
+            {
+                order_one.id: (
+                    order_one.status,
+                    order_one.bet_id,
+                    order_one.simulated.state,
+                )
+            },
+        )
+
+    @mock.patch("flumine.streams.simulatedorderstream.time")
+    def test__get_current_orders_delta(self, mock_time):
+        mock_time.time.return_value = 10
+        mock_market = mock.Mock(closed=False)
+        order_one = mock.Mock(bet_id=1, status="EXECUTABLE")
+        order_one.simulated.state = ("EXECUTABLE", 0, 0, 0, 0)
+        order_one.trade.client = self.stream.client
+        order_two = mock.Mock(bet_id=2, status="EXECUTABLE")
+        order_two.simulated.state = ("EXECUTABLE", 0, 0, 0, 0)
+        order_two.trade.client = self.stream.client
+        mock_market.blotter.live_orders_list.return_value = [order_one, order_two]
+        self.stream.flumine.markets.live_order_markets = [mock_market]
+        self.assertEqual(self.stream._get_current_orders(), [order_one, order_two])
+        # no changes
+        self.assertEqual(self.stream._get_current_orders(), [])
+        # matched
+        order_two.simulated.state = ("EXECUTION_COMPLETE", 2, 0, 0, 0)
+        self.assertEqual(self.stream._get_current_orders(), [order_two])
+        # snap
+        mock_time.time.return_value = 12
+        self.assertEqual(self.stream._get_current_orders(), [order_one, order_two])
@@ -0,0 +1,206 @@
+import time
+import queue
+import threading
+import unittest
+from unittest import mock
+
+from flumine import supervisor
+from flumine.controls.clientcontrols import SharedMaxTransactionCount
+from flumine.events.events import EventType
+from flumine.exceptions import RunError
+from flumine.streams.marketstream import MarketStream
+from flumine.streams.orderstream import OrderStream
+from flumine.streams.simulatedorderstream import SimulatedOrderStream
+
+
+class GetShardTest(unittest.TestCase):
+    def test_get_shard(self):
+        self.assertEqual(supervisor.get_shard("1.234", 4), 1)
+        self.assertEqual(supervisor.get_shard("1.234", 1), 0)
+        shards = {supervisor.get_shard("1.%s" % i, 4) for i in range(100)}
+        self.assertEqual(shards, {0, 1, 2, 3})
+
+
+class RouterListenerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queues = [queue.Queue(), queue.Queue()]
+        self.listener = supervisor.RouterListener(shard_queues=self.queues)
+        self.listener.register_stream(1000, "marketSubscription")
+        self.market_ids = {
+            supervisor.get_shard("1.%s" % i, 2): "1.%s" % i for i in range(10)
+        }
+
+    def test_init(self):
+        self.assertEqual(self.listener.shard_queues, self.queues)
+
+    def test_on_change_message(self):
+        data = {
+            "op": "mcm",
+            "pt": 123,
+            "clk": "AAA",
+            "mc": [{"id": self.market_ids[0]}, {"id": self.market_ids[1]}],
+        }
+        self.listener._on_change_message(data, 1000)
+        self.assertEqual(self.listener.clk, "AAA")
+        self.assertEqual(
+            self.queues[0].get_nowait(),
+            {"op": "mcm", "pt": 123, "clk": "AAA", "mc": [{"id": self.market_ids[0]}]},
+        )
+        self.assertEqual(
+            self.queues[1].get_nowait()["mc"], [{"id": self.market_ids[1]}]
+        )
+        self.assertEqual(self.listener.stream._caches, {})
+
+    def test_on_change_message_update_empty_shard(self):
+        data = {"op": "mcm", "pt": 123, "mc": [{"id": self.market_ids[1]}]}
+        self.listener._on_change_message(data, 1000)
+        self.assertTrue(self.queues[0].empty())
+        self.assertEqual(self.queues[1].qsize(), 1)
+
+    def test_on_change_message_sub_image(self):
+        data = {"op": "mcm", "ct": "SUB_IMAGE", "pt": 123, "mc": []}
+        self.listener._on_change_message(data, 1000)
+        self.assertEqual(self.queues[0].get_nowait()["ct"], "SUB_IMAGE")
+        self.assertEqual(self.queues[1].get_nowait()["ct"], "SUB_IMAGE")
+
+    def test_on_change_message_heartbeat(self):
+        data = {"op": "mcm", "ct": "HEARTBEAT", "pt": 123, "clk": "BBB"}
+        self.listener._on_change_message(data, 1000)
+        self.assertEqual(self.listener.clk, "BBB")
+        self.assertTrue(self.queues[0].empty())
+        self.assertTrue(self.queues[1].empty())
+
+
+class QueueStreamTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock_flumine = mock.Mock()
+        self.mock_listener = mock.Mock()
+        self.queue = queue.Queue()
+        self.stream = supervisor.QueueStream(
+            self.mock_flumine, 1000, self.mock_listener, self.queue
+        )
+
+    def test_init(self):
+        self.assertEqual(self.stream.unique_id, 1000)
+        self.assertFalse(self.stream._running)
+
+    def test_subscribe_to_markets(self):
+        self.assertEqual(self.stream.subscribe_to_markets(market_filter={}), 1000)
+        self.mock_listener.register_stream.assert_called_with(
+            1000, "marketSubscription"
+        )
+
+    def test_subscribe_to_orders(self):
+        self.assertEqual(self.stream.subscribe_to_orders(order_filter={}), 1000)
+        self.mock_listener.register_stream.assert_called_with(1000, "orderSubscription")
+
+    def test_start(self):
+        self.queue.put({"op": "mcm"})
+        self.queue.put(None)
+        self.stream.start()
+        self.mock_listener._on_change_message.assert_called_with({"op": "mcm"}, 1000)
+        self.assertFalse(self.stream._running)
+        event = self.mock_flumine.handler_queue.put.call_args[0][0]
+        self.assertEqual(event.EVENT_TYPE, EventType.TERMINATOR)
+
+    def test_stop(self):
+        thread = threading.Thread(target=self.stream.start)
+        thread.start()
+        while not self.stream._running:
+            time.sleep(0.01)
+        self.stream.stop()
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.stream._running)
+        self.mock_flumine.handler_queue.put.assert_not_called()
+
+    def test_stop_not_running(self):
+        self.stream.stop()
+        self.assertTrue(self.queue.empty())
+
+
+class ShardStreamingTest(unittest.TestCase):
+    def test_create_stream(self):
+        mock_flumine, mock_listener, mock_queue = mock.Mock(), mock.Mock(), mock.Mock()
+        streaming = supervisor.ShardStreaming(mock_flumine, {1000: mock_queue})
+        stream = streaming.create_stream(unique_id=1000, listener=mock_listener)
+        self.assertEqual(stream.flumine, mock_flumine)
+        self.assertEqual(stream.listener, mock_listener)
+        self.assertEqual(stream._queue, mock_queue)
+
+
+class RunWorkerTest(unittest.TestCase):
+    @mock.patch("flumine.supervisor.config")
+    def test_run_worker(self, mock_config):
+        mock_framework = mock.Mock()
+        mock_control = mock.Mock(NAME="MAX_TRANSACTION_COUNT")
+        mock_other_control = mock.Mock(NAME="OTHER")
+        mock_framework.client.trading_controls = [mock_control, mock_other_control]
+        counts = SharedMaxTransactionCount.create_counts()
+        supervisor.run_worker(lambda: mock_framework, 1, {1000: None}, counts)
+        streaming = mock_framework.client.betting_client.streaming
+        self.assertIsInstance(streaming, supervisor.ShardStreaming)
+        self.assertEqual(streaming.stream_queues, {1000: None})
+        control, other_control = mock_framework.client.trading_controls
+        self.assertIsInstance(control, SharedMaxTransactionCount)
+        self.assertIs(control._counts, counts)
+        self.assertIs(other_control, mock_other_control)
+        mock_framework.run.assert_called_with()
+
+
+class FlumineSupervisorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock_framework = mock.Mock()
+        self.supervisor = supervisor.FlumineSupervisor(
+            lambda: self.mock_framework, workers=2
+        )
+
+    def test_init(self):
+        self.assertEqual(self.supervisor.workers, 2)
+        self.assertIsNone(self.supervisor.framework)
+        self.assertEqual(self.supervisor.processes, [])
+        self.assertEqual(self.supervisor._stream_queues, [])
+        self.assertFalse(self.supervisor._running)
+
+    def test_get_routed_streams(self):
+        market_stream = MarketStream(self.mock_framework, 1000, 1, None)
+        order_stream = OrderStream(self.mock_framework, 2000, 1, None)
+        simulated_stream = SimulatedOrderStream(self.mock_framework, 3000, 1, None)
+        self.mock_framework.streams = [market_stream, order_stream, simulated_stream]
+        self.assertEqual(
+            supervisor.get_routed_streams(self.mock_framework),
+            [market_stream, order_stream],
+        )
+
+    def test_run_error(self):
+        self.mock_framework.streams = []
+        with self.assertRaises(RunError):
+            self.supervisor.run()
+
+    @mock.patch("flumine.supervisor.BackgroundWorker")
+    @mock.patch("flumine.supervisor.multiprocessing.Process")
+    def test_run(self, mock_process, mock_background_worker):
+        market_stream = mock.Mock(spec=MarketStream, stream_id=1000, MAX_LATENCY=0.5)
+        market_stream.__class__ = MarketStream
+        self.mock_framework.streams = [market_stream]
+        self.mock_framework.client.betting_client.session_timeout = 1200
+        mock_process.return_value.is_alive.return_value = False
+        self.supervisor.run()
+        self.assertEqual(self.supervisor.framework, self.mock_framework)
+        self.assertEqual(mock_process.call_count, 2)
+        self.assertEqual(mock_process.return_value.start.call_count, 2)
+        self.assertEqual(len(self.supervisor._stream_queues), 2)
+        self.assertIsInstance(market_stream._listener, supervisor.RouterListener)
+        self.assertEqual(
+            market_stream._listener.shard_queues,
+            [queues[1000] for queues in self.supervisor._stream_queues],
+        )
+        market_stream.start.assert_called_with()
+        market_stream.stop.assert_called_with()
+        self.mock_framework.client.login.assert_called_with()
+        self.mock_framework.client.logout.assert_called_with()
+        mock_background_worker.return_value.start.assert_called_with()
+        mock_background_worker.return_value.shutdown.assert_called_with()
+        self.assertFalse(self.supervisor._running)
+        for queues in self.supervisor._stream_queues:
+            self.assertIsNone(queues[1000].get(timeout=1))
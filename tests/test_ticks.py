@@ -0,0 +1,150 @@
+import unittest
+from decimal import ROUND_HALF_UP
+
+from flumine import ticks, utils
+
+
+def decimal_nearest_price(price):
+    # previous Decimal implementation
+    if price <= utils.MIN_PRICE:
+        return utils.MIN_PRICE
+    if price > utils.MAX_PRICE:
+        return utils.MAX_PRICE
+    price = utils.as_dec(price)
+    for cutoff, step in utils.CUTOFFS:
+        if price < cutoff:
+            break
+    step = utils.as_dec(step)
+    return float((price * step).quantize(2, ROUND_HALF_UP) / step)
+
+
+def decimal_prices():
+    # previous Decimal implementation (utils.make_prices)
+    prices, cursor = [], utils.as_dec(utils.MIN_PRICE)
+    for cutoff, step in utils.CUTOFFS:
+        price, step = cursor, utils.as_dec(1 / step)
+        while price < cutoff:
+            prices.append(price)
+            price += step
+        cursor = utils.as_dec(cutoff)
+    prices.append(utils.as_dec(utils.MAX_PRICE))
+    return prices
+
+
+DECIMAL_PRICES = decimal_prices()
+
+
+class TicksTest(unittest.TestCase):
+    def test_tables(self):
+        self.assertEqual(ticks.TICK_COUNT, 350)
+        self.assertEqual(ticks.PRICES[ticks.MIN_TICK], 1.01)
+        self.assertEqual(ticks.PRICES[ticks.MAX_TICK], 1000)
+        self.assertEqual(ticks.PRICES, tuple(float(p) for p in DECIMAL_PRICES))
+        self.assertEqual(ticks.TICKS_100[0], 101)
+
+    def test_price_to_hundredths(self):
+        self.assertEqual(ticks.price_to_hundredths(1.01), 101)
+        self.assertEqual(ticks.price_to_hundredths(2), 200)
+        self.assertEqual(ticks.price_to_hundredths(4.3), 430)
+        self.assertIsNone(ticks.price_to_hundredths(1.015))
+        self.assertIsNone(ticks.price_to_hundredths(1.0100000001))
+
+    def test_price_to_tick(self):
+        self.assertEqual(ticks.price_to_tick(1.01), 0)
+        self.assertEqual(ticks.price_to_tick(1.02), 1)
+        self.assertEqual(ticks.price_to_tick(1000), 349)
+        self.assertIsNone(ticks.price_to_tick(2.01))
+        self.assertIsNone(ticks.price_to_tick(1001))
+        self.assertIsNone(ticks.price_to_tick(None))
+        self.assertIsNone(ticks.price_to_tick(float("nan")))
+        self.assertIsNone(ticks.price_to_tick(float("inf")))
+
+    def test_tick_to_price(self):
+        self.assertEqual(ticks.tick_to_price(0), 1.01)
+        self.assertEqual(ticks.tick_to_price(349), 1000)
+        with self.assertRaises(IndexError):
+            ticks.tick_to_price(-1)
+        with self.assertRaises(IndexError):
+            ticks.tick_to_price(350)
+
+    def test_is_valid_price(self):
+        for price in DECIMAL_PRICES:
+            self.assertTrue(ticks.is_valid_price(float(price)))
+        self.assertTrue(ticks.is_valid_price(2))
+        self.assertTrue(ticks.is_valid_price(1.1))
+        self.assertFalse(ticks.is_valid_price(1))
+        self.assertFalse(ticks.is_valid_price(2.01))
+        self.assertFalse(ticks.is_valid_price(1.011))
+        self.assertFalse(ticks.is_valid_price(1010))
+
+    def test_price_ticks_away(self):
+        self.assertEqual(ticks.price_ticks_away(1.01, 1), 1.02)
+        self.assertEqual(ticks.price_ticks_away(1.99, 1), 2)
+        self.assertEqual(ticks.price_ticks_away(2, -1), 1.99)
+        self.assertEqual(ticks.price_ticks_away(1.01, -1), 1.01)
+        self.assertEqual(ticks.price_ticks_away(1000, 5), 1000)
+        with self.assertRaises(ValueError):
+            ticks.price_ticks_away(999, -1)
+
+    def test_ticks_difference(self):
+        self.assertEqual(ticks.ticks_difference(1.01, 1.02), 1)
+        self.assertEqual(ticks.ticks_difference(2, 1.5), -50)
+        self.assertEqual(ticks.ticks_difference(1.01, 1000), 349)
+        with self.assertRaises(ValueError):
+            ticks.ticks_difference(1.01, 2.01)
+
+    def test_nearest_price(self):
+        self.assertEqual(ticks.nearest_price(1.011), 1.01)
+        self.assertEqual(ticks.nearest_price(0), 1.01)
+        self.assertEqual(ticks.nearest_price(1001), 1000)
+        self.assertEqual(ticks.nearest_price(2.01), 2.02)
+        self.assertEqual(ticks.nearest_price(2.0099), 2.00)
+        self.assertEqual(ticks.nearest_price(1.015), 1.02)
+        self.assertEqual(ticks.nearest_price(995), 1000)
+
+    def test_nearest_price_decimal(self):
+        # 0.001 resolution across the ladder
+        for i in range(0, 1001000, 7):
+            price = i / 1000
+            self.assertEqual(
+                ticks.nearest_price(price), decimal_nearest_price(price), price
+            )
+        for i in range(0, 100100):
+            price = i / 100
+            self.assertEqual(
+                ticks.nearest_price(price), decimal_nearest_price(price), price
+            )
+
+    def test_nearest_tick(self):
+        self.assertEqual(ticks.nearest_tick(1.011), 0)
+        self.assertEqual(ticks.nearest_tick(2000), 349)
+        self.assertEqual(ticks.nearest_tick(3.04), ticks.price_to_tick(3.05))
+
+
+@unittest.skipIf(ticks.np is None, "numpy not installed")
+class TicksBatchTest(unittest.TestCase):
+    def test_prices_to_ticks(self):
+        self.assertEqual(
+            ticks.prices_to_ticks([1.01, 2.01, 1000, 1001, 0]).tolist(),
+            [0, -1, 349, -1, -1],
+        )
+
+    def test_ticks_to_prices(self):
+        self.assertEqual(ticks.ticks_to_prices([0, 349]).tolist(), [1.01, 1000])
+        with self.assertRaises(IndexError):
+            ticks.ticks_to_prices([350])
+
+    def test_prices_ticks_away(self):
+        self.assertEqual(
+            ticks.prices_ticks_away([1.01, 1.99, 1000], 1).tolist(), [1.02, 2, 1000]
+        )
+        self.assertEqual(ticks.prices_ticks_away([1.02], -5).tolist(), [1.01])
+        with self.assertRaises(ValueError):
+            ticks.prices_ticks_away([2.01], 1)
+
+    def test_nearest_prices(self):
+        prices = [i / 1000 for i in range(0, 1001000, 7)]
+        self.assertEqual(
+            ticks.nearest_prices(prices).tolist(),
+            [decimal_nearest_price(p) for p in prices],
+        )
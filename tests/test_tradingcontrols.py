@@ -8,8 +8,24 @@ from flumine.controls.tradingcontrols import (
     ExchangeType,
     OrderPackageType,
     MarketValidation,
+    MarketExposure,
+    EventExposure,
+    market_exposure,
 )
 from flumine.markets.blotter import Blotter
+from flumine.order.ordertype import LimitOrder
+
+
+def create_mock_order(selection_id, side, price, size_matched, size_remaining):
+    return mock.Mock(
+        market_id="market_id",
+        lookup=("market_id", selection_id, 0),
+        side=side,
+        average_price_matched=price if size_matched else 0,
+        size_matched=size_matched,
+        size_remaining=size_remaining,
+        order_type=LimitOrder(price=price, size=size_matched + size_remaining),
+    )
 
 
 class TestOrderValidation(unittest.TestCase):
@@ -581,7 +597,7 @@ class TestStrategyExposure(unittest.TestCase):
         order1.selection_id = 1234
         order1.handicap = 0
 
-        self.market.blotter._strategy_selection_orders = {(strategy, 2, 3): [order1]}
+        self.market.blotter["order1"] = order1
 
         # Show that the exposures aren't double counted when REPLACE is used
         self.trading_control._validate(order1, OrderPackageType.REPLACE)
@@ -590,3 +606,127 @@ class TestStrategyExposure(unittest.TestCase):
         # Just to be sure, check that the validation fails if we try to validate order1 as a PLACE
         self.trading_control._validate(order1, OrderPackageType.PLACE)
         mock_on_error.assert_called_once()
+
+    @mock.patch("flumine.controls.tradingcontrols.StrategyExposure._on_error")
+    def test_validate_replace_new_price(self, mock_on_error):
+        strategy = mock.Mock(max_order_exposure=10, max_selection_exposure=10)
+        order = create_mock_order(2, "LAY", 2.0, 0, 5)
+        order.trade.strategy = strategy
+        self.market.blotter["order"] = order
+        order.update_data = {"new_price": 4.0}
+        self.trading_control._validate(order, OrderPackageType.REPLACE)
+        mock_on_error.assert_called_with(
+            order,
+            "Order exposure (15.0) is greater than strategy.max_order_exposure (10)",
+        )
+
+
+class TestMarketExposure(unittest.TestCase):
+    def setUp(self):
+        self.market = mock.Mock(closed=False, event_id="123")
+        self.market.market_book.number_of_winners = 1
+        self.market.market_book.number_of_active_runners = 3
+        self.market.blotter = Blotter("market_id")
+        self.mock_flumine = mock.Mock()
+        self.mock_flumine.markets.markets = {"market_id": self.market}
+        self.trading_control = MarketExposure(self.mock_flumine, 15)
+        self.strategy = mock.Mock()
+        # matched back 10 @ 3.0
+        order = create_mock_order(1, "BACK", 3.0, 10, 0)
+        order.trade.strategy = self.strategy
+        self.market.blotter["1"] = order
+
+    def test_init(self):
+        self.assertEqual(self.trading_control.NAME, "MARKET_EXPOSURE")
+        self.assertEqual(self.trading_control.max_market_exposure, 15)
+
+    @mock.patch("flumine.controls.tradingcontrols.MarketExposure._on_error")
+    def test_validate(self, mock_on_error):
+        order = create_mock_order(2, "BACK", 4.0, 0, 10)
+        order.trade.strategy = self.strategy
+        self.trading_control._validate(order, OrderPackageType.PLACE)
+        mock_on_error.assert_called_with(
+            order,
+            "Potential market exposure (20.00) is greater than max_market_exposure (15)",
+        )
+
+    @mock.patch("flumine.controls.tradingcontrols.MarketExposure._on_error")
+    def test_validate_all_outcomes(self, mock_on_error):
+        # no untraded runner (unmatched back counted as a loss only)
+        self.market.market_book.number_of_active_runners = 2
+        order = create_mock_order(2, "BACK", 4.0, 0, 10)
+        order.trade.strategy = self.strategy
+        self.trading_control._validate(order, OrderPackageType.PLACE)
+        mock_on_error.assert_not_called()
+        self.assertEqual(market_exposure(self.market, order), 10)
+
+    @mock.patch("flumine.controls.tradingcontrols.MarketExposure._on_error")
+    def test_validate_replace(self, mock_on_error):
+        # unmatched lay 5 @ 2.0, 2 wins: -10 - 5
+        order = create_mock_order(2, "LAY", 2.0, 0, 5)
+        order.trade.strategy = self.strategy
+        self.market.blotter["2"] = order
+        order.update_data = {"new_price": 1.5}
+        self.trading_control._validate(order, OrderPackageType.REPLACE)
+        mock_on_error.assert_not_called()
+        # 2 wins at new price: -10 - 10
+        order.update_data = {"new_price": 3.0}
+        self.trading_control._validate(order, OrderPackageType.REPLACE)
+        mock_on_error.assert_called_with(
+            order,
+            "Potential market exposure (20.00) is greater than max_market_exposure (15)",
+        )
+
+    @mock.patch("flumine.controls.tradingcontrols.MarketExposure._on_error")
+    def test_validate_cancel(self, mock_on_error):
+        order = create_mock_order(2, "BACK", 4.0, 0, 100)
+        self.trading_control._validate(order, OrderPackageType.CANCEL)
+        mock_on_error.assert_not_called()
+
+
+class TestEventExposure(unittest.TestCase):
+    def setUp(self):
+        self.market = mock.Mock(closed=False, event_id="123")
+        self.market.market_book.number_of_winners = 1
+        self.market.market_book.number_of_active_runners = 3
+        self.market.blotter = Blotter("market_id")
+        self.market_two = mock.Mock(closed=False, event_id="123")
+        self.market_two.market_book.number_of_winners = 3
+        self.market_two.blotter = Blotter("market_id_two")
+        self.mock_flumine = mock.Mock()
+        self.mock_flumine.markets.markets = {
+            "market_id": self.market,
+            "market_id_two": self.market_two,
+        }
+        self.mock_flumine.markets.event_markets.side_effect = lambda event_id: [
+            m for m in (self.market, self.market_two) if m.event_id == event_id
+        ]
+        self.trading_control = EventExposure(self.mock_flumine, 15)
+        # place market, lay 10 @ 1.5
+        order = create_mock_order(1, "LAY", 1.5, 10, 0)
+        order.market_id = "market_id_two"
+        order.lookup = ("market_id_two", 1, 0)
+        self.market_two.blotter["1"] = order
+
+    def test_init(self):
+        self.assertEqual(self.trading_control.NAME, "EVENT_EXPOSURE")
+        self.assertEqual(self.trading_control.max_event_exposure, 15)
+
+    @mock.patch("flumine.controls.tradingcontrols.EventExposure._on_error")
+    def test_validate(self, mock_on_error):
+        order = create_mock_order(2, "BACK", 4.0, 0, 10)
+        self.trading_control._validate(order, OrderPackageType.PLACE)
+        mock_on_error.assert_not_called()
+        order = create_mock_order(2, "BACK", 4.0, 0, 11)
+        self.trading_control._validate(order, OrderPackageType.PLACE)
+        mock_on_error.assert_called_with(
+            order,
+            "Potential event exposure (16.00) is greater than max_event_exposure (15)",
+        )
+
+    @mock.patch("flumine.controls.tradingcontrols.EventExposure._on_error")
+    def test_validate_other_event(self, mock_on_error):
+        self.market_two.event_id = "456"
+        order = create_mock_order(2, "BACK", 4.0, 0, 11)
+        self.trading_control._validate(order, OrderPackageType.PLACE)
+        mock_on_error.assert_not_called()
@@ -3,7 +3,8 @@ from unittest import mock
 from unittest.mock import call
 
 from flumine.execution.transaction import Transaction, OrderPackageType
-from flumine.exceptions import ControlError, OrderError
+from flumine.exceptions import ControlError, OrderError, OrderUpdateError
+from flumine import config
 
 
 class TransactionTest(unittest.TestCase):
@@ -161,8 +162,9 @@ class TransactionTest(unittest.TestCase):
         return_value=True,
     )
     def test_replace_order(self, mock__validate_controls):
-        mock_order = mock.Mock()
+        mock_order = mock.Mock(update_data={})
         self.assertTrue(self.transaction.replace_order(mock_order, 1.01, 321))
+        self.assertEqual(mock_order.update_data, {"new_price": 1.01})
         mock_order.replace.assert_called_with(1.01)
         mock__validate_controls.assert_called_with(mock_order, OrderPackageType.REPLACE)
         self.transaction._pending_replace = [(mock_order, None)]
@@ -173,12 +175,26 @@ class TransactionTest(unittest.TestCase):
         return_value=False,
     )
     def test_replace_order_violation(self, mock__validate_controls):
-        mock_order = mock.Mock()
+        mock_order = mock.Mock(update_data={})
         self.assertFalse(self.transaction.replace_order(mock_order, 2.02))
+        self.assertEqual(mock_order.update_data, {})
+        mock_order.replace.assert_not_called()
         mock__validate_controls.assert_called_with(mock_order, OrderPackageType.REPLACE)
         self.transaction._pending_replace = []
         self.assertFalse(self.transaction._pending_orders)
 
+    @mock.patch(
+        "flumine.execution.transaction.Transaction._validate_controls",
+        return_value=True,
+    )
+    def test_replace_order_update_error(self, mock__validate_controls):
+        mock_order = mock.Mock(update_data={})
+        mock_order.replace.side_effect = OrderUpdateError("Prices match")
+        with self.assertRaises(OrderUpdateError):
+            self.transaction.replace_order(mock_order, 2.02)
+        self.assertEqual(mock_order.update_data, {})
+        self.assertFalse(self.transaction._pending_orders)
+
     @mock.patch("flumine.execution.transaction.Transaction._create_order_package")
     def test_execute(self, mock__create_order_package):
         self.transaction._pending_orders = True
@@ -240,6 +256,24 @@ class TransactionTest(unittest.TestCase):
         )
         self.assertFalse(self.transaction._pending_orders)
 
+    def test_execute_coalesce(self):
+        mock_order = mock.Mock()
+        self.transaction._pending_orders = True
+        self.transaction._pending_place = [(mock_order, 1234)]
+        self.transaction._pending_cancel = [(mock_order, None)]
+        with mock.patch.object(config, "coalesce_order_packages", True):
+            self.assertEqual(self.transaction.execute(), 0)
+        mock_coalescer = self.transaction.market.flumine.order_coalescer
+        mock_coalescer.add.assert_has_calls(
+            [
+                call(self.transaction.market, mock.ANY, OrderPackageType.PLACE, False),
+                call(self.transaction.market, mock.ANY, OrderPackageType.CANCEL, False),
+            ]
+        )
+        self.transaction.market.flumine.process_order_package.assert_not_called()
+        self.assertEqual(self.transaction._pending_place, [])
+        self.assertFalse(self.transaction._pending_orders)
+
     def test__validate_controls(self):
         mock_trading_control = mock.Mock()
         mock_client_control = mock.Mock()
@@ -39,13 +39,6 @@ class UtilsTest(unittest.TestCase):
     def test_as_dec(self):
         utils.as_dec(2.00)
 
-    # def test_arrange(self):
-    #     utils.arange()
-
-    def test_make_prices(self):
-        prices = utils.make_prices(utils.MIN_PRICE, utils.CUTOFFS)
-        self.assertEqual(len(prices), 350)
-
     def test_get_nearest_price(self):
         self.assertEqual(utils.get_nearest_price(1.011), 1.01)
         self.assertEqual(utils.get_nearest_price(0), 1.01)
@@ -53,6 +46,15 @@ class UtilsTest(unittest.TestCase):
         self.assertEqual(utils.get_nearest_price(2.01), 2.02)
         self.assertEqual(utils.get_nearest_price(2.0099), 2.00)
 
+    @mock.patch("flumine.utils.ticks.nearest_price", return_value=2.02)
+    def test_get_nearest_price_equal_cutoffs(self, mock_nearest_price):
+        cutoffs = [list(cutoff) for cutoff in utils.CUTOFFS]
+        self.assertEqual(utils.get_nearest_price(2.01, cutoffs), 2.02)
+        mock_nearest_price.assert_called_with(2.01)
+
+    def test_get_nearest_price_cutoffs(self):
+        self.assertEqual(utils.get_nearest_price(2.01, ((10, 1), (1000, 0.1))), 2.0)
+
     def test_get_price(self):
         self.assertEqual(
             utils.get_price(
@@ -144,6 +146,23 @@ class UtilsTest(unittest.TestCase):
             (460.0, -100.0),
         )
 
+    def test_calculate_market_exposure(self):
+        self.assertEqual(utils.calculate_market_exposure({}), 0)
+        profits = {(1, 0): (20.0, -10.0), (2, 0): (30.0, -10.0)}
+        self.assertEqual(utils.calculate_market_exposure(profits), 20)
+        self.assertEqual(utils.calculate_market_exposure(profits, 1, 2), 0)
+        self.assertEqual(utils.calculate_market_exposure(profits, 3, 3), 20)
+        profits = {(1, 0): (-20.0, 10.0), (2, 0): (-5.0, 0.0)}
+        self.assertEqual(utils.calculate_market_exposure(profits, 1, 2), 20)
+        self.assertEqual(utils.calculate_market_exposure(profits, None), 25)
+
+    def test_calculate_hedge(self):
+        # backed 10 @ 3.0, lay at 2.0 to green up
+        self.assertEqual(utils.calculate_hedge(20, -10, 2.0), ("LAY", 15))
+        # layed 10 @ 3.0, back at 4.0
+        self.assertEqual(utils.calculate_hedge(-20, 10, 4.0), ("BACK", 7.5))
+        self.assertEqual(utils.calculate_hedge(5, 5, 2.0), (None, 0))
+
     def test_calculate_unmatched_exposure(self):
         self.assertEqual(utils.calculate_unmatched_exposure([], []), (0.0, 0.0))
         self.assertEqual(
@@ -3,7 +3,7 @@ import unittest
 from unittest import mock
 from betfairlightweight import BetfairError, exceptions
 
-from flumine import worker
+from flumine import worker, clock
 
 
 class BackgroundWorkerTest(unittest.TestCase):
@@ -34,6 +34,25 @@ class BackgroundWorkerTest(unittest.TestCase):
     # def test_run(self):
     #     self.worker.run()
 
+    def test_start_clock(self):
+        # worker uses the clock of the starting (backtest) thread
+        clocks = []
+        backtest_clock = clock.BacktestClock(1000)
+        _worker = worker.BackgroundWorker(
+            self.mock_flumine,
+            lambda context, flumine: clocks.append(clock.get_clock()),
+            0,
+        )
+        token = clock.set_clock(backtest_clock)
+        try:
+            _worker.start()
+        finally:
+            clock.reset_clock(token)
+        while not clocks:
+            continue  # wait for function to run
+        _worker.shutdown()
+        self.assertIs(clocks[0], backtest_clock)
+
     def test_shutdown(self):
         self.worker.start()
         while not self.worker._running:
@@ -187,6 +206,28 @@ class WorkersTest(unittest.TestCase):
             mock_events.BalanceEvent(mock_flumine.client.account_funds)
         )
 
+    @mock.patch("flumine.worker.events")
+    def test_poll_latency(self, mock_events):
+        mock_flumine = mock.Mock()
+        mock_flumine.latency.snapshot.return_value = [{"stage": "queue_wait"}]
+        worker.poll_latency(mock.Mock(), mock_flumine)
+        mock_flumine.latency.snapshot.assert_called_with(reset=True)
+        mock_events.LatencyEvent.assert_called_with([{"stage": "queue_wait"}])
+        mock_flumine.log_control.assert_called_with(mock_events.LatencyEvent())
+
+    def test_keep_alive_execution(self):
+        mock_flumine = mock.Mock()
+        worker.keep_alive_execution(mock.Mock(), mock_flumine)
+        mock_flumine.client.execution.ping_sessions.assert_called_with(
+            mock_flumine.client
+        )
+
+    def test_poll_latency_empty(self):
+        mock_flumine = mock.Mock()
+        mock_flumine.latency.snapshot.return_value = []
+        worker.poll_latency(mock.Mock(), mock_flumine)
+        mock_flumine.log_control.assert_not_called()
+
     @mock.patch("flumine.worker._get_cleared_market")
     @mock.patch("flumine.worker._get_cleared_orders")
     def test_poll_market_closure(